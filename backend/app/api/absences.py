@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional
-from app.db.supabase_client import get_supabase
+from postgrest import AsyncPostgrestClient
+from app.db.supabase_client import get_async_supabase
 
 router = APIRouter()
 
@@ -20,35 +21,31 @@ class AbsenceUpdate(BaseModel):
 
 
 @router.get("")
-def list_absences(employee_id: Optional[str] = None):
-    sb = get_supabase()
+async def list_absences(employee_id: Optional[str] = None, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
     query = sb.table("absences").select("*, employees(first_name, last_name)")
     if employee_id:
         query = query.eq("employee_id", employee_id)
-    result = query.order("date_start").execute()
+    result = await query.order("date_start").execute()
     return result.data
 
 
 @router.post("", status_code=201)
-def create_absence(absence: AbsenceCreate):
-    sb = get_supabase()
-    result = sb.table("absences").insert(absence.model_dump()).execute()
+async def create_absence(absence: AbsenceCreate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    result = await sb.table("absences").insert(absence.model_dump()).execute()
     return result.data[0]
 
 
 @router.put("/{absence_id}")
-def update_absence(absence_id: str, absence: AbsenceUpdate):
-    sb = get_supabase()
+async def update_absence(absence_id: str, absence: AbsenceUpdate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
     data = {k: v for k, v in absence.model_dump().items() if v is not None}
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    result = sb.table("absences").update(data).eq("id", absence_id).execute()
+    result = await sb.table("absences").update(data).eq("id", absence_id).execute()
     if not result.data:
         raise HTTPException(status_code=404, detail="Absence not found")
     return result.data[0]
 
 
 @router.delete("/{absence_id}", status_code=204)
-def delete_absence(absence_id: str):
-    sb = get_supabase()
-    sb.table("absences").delete().eq("id", absence_id).execute()
+async def delete_absence(absence_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    await sb.table("absences").delete().eq("id", absence_id).execute()
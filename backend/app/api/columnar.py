@@ -0,0 +1,67 @@
+"""Columnar encoding of a schedule's assignments.
+
+Instead of one object per assignment, each repeating its keys and its
+employee and shift type, the employees, shift types and days are listed
+once and the assignments form a grid: grid[e][d] is the index in
+shift_types of employee e's shift on day d, or null on a day off.
+locked lists the [e, d] cells of locked assignments.
+"""
+
+from datetime import date, timedelta
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.calculator-health.columnar+json"
+ASSIGNMENT_COLUMNS = "employee_id, shift_type_id, date, is_locked"
+EMPLOYEE_COLUMNS = "id, first_name, last_name, role"
+SHIFT_TYPE_COLUMNS = "id, name, start_time, end_time, short_label"
+
+
+def wants_columnar(fmt: str | None, accept: str | None) -> bool:
+    """format=columnar, or the columnar media type in the Accept header."""
+    if fmt:
+        return fmt == "columnar"
+    return COLUMNAR_MEDIA_TYPE in (accept or "")
+
+
+def days_between(first: str, last: str) -> list[str]:
+    start, end = date.fromisoformat(first), date.fromisoformat(last)
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def to_columnar(schedule: dict, days: list[str], assignments: list, employees: list, shift_types: list) -> dict:
+    """schedule plus {format, days, employees, shift_types, grid, locked}.
+
+    Employees are sorted by name and shift types by start time; only those
+    with an assignment in the grid are listed.
+    """
+    used_employees = {a["employee_id"] for a in assignments}
+    used_shifts = {a["shift_type_id"] for a in assignments}
+    employees = sorted(
+        (e for e in employees if e["id"] in used_employees),
+        key=lambda e: (e["last_name"], e["first_name"], e["id"]),
+    )
+    shift_types = sorted(
+        (s for s in shift_types if s["id"] in used_shifts),
+        key=lambda s: (s["start_time"], s["id"]),
+    )
+    employee_index = {e["id"]: i for i, e in enumerate(employees)}
+    shift_index = {s["id"]: i for i, s in enumerate(shift_types)}
+    day_index = {d: i for i, d in enumerate(days)}
+
+    grid = [[None] * len(days) for _ in employees]
+    locked = []
+    for a in assignments:
+        e, d = employee_index.get(a["employee_id"]), day_index.get(a["date"])
+        if e is None or d is None:
+            continue
+        grid[e][d] = shift_index[a["shift_type_id"]]
+        if a.get("is_locked"):
+            locked.append([e, d])
+    return {
+        **schedule,
+        "format": "columnar",
+        "days": days,
+        "employees": employees,
+        "shift_types": shift_types,
+        "grid": grid,
+        "locked": sorted(locked, key=lambda cell: (cell[1], cell[0])),
+    }
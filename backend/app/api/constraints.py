@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
-from app.db.supabase_client import get_supabase
+from postgrest import AsyncPostgrestClient
+from app.api.http_cache import get_read_cache, read_through
+from app.db.supabase_client import get_async_supabase
 
 router = APIRouter()
 
@@ -12,19 +14,21 @@ class ConstraintUpdate(BaseModel):
 
 
 @router.get("")
-def list_constraints():
-    sb = get_supabase()
-    result = sb.table("constraint_rules").select("*").order("type,name").execute()
-    return result.data
+async def list_constraints(request: Request, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    async def load():
+        result = await sb.table("constraint_rules").select("*").order("type,name").execute()
+        return result.data
+
+    return await read_through(request, ("constraint_rules",), load)
 
 
 @router.put("/{constraint_id}")
-def update_constraint(constraint_id: str, constraint: ConstraintUpdate):
-    sb = get_supabase()
+async def update_constraint(constraint_id: str, constraint: ConstraintUpdate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
     data = {k: v for k, v in constraint.model_dump().items() if v is not None}
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    result = sb.table("constraint_rules").update(data).eq("id", constraint_id).execute()
+    result = await sb.table("constraint_rules").update(data).eq("id", constraint_id).execute()
+    get_read_cache().invalidate("constraint_rules")
     if not result.data:
         raise HTTPException(status_code=404, detail="Constraint not found")
     return result.data[0]
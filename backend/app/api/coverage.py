@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
-from app.db.supabase_client import get_supabase
+from postgrest import AsyncPostgrestClient
+from app.api.http_cache import get_read_cache, read_through
+from app.db.supabase_client import get_async_supabase
 
 router = APIRouter()
 
@@ -12,6 +14,7 @@ class CoverageCreate(BaseModel):
     min_infirmier: int = 0
     min_assc: int = 0
     min_aide_soignant: int = 0
+    unit_id: Optional[str] = None  # None = hospital-wide default
 
 
 class CoverageUpdate(BaseModel):
@@ -21,32 +24,37 @@ class CoverageUpdate(BaseModel):
 
 
 @router.get("")
-def list_coverage():
-    sb = get_supabase()
-    result = sb.table("coverage_requirements").select("*, shift_types(name)").execute()
-    return result.data
+async def list_coverage(request: Request, unit_id: Optional[str] = None, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    async def load():
+        query = sb.table("coverage_requirements").select("*, shift_types(name)")
+        if unit_id:
+            query = query.eq("unit_id", unit_id)
+        result = await query.execute()
+        return result.data
+
+    return await read_through(request, ("coverage_requirements", "shift_types"), load)
 
 
 @router.post("", status_code=201)
-def create_coverage(cov: CoverageCreate):
-    sb = get_supabase()
-    result = sb.table("coverage_requirements").insert(cov.model_dump()).execute()
+async def create_coverage(cov: CoverageCreate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    result = await sb.table("coverage_requirements").insert(cov.model_dump()).execute()
+    get_read_cache().invalidate("coverage_requirements")
     return result.data[0]
 
 
 @router.put("/{coverage_id}")
-def update_coverage(coverage_id: str, cov: CoverageUpdate):
-    sb = get_supabase()
+async def update_coverage(coverage_id: str, cov: CoverageUpdate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
     data = {k: v for k, v in cov.model_dump().items() if v is not None}
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    result = sb.table("coverage_requirements").update(data).eq("id", coverage_id).execute()
+    result = await sb.table("coverage_requirements").update(data).eq("id", coverage_id).execute()
+    get_read_cache().invalidate("coverage_requirements")
     if not result.data:
         raise HTTPException(status_code=404, detail="Coverage requirement not found")
     return result.data[0]
 
 
 @router.delete("/{coverage_id}", status_code=204)
-def delete_coverage(coverage_id: str):
-    sb = get_supabase()
-    sb.table("coverage_requirements").delete().eq("id", coverage_id).execute()
+async def delete_coverage(coverage_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    await sb.table("coverage_requirements").delete().eq("id", coverage_id).execute()
+    get_read_cache().invalidate("coverage_requirements")
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, field_validator, model_validator
 from typing import Optional
-from app.db.supabase_client import get_supabase
+from postgrest import AsyncPostgrestClient
+from app.api.http_cache import get_read_cache, read_through
+from app.db.supabase_client import get_async_supabase
 
 router = APIRouter()
 
 VALID_DAYS = {"lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"}
 VALID_RATES = {20, 40, 60, 80, 100}
+# Fields an update may set to null, e.g. to take an employee out of its unit
+NULLABLE_FIELDS = {"unit_id"}
 
 
 class EmployeeCreate(BaseModel):
@@ -15,6 +19,8 @@ class EmployeeCreate(BaseModel):
     role: str  # infirmier, assc, aide-soignant
     activity_rate: int = 100
     working_days: list[str] = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+    unit_id: Optional[str] = None
+    is_floating: bool = False  # pool staff dispatched to units at generate time
 
     @field_validator("activity_rate")
     @classmethod
@@ -48,6 +54,8 @@ class EmployeeUpdate(BaseModel):
     role: Optional[str] = None
     activity_rate: Optional[int] = None
     working_days: Optional[list[str]] = None
+    unit_id: Optional[str] = None
+    is_floating: Optional[bool] = None
 
     @field_validator("activity_rate")
     @classmethod
@@ -78,41 +86,48 @@ class EmployeeUpdate(BaseModel):
 
 
 @router.get("")
-def list_employees():
-    sb = get_supabase()
-    result = sb.table("employees").select("*").order("last_name").execute()
-    return result.data
+async def list_employees(request: Request, unit_id: Optional[str] = None, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    async def load():
+        query = sb.table("employees").select("*")
+        if unit_id:
+            query = query.eq("unit_id", unit_id)
+        result = await query.order("last_name").execute()
+        return result.data
+
+    return await read_through(request, ("employees",), load)
 
 
 @router.get("/{employee_id}")
-def get_employee(employee_id: str):
-    sb = get_supabase()
-    result = sb.table("employees").select("*").eq("id", employee_id).execute()
+async def get_employee(employee_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    result = await sb.table("employees").select("*").eq("id", employee_id).execute()
     if not result.data:
         raise HTTPException(status_code=404, detail="Employee not found")
     return result.data[0]
 
 
 @router.post("", status_code=201)
-def create_employee(employee: EmployeeCreate):
-    sb = get_supabase()
-    result = sb.table("employees").insert(employee.model_dump()).execute()
+async def create_employee(employee: EmployeeCreate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    result = await sb.table("employees").insert(employee.model_dump()).execute()
+    get_read_cache().invalidate("employees")
     return result.data[0]
 
 
 @router.put("/{employee_id}")
-def update_employee(employee_id: str, employee: EmployeeUpdate):
-    sb = get_supabase()
-    data = {k: v for k, v in employee.model_dump().items() if v is not None}
+async def update_employee(employee_id: str, employee: EmployeeUpdate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    data = {
+        k: v for k, v in employee.model_dump(exclude_unset=True).items()
+        if v is not None or k in NULLABLE_FIELDS
+    }
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    result = sb.table("employees").update(data).eq("id", employee_id).execute()
+    result = await sb.table("employees").update(data).eq("id", employee_id).execute()
+    get_read_cache().invalidate("employees")
     if not result.data:
         raise HTTPException(status_code=404, detail="Employee not found")
     return result.data[0]
 
 
 @router.delete("/{employee_id}", status_code=204)
-def delete_employee(employee_id: str):
-    sb = get_supabase()
-    sb.table("employees").delete().eq("id", employee_id).execute()
+async def delete_employee(employee_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    await sb.table("employees").delete().eq("id", employee_id).execute()
+    get_read_cache().invalidate("employees")
@@ -0,0 +1,156 @@
+"""Read-through cache and HTTP validators for rarely changing reads.
+
+Reference data (employees, shift types, coverage, constraint rules) and
+published schedules are kept in process, encoded, with the version of each
+table they were read from. The handlers that write a table call
+invalidate(table), which bumps its version and so drops every entry read
+from it. Entries also expire after read_cache_ttl_seconds, which bounds
+staleness when the write went through another worker process.
+
+Responses carry an ETag (hash of the body) and a Last-Modified date, and
+Cache-Control: no-cache so browsers revalidate; a matching If-None-Match
+or If-Modified-Since gets an empty 304.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+
+from app.api.responses import compress, encode_json, encoded_response
+from app.config import get_settings
+
+
+@dataclass
+class CachedBody:
+    content: bytes
+    gzipped: bytes | None
+    etag: str
+    last_modified: float
+    stored_at: float
+    versions: tuple
+    media_type: str
+    headers: dict
+
+
+class ReadCache:
+    """LRU of encoded responses bounded by entry count and TTL, keyed by request."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 60, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._versions: dict[str, int] = {}
+        self._entries: OrderedDict[tuple, CachedBody] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def versions(self, tables: tuple) -> tuple:
+        """Current versions of tables; take them before reading the data."""
+        with self._lock:
+            return tuple(self._versions.get(t, 0) for t in tables)
+
+    def invalidate(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key: tuple, tables: tuple) -> CachedBody | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            current = tuple(self._versions.get(t, 0) for t in tables)
+            if entry.versions != current or self._clock() - entry.stored_at > self.ttl_seconds:
+                # Kept until replaced, so unchanged content keeps its date
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self, key: tuple, versions: tuple, body, media_type: str = "application/json", headers: dict = None,
+    ) -> CachedBody:
+        """Encode and store body, read at versions; returns the entry."""
+        content = encode_json(body)
+        etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+        now = self._clock()
+        with self._lock:
+            previous = self._entries.get(key)
+        entry = CachedBody(
+            content=content,
+            gzipped=compress(content),
+            etag=etag,
+            # Unchanged content keeps its date across reloads
+            last_modified=previous.last_modified if previous and previous.etag == etag else now,
+            stored_at=now,
+            versions=versions,
+            media_type=media_type,
+            headers=dict(headers or {}),
+        )
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+
+@lru_cache()
+def get_read_cache() -> ReadCache:
+    settings = get_settings()
+    return ReadCache(max_entries=settings.read_cache_max_entries, ttl_seconds=settings.read_cache_ttl_seconds)
+
+
+def _not_modified(entry: CachedBody, request: Request) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or entry.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(entry.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def cached_response(entry: CachedBody, request: Request) -> Response:
+    """entry as a 200, or an empty 304 if the client's copy is current."""
+    validators = {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _not_modified(entry, request):
+        return Response(status_code=304, headers={**validators, "Vary": "Accept, Accept-Encoding"})
+    return encoded_response(
+        entry.content, entry.gzipped, request.headers.get("accept-encoding"),
+        media_type=entry.media_type, headers={**entry.headers, **validators},
+    )
+
+
+def request_key(request: Request, *extra) -> tuple:
+    """Cache key of a GET: its path and query parameters, plus extra."""
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())), *extra)
+
+
+async def read_through(request: Request, tables: tuple, load: Callable[[], Awaitable]) -> Response:
+    """The cached response for request, calling load() for the body on a miss."""
+    cache = get_read_cache()
+    key = request_key(request)
+    entry = cache.get(key, tables)
+    if entry is None:
+        versions = cache.versions(tables)
+        entry = cache.put(key, versions, await load())
+    return cached_response(entry, request)
@@ -0,0 +1,56 @@
+"""JSON responses encoded by the handler itself.
+
+The body is serialized once, without FastAPI's per-value encoding pass, and
+gzip-compressed when the client accepts it and the body is large enough to
+gain from it. Compression is per response rather than a global middleware,
+which would also buffer the server-sent event streams.
+"""
+
+import gzip
+import json
+
+from fastapi import Response
+
+from app.config import get_settings
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def encode_json(body) -> bytes:
+    return json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def compress(content: bytes) -> bytes | None:
+    """content gzipped, or None if it is below response_gzip_min_bytes."""
+    if len(content) < get_settings().response_gzip_min_bytes:
+        return None
+    return gzip.compress(content, compresslevel=6)
+
+
+def encoded_response(
+    content: bytes,
+    gzipped: bytes | None = None,
+    accept_encoding: str | None = None,
+    media_type: str = "application/json",
+    headers: dict = None,
+) -> Response:
+    """content, or its gzipped form when there is one and the client accepts it."""
+    headers = {**(headers or {}), "Vary": "Accept, Accept-Encoding"}
+    if gzipped is not None and accepts_gzip(accept_encoding):
+        content = gzipped
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+def json_response(
+    body, accept_encoding: str | None = None, media_type: str = "application/json", headers: dict = None,
+) -> Response:
+    content = encode_json(body)
+    gzipped = compress(content) if accepts_gzip(accept_encoding) else None
+    return encoded_response(content, gzipped, accept_encoding, media_type, headers)
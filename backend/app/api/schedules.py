@@ -1,119 +1,655 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import asyncio
+import base64
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from itertools import islice
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional
-from app.db.supabase_client import get_supabase
-from app.solver.engine import solve_schedule
+from postgrest import AsyncPostgrestClient
+from app.api import columnar
+from app.api.http_cache import cached_response, get_read_cache, request_key
+from app.api.responses import json_response
+from app.config import get_settings
+from app.db.bulk import BulkWriteError, insert_batch, write_in_batches
+from app.db.loader import load_solver_inputs
+from app.db.paging import fetch_all
+from app.db.supabase_client import get_async_supabase, get_supabase
+from app.jobs import Job, JobError, JobQueueFull, get_job_manager
+from app.solver.boundary import HISTORY_DAYS, boundary_state
+from app.solver.executor import get_solver_executor
+from app.solver.repair import build_repair_scope
+from app.solver.units import allocate_floating_staff, split_by_unit, unit_coverage
 
 router = APIRouter()
 
+# The list leaves out solver_stats, which grows with every schedule; it is
+# served by /{id}/stats and with a single schedule.
+SCHEDULE_LIST_COLUMNS = "id, period_start, period_end, status, unit_id, created_at"
+ASSIGNMENT_DETAIL_COLUMNS = (
+    "*, employees(first_name, last_name, role), shift_types(name, start_time, end_time, short_label)"
+)
+MAX_PAGE_SIZE = 1000
+# A published schedule's response changes with the schedule and with the
+# employees and shift types it embeds
+PUBLISHED_SCHEDULE_TABLES = ("schedules", "employees", "shift_types")
+# Status of a schedule whose assignments are still being written: hidden
+# from every read until _save_schedule marks it a draft
+SAVING_STATUS = "saving"
+
+
+class StopPolicyOverride(BaseModel):
+    """Per-request overrides of the solver_stop_policy rule."""
+    relative_gap: Optional[float] = None  # e.g. 0.01 = within 1% of the optimum
+    absolute_gap: Optional[float] = None
+    no_improvement_seconds: Optional[float] = None
+    seconds_per_1000_vars: Optional[float] = None
+    min_time_limit_seconds: Optional[float] = None
+    max_time_limit_seconds: Optional[float] = None
+
 
 class ScheduleGenerateRequest(BaseModel):
     period_start: str  # YYYY-MM-DD
     period_end: str
     locked_assignments: list = []  # [{employee_id, shift_type_id, date}]
+    priority: int = Field(0, ge=0)  # higher = larger share of solver cores
+    base_schedule_id: Optional[str] = None  # warm-start from this schedule
+    minimize_changes: bool = False  # with base_schedule_id: stay close to it
+    stream_drafts: bool = False  # include assignments in "solution" job events
+    stop_policy: Optional[StopPolicyOverride] = None
+    unit_ids: Optional[list[str]] = None  # solve these units separately, in parallel
+    assign_floating_staff: bool = True  # with unit_ids: dispatch floating staff first
+    rolling_window_weeks: Optional[int] = Field(None, ge=1)  # solve long periods window by window
+    rolling_overlap_weeks: int = Field(1, ge=0)  # lookahead weeks re-solved by the next window
+    carry_boundary: bool = True  # honor rest/hours/weekends from the previous schedule
 
 
-class SchedulePublish(BaseModel):
-    status: str  # draft / published
+class ScheduleRepairRequest(BaseModel):
+    employee_ids: list[str]  # employees whose availability changed
+    date_start: date
+    date_end: date
 
+    @model_validator(mode="after")
+    def validate_range(self):
+        if self.date_end < self.date_start:
+            raise ValueError("date_end précède date_start")
+        return self
 
-@router.get("")
-def list_schedules():
-    sb = get_supabase()
-    result = sb.table("schedules").select("*").order("created_at", desc=True).execute()
-    return result.data
+
+class SchedulePublish(BaseModel):
+    status: str  # draft / published
 
 
-@router.get("/{schedule_id}")
-def get_schedule(schedule_id: str):
-    sb = get_supabase()
-    schedule = sb.table("schedules").select("*").eq("id", schedule_id).execute()
+def _load_base_assignments(sb, schedule_id: str) -> list:
+    schedule = sb.table("schedules").select("id").eq("id", schedule_id).neq("status", SAVING_STATUS).execute()
     if not schedule.data:
-        raise HTTPException(status_code=404, detail="Schedule not found")
-
-    assignments = (
-        sb.table("schedule_assignments")
-        .select("*, employees(first_name, last_name, role), shift_types(name, start_time, end_time, short_label)")
+        raise JobError("Base schedule not found")
+    return fetch_all(
+        lambda: sb.table("schedule_assignments")
+        .select("employee_id, shift_type_id, date, is_locked")
         .eq("schedule_id", schedule_id)
         .order("date,employee_id")
+    )
+
+
+def _load_boundary(sb, period_start: str, shift_types: list) -> list:
+    """Boundary state from the schedules of the two weeks before period_start.
+
+    For each unit and period, the published schedule wins over drafts, then
+    the most recent one.
+    """
+    start = date.fromisoformat(period_start)
+    history_start = (start - timedelta(days=HISTORY_DAYS)).isoformat()
+    eve = (start - timedelta(days=1)).isoformat()
+    schedules = (
+        sb.table("schedules")
+        .select("id, unit_id, period_start, period_end, status, created_at")
+        .neq("status", SAVING_STATUS)
+        .lte("period_start", eve)
+        .gte("period_end", history_start)
         .execute()
+        .data
     )
+    best = {}
+    for schedule in sorted(schedules, key=lambda s: (s["status"] == "published", s["created_at"])):
+        best[(schedule.get("unit_id"), schedule["period_start"], schedule["period_end"])] = schedule["id"]
+    if not best:
+        return []
+    assignments = fetch_all(
+        lambda: sb.table("schedule_assignments")
+        .select("employee_id, shift_type_id, date")
+        .in_("schedule_id", list(best.values()))
+        .gte("date", history_start)
+        .lte("date", eve)
+        .order("schedule_id,date,employee_id")
+    )
+    return boundary_state(assignments, shift_types, period_start)
+
+
+def _assignment_rows(schedule_id: str, assignments: list):
+    """schedule_assignments rows of a result, generated lazily.
+
+    Ids derive from (schedule, employee, date), the table's unique key, so
+    the same rows can be rebuilt for a response without keeping them.
+    """
+    namespace = uuid.UUID(schedule_id)
+    for a in assignments:
+        yield {
+            "id": str(uuid.uuid5(namespace, f"{a['employee_id']}/{a['date']}")),
+            "schedule_id": schedule_id,
+            "employee_id": a["employee_id"],
+            "shift_type_id": a["shift_type_id"],
+            "date": a["date"],
+            "is_locked": a.get("is_locked", False),
+        }
+
+
+def _save_schedule(sb, period_start: str, period_end: str, result: dict, unit_id: str = None) -> dict:
+    """Save a schedule and its assignments; returns the schedule row.
 
+    The schedule and the first batch of assignments are written in one
+    transaction (save_schedule RPC), so most schedules take one round trip.
+    Larger ones are saved with the "saving" status, which every read skips,
+    get their remaining assignments from the bulk writer and only then become
+    a draft: an interrupted save never shows. If a batch still fails, the
+    schedule is deleted.
+    """
+    settings = get_settings()
+    schedule_id = str(uuid.uuid4())
+    assignments = result["assignments"]
+    rows = _assignment_rows(schedule_id, assignments)
+    complete = len(assignments) <= settings.schedule_save_batch_size
+    row = {
+        "id": schedule_id,
+        "period_start": period_start,
+        "period_end": period_end,
+        "status": "draft" if complete else SAVING_STATUS,
+        "solver_stats": result["stats"],
+        "unit_id": unit_id,
+    }
+    first_batch = list(islice(rows, settings.schedule_save_batch_size))
+    schedule = sb.rpc("save_schedule", {"p_schedule": row, "p_assignments": first_batch}).execute()
+    if complete:
+        return schedule.data
+    try:
+        write_in_batches(
+            lambda batch: insert_batch(sb, "schedule_assignments", batch),
+            rows,
+            batch_size=settings.schedule_save_batch_size,
+            max_parallel=settings.schedule_save_max_parallel,
+            retries=settings.schedule_save_retries,
+        )
+    except BulkWriteError:
+        sb.table("schedules").delete().eq("id", schedule_id).execute()
+        raise
+    return sb.table("schedules").update({"status": "draft"}).eq("id", schedule_id).execute().data[0]
+
+
+def _schedule_detail(schedule: dict, assignments: list, employees: list, shift_types: list) -> dict:
+    """get_schedule's response, built from a saved schedule row, the solver's
+    assignments and the solve's reference data."""
+    employees_by_id = {
+        e["id"]: {"first_name": e["first_name"], "last_name": e["last_name"], "role": e["role"]}
+        for e in employees
+    }
+    shift_types_by_id = {
+        s["id"]: {
+            "name": s["name"], "start_time": s["start_time"], "end_time": s["end_time"],
+            "short_label": s.get("short_label"),
+        }
+        for s in shift_types
+    }
     return {
-        **schedule.data[0],
-        "assignments": assignments.data,
+        **schedule,
+        "assignments": [
+            {
+                **a,
+                "employees": employees_by_id.get(a["employee_id"]),
+                "shift_types": shift_types_by_id.get(a["shift_type_id"]),
+            }
+            for a in sorted(
+                _assignment_rows(schedule["id"], assignments), key=lambda a: (a["date"], a["employee_id"]),
+            )
+        ],
     }
 
 
-@router.post("/generate", status_code=201)
-def generate_schedule(req: ScheduleGenerateRequest):
+def _solved_period_end(req: ScheduleGenerateRequest, result: dict) -> str:
+    """Last day of the saved schedule: a rolling solve stopped early ends sooner."""
+    return result["stats"].get("rolling", {}).get("solved_until", req.period_end)
+
+
+def _run_generate_job(job: Job, req: ScheduleGenerateRequest) -> dict | None:
     sb = get_supabase()
 
-    # Fetch all needed data
-    employees = sb.table("employees").select("*").execute().data
-    shift_types = sb.table("shift_types").select("*").execute().data
-    coverage = sb.table("coverage_requirements").select("*").execute().data
-    absences = sb.table("absences").select("*").execute().data
-    constraints = sb.table("constraint_rules").select("*").eq("is_active", True).execute().data
-
-    if not employees:
-        raise HTTPException(status_code=400, detail="No employees configured")
-    if not shift_types:
-        raise HTTPException(status_code=400, detail="No shift types configured")
-
-    # Solve
-    result = solve_schedule(
-        employees=employees,
-        shift_types=shift_types,
-        coverage_requirements=coverage,
-        absences=absences,
-        constraint_rules=constraints,
-        period_start=req.period_start,
-        period_end=req.period_end,
-        locked_assignments=req.locked_assignments,
-    )
+    job.emit("stage", stage="loading")
+    inputs = load_solver_inputs(sb, req.period_start, req.period_end)
+    if not inputs["employees"]:
+        raise JobError("No employees configured")
+    if not inputs["shift_types"]:
+        raise JobError("No shift types configured")
 
-    if result is None:
-        raise HTTPException(status_code=422, detail="No feasible schedule found")
+    locked = list(req.locked_assignments)
+    warm_start = {}
+    if req.base_schedule_id:
+        base = _load_base_assignments(sb, req.base_schedule_id)
+        # Keep the base schedule's manual locks
+        locked += [a for a in base if a.get("is_locked")]
+        warm_start = {
+            "previous_assignments": base,
+            "minimize_changes": req.minimize_changes,
+            "time_limit_seconds": get_settings().resolve_time_limit_seconds,
+        }
+    if job.cancel_event.is_set():
+        return None
 
-    # Save schedule
-    schedule = sb.table("schedules").insert({
+    job.emit("stage", stage="solving")
+    solve_args = {
         "period_start": req.period_start,
         "period_end": req.period_end,
-        "status": "draft",
-        "solver_stats": result["stats"],
-    }).execute()
+        "cancel_event": job.stop_event,
+        "report_assignments": req.stream_drafts,
+        "stop_policy": req.stop_policy.model_dump(exclude_none=True) if req.stop_policy else None,
+    }
+    if req.carry_boundary:
+        solve_args["boundary"] = _load_boundary(sb, req.period_start, inputs["shift_types"])
+    if req.rolling_window_weeks:
+        solve_args["rolling_window_weeks"] = req.rolling_window_weeks
+        solve_args["rolling_overlap_weeks"] = req.rolling_overlap_weeks
+    if req.unit_ids:
+        return _solve_units(job, sb, req, inputs, locked, solve_args)
 
-    schedule_id = schedule.data[0]["id"]
+    inputs["coverage_requirements"] = unit_coverage(inputs["coverage_requirements"], None)
+    result = get_solver_executor().solve(
+        priority=req.priority,
+        **inputs,
+        locked_assignments=locked,
+        on_solution=lambda event: job.emit("solution", **event),
+        **solve_args,
+        **warm_start,
+    )
+    if job.cancel_event.is_set():
+        return None
+    if result is None:
+        if job.stop_event.is_set():
+            raise JobError("Stopped before a feasible schedule was found")
+        raise JobError("No feasible schedule found")
 
-    # Save assignments
-    assignments_to_insert = []
-    for a in result["assignments"]:
-        assignments_to_insert.append({
-            "schedule_id": schedule_id,
-            "employee_id": a["employee_id"],
-            "shift_type_id": a["shift_type_id"],
-            "date": a["date"],
-            "is_locked": a.get("is_locked", False),
-        })
+    job.emit("stage", stage="saving")
+    if req.base_schedule_id:
+        result["stats"]["warm_start"] = {
+            **result["stats"].get("warm_start", {}),
+            "base_schedule_id": req.base_schedule_id,
+        }
+    schedule = _save_schedule(sb, req.period_start, _solved_period_end(req, result), result)
+    return {"schedule_id": schedule["id"], "stats": result["stats"]}
+
+
+def _solve_units(job: Job, sb, req: ScheduleGenerateRequest, inputs: dict, locked: list, solve_args: dict) -> dict | None:
+    """Solve each unit as its own problem, in parallel, and save one schedule per unit."""
+    floating = {}
+    if req.assign_floating_staff:
+        floating = allocate_floating_staff(inputs, req.unit_ids, req.period_start, req.period_end)
+        job.emit("floating_staff", allocation=floating)
+    per_unit = split_by_unit(inputs, req.unit_ids, floating, locked)
+    empty = [unit_id for unit_id, unit_inputs in per_unit.items() if not unit_inputs["employees"]]
+    if empty:
+        raise JobError(f"No employees in unit(s): {', '.join(empty)}")
+
+    executor = get_solver_executor()
+
+    def solve_unit(unit_id: str) -> dict | None:
+        return executor.solve(
+            priority=req.priority,
+            **per_unit[unit_id],
+            on_solution=lambda event: job.emit("solution", unit_id=unit_id, **event),
+            **solve_args,
+        )
+
+    with ThreadPoolExecutor(max_workers=len(req.unit_ids), thread_name_prefix="unit") as pool:
+        results = dict(zip(req.unit_ids, pool.map(solve_unit, req.unit_ids)))
+    if job.cancel_event.is_set():
+        return None
+    infeasible = [unit_id for unit_id, result in results.items() if result is None]
+    if infeasible:
+        raise JobError(f"No feasible schedule found for unit(s): {', '.join(infeasible)}")
+
+    job.emit("stage", stage="saving")
+    schedules = []
+    for unit_id, result in results.items():
+        result["stats"]["unit"] = {
+            "unit_id": unit_id,
+            "num_floating": sum(1 for u in floating.values() if u == unit_id),
+        }
+        schedule = _save_schedule(sb, req.period_start, _solved_period_end(req, result), result, unit_id=unit_id)
+        schedules.append({"unit_id": unit_id, "schedule_id": schedule["id"], "stats": result["stats"]})
+    return {"schedules": schedules, "floating_staff": floating}
+
+
+def _get_job_or_404(job_id: str) -> Job:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def _format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def _encode_cursor(*values: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
 
-    if assignments_to_insert:
-        sb.table("schedule_assignments").insert(assignments_to_insert).execute()
 
-    return get_schedule(schedule_id)
+def _decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _after(first: str, second: str, values: list, descending: bool = False) -> str:
+    """PostgREST or-filter for rows after values in (first, second) order."""
+    op = "lt" if descending else "gt"
+    a, b = (json.dumps(str(v)) for v in values)
+    return f"{first}.{op}.{a},and({first}.eq.{a},{second}.{op}.{b})"
+
+
+def _page(rows: list, limit: int, response: Response, key) -> list:
+    """Keep limit rows of a limit + 1 fetch; X-Next-Cursor points past them if more remain."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(*key(rows[-1]))
+    return rows
+
+
+@router.get("")
+async def list_schedules(
+    response: Response,
+    unit_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    sb: AsyncPostgrestClient = Depends(get_async_supabase),
+):
+    """Most recent schedules first, without their solver_stats.
+
+    Pass the X-Next-Cursor response header back as cursor for the next page.
+    """
+    query = sb.table("schedules").select(SCHEDULE_LIST_COLUMNS).neq("status", SAVING_STATUS)
+    if unit_id:
+        query = query.eq("unit_id", unit_id)
+    if status:
+        query = query.eq("status", status)
+    if cursor:
+        query = query.or_(_after("created_at", "id", _decode_cursor(cursor, 2), descending=True))
+    result = await query.order("created_at.desc,id.desc").limit(limit + 1).execute()
+    return _page(result.data, limit, response, lambda s: (s["created_at"], s["id"]))
+
+
+@router.post("/generate", status_code=202)
+async def generate_schedule(req: ScheduleGenerateRequest):
+    """Queue a solve job and return it; poll /jobs/{id} for the schedule id.
+
+    With unit_ids, each unit is solved separately and the job result lists
+    one schedule per unit instead of a single schedule_id. With
+    rolling_window_weeks, the period is solved window by window.
+    """
+    if req.rolling_window_weeks and req.rolling_window_weeks - req.rolling_overlap_weeks < 2:
+        raise HTTPException(status_code=400, detail="A rolling window must advance by at least 2 weeks")
+    if req.unit_ids:
+        if req.base_schedule_id:
+            raise HTTPException(status_code=400, detail="base_schedule_id cannot be combined with unit_ids")
+        req.unit_ids = list(dict.fromkeys(req.unit_ids))
+    try:
+        job = get_job_manager().submit(
+            "generate",
+            lambda job: _run_generate_job(job, req),
+            params={"period_start": req.period_start, "period_end": req.period_end, "unit_ids": req.unit_ids},
+        )
+    except JobQueueFull:
+        raise HTTPException(status_code=503, detail="Too many schedule generations pending, retry later")
+    return job.to_dict()
+
+
+@router.get("/jobs")
+async def list_jobs():
+    return [job.to_dict() for job in get_job_manager().list()]
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    return _get_job_or_404(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, last_event_id: Optional[int] = Header(None)):
+    """Server-sent events for a job, ending once it is finished.
+
+    "solution" events report each improving solution (objective, bound,
+    gap, elapsed_ms) while the solver runs.
+    """
+    job = _get_job_or_404(job_id)
+    start = last_event_id + 1 if last_event_id is not None else 0
+
+    async def event_stream():
+        sent = start
+        while True:
+            finished = job.is_finished
+            events = await job.wait_events_async(sent, timeout=15)
+            for event in events:
+                yield _format_sse(event)
+            sent += len(events)
+            if finished and not events:
+                return
+            if not events:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.post("/jobs/{job_id}/stop")
+async def stop_job(job_id: str):
+    """End the search now and save the best schedule found so far."""
+    _get_job_or_404(job_id)
+    return get_job_manager().stop(job_id).to_dict()
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    _get_job_or_404(job_id)
+    return get_job_manager().cancel(job_id).to_dict()
+
+
+@router.get("/{schedule_id}")
+async def get_schedule(
+    schedule_id: str,
+    request: Request,
+    response: Response,
+    date_from: Optional[date] = None,  # inclusive
+    date_to: Optional[date] = None,
+    employee_id: Optional[list[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_stats: bool = True,
+    format: Optional[str] = Query(None, pattern="^(json|columnar)$"),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    sb: AsyncPostgrestClient = Depends(get_async_supabase),
+):
+    """A schedule with its assignments, ordered by date then employee.
+
+    date_from/date_to and employee_id restrict the assignments, e.g. to the
+    week the calendar shows. With limit, assignments come in pages: pass the
+    X-Next-Cursor response header back as cursor for the next one.
+
+    format=columnar (or Accept: COLUMNAR_MEDIA_TYPE) returns the assignments
+    as an employee × day grid, see app.api.columnar; it is not paginated.
+    Large responses are gzip-compressed when the client accepts it.
+    Published schedules are cached and carry ETag/Last-Modified validators.
+    """
+    as_columnar = columnar.wants_columnar(format, accept)
+    if as_columnar and (limit or cursor):
+        raise HTTPException(status_code=400, detail="The columnar format is not paginated")
+    cache = get_read_cache()
+    key = request_key(request, as_columnar)
+    cached = cache.get(key, PUBLISHED_SCHEDULE_TABLES)
+    if cached is not None:
+        return cached_response(cached, request)
+    versions = cache.versions(PUBLISHED_SCHEDULE_TABLES)
+
+    assignments = (
+        sb.table("schedule_assignments")
+        .select(columnar.ASSIGNMENT_COLUMNS if as_columnar else ASSIGNMENT_DETAIL_COLUMNS)
+        .eq("schedule_id", schedule_id)
+    )
+    if date_from:
+        assignments = assignments.gte("date", date_from.isoformat())
+    if date_to:
+        assignments = assignments.lte("date", date_to.isoformat())
+    if employee_id:
+        assignments = assignments.in_("employee_id", employee_id)
+    if cursor:
+        assignments = assignments.or_(_after("date", "employee_id", _decode_cursor(cursor, 2)))
+    assignments = assignments.order("date,employee_id")
+    if limit:
+        assignments = assignments.limit(limit + 1)
+    columns = "*" if include_stats else SCHEDULE_LIST_COLUMNS
+    schedule, assignments = await asyncio.gather(
+        sb.table("schedules").select(columns).eq("id", schedule_id).neq("status", SAVING_STATUS).execute(),
+        assignments.execute(),
+    )
+    if not schedule.data:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    schedule = schedule.data[0]
+
+    rows = assignments.data
+    if as_columnar:
+        body = columnar.to_columnar(
+            schedule,
+            columnar.days_between(
+                max(date_from.isoformat() if date_from else "", schedule["period_start"]),
+                min(date_to.isoformat() if date_to else "9999", schedule["period_end"]),
+            ),
+            rows,
+            *await _load_references(sb, rows),
+        )
+        media_type = columnar.COLUMNAR_MEDIA_TYPE
+    else:
+        if limit:
+            rows = _page(rows, limit, response, lambda a: (a["date"], a["employee_id"]))
+        body = {**schedule, "assignments": rows}
+        media_type = "application/json"
+    headers = dict(response.headers)
+    if schedule.get("status") == "published":
+        return cached_response(cache.put(key, versions, body, media_type, headers), request)
+    return json_response(body, accept_encoding, media_type, headers)
+
+
+async def _load_references(sb: AsyncPostgrestClient, assignments: list) -> tuple[list, list]:
+    """The employees and shift types the assignments refer to."""
+    if not assignments:
+        return [], []
+    employees, shift_types = await asyncio.gather(
+        sb.table("employees")
+        .select(columnar.EMPLOYEE_COLUMNS)
+        .in_("id", sorted({a["employee_id"] for a in assignments}))
+        .execute(),
+        sb.table("shift_types")
+        .select(columnar.SHIFT_TYPE_COLUMNS)
+        .in_("id", sorted({a["shift_type_id"] for a in assignments}))
+        .execute(),
+    )
+    return employees.data, shift_types.data
+
+
+@router.get("/{schedule_id}/stats")
+async def get_schedule_stats(schedule_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    """Solver stats of a schedule: model build profile and CP-SAT search stats."""
+    schedule = await (
+        sb.table("schedules").select("id, solver_stats").eq("id", schedule_id).neq("status", SAVING_STATUS).execute()
+    )
+    if not schedule.data:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return schedule.data[0]["solver_stats"] or {}
+
+
+def _run_repair(sb, base: dict, req: ScheduleRepairRequest) -> dict:
+    """Load, solve and save a repair of base; returns the new schedule with its assignments."""
+    settings = get_settings()
+    inputs = load_solver_inputs(sb, base["period_start"], base["period_end"])
+    previous = _load_base_assignments(sb, base["id"])
+    if base.get("unit_id"):
+        # The unit's staff, plus floating staff dispatched to it in this schedule
+        dispatched = {a["employee_id"]: base["unit_id"] for a in previous}
+        inputs = split_by_unit(inputs, [base["unit_id"]], dispatched, [])[base["unit_id"]]
+        del inputs["locked_assignments"]
+    else:
+        inputs["coverage_requirements"] = unit_coverage(inputs["coverage_requirements"], None)
+    scope = build_repair_scope(
+        inputs["employees"], base["period_start"], base["period_end"],
+        req.employee_ids, req.date_start.isoformat(), req.date_end.isoformat(),
+        horizon_days=settings.repair_horizon_days,
+    )
+
+    result = get_solver_executor().solve(
+        **inputs,
+        period_start=base["period_start"],
+        period_end=base["period_end"],
+        locked_assignments=[a for a in previous if a.get("is_locked")],
+        previous_assignments=previous,
+        minimize_changes=True,
+        repair_scope=scope,
+        boundary=_load_boundary(sb, base["period_start"], inputs["shift_types"]),
+        time_limit_seconds=settings.repair_time_limit_seconds,
+    )
+    if result is None:
+        raise HTTPException(status_code=422, detail="No feasible repair found in this neighbourhood")
+
+    result["stats"]["repair"]["base_schedule_id"] = base["id"]
+    schedule = _save_schedule(sb, base["period_start"], base["period_end"], result, unit_id=base.get("unit_id"))
+    return _schedule_detail(schedule, result["assignments"], inputs["employees"], inputs["shift_types"])
+
+
+@router.post("/{schedule_id}/repair", status_code=201)
+async def repair_schedule(schedule_id: str, req: ScheduleRepairRequest, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    """Re-optimize only the neighbourhood of a change and save it as a new draft.
+
+    Everything outside the affected days (± rest horizon) and the affected
+    employees' role pool keeps its value from the existing schedule.
+    """
+    schedule = await sb.table("schedules").select("*").eq("id", schedule_id).neq("status", SAVING_STATUS).execute()
+    if not schedule.data:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    # Loading, solving and saving block: run them in a worker thread
+    base = schedule.data[0]
+    if req.date_end.isoformat() < base["period_start"] or req.date_start.isoformat() > base["period_end"]:
+        raise HTTPException(status_code=400, detail="The repaired days are outside the schedule's period")
+    return await run_in_threadpool(_run_repair, get_supabase(), base, req)
 
 
 @router.put("/{schedule_id}/status")
-def update_schedule_status(schedule_id: str, body: SchedulePublish):
-    sb = get_supabase()
-    result = sb.table("schedules").update({"status": body.status}).eq("id", schedule_id).execute()
+async def update_schedule_status(schedule_id: str, body: SchedulePublish, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    if body.status not in ("draft", "published"):
+        raise HTTPException(status_code=400, detail="Status must be draft or published")
+    result = await (
+        sb.table("schedules").update({"status": body.status}).eq("id", schedule_id).neq("status", SAVING_STATUS).execute()
+    )
+    get_read_cache().invalidate("schedules")
     if not result.data:
         raise HTTPException(status_code=404, detail="Schedule not found")
     return result.data[0]
 
 
 @router.delete("/{schedule_id}", status_code=204)
-def delete_schedule(schedule_id: str):
-    sb = get_supabase()
-    sb.table("schedule_assignments").delete().eq("schedule_id", schedule_id).execute()
-    sb.table("schedules").delete().eq("id", schedule_id).execute()
+async def delete_schedule(schedule_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    await sb.table("schedule_assignments").delete().eq("schedule_id", schedule_id).execute()
+    await sb.table("schedules").delete().eq("id", schedule_id).execute()
+    get_read_cache().invalidate("schedules")
@@ -1,8 +1,10 @@
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional
-from app.db.supabase_client import get_supabase
+from postgrest import AsyncPostgrestClient
+from app.api.http_cache import get_read_cache, read_through
+from app.db.supabase_client import get_async_supabase
 
 logger = logging.getLogger(__name__)
 
@@ -26,34 +28,34 @@ class ShiftTypeUpdate(BaseModel):
 
 
 @router.get("")
-def list_shift_types():
-    sb = get_supabase()
-    result = sb.table("shift_types").select("*").order("start_time").execute()
-    return result.data
+async def list_shift_types(request: Request, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    async def load():
+        result = await sb.table("shift_types").select("*").order("start_time").execute()
+        return result.data
+
+    return await read_through(request, ("shift_types",), load)
 
 
 @router.get("/{shift_id}")
-def get_shift_type(shift_id: str):
-    sb = get_supabase()
-    result = sb.table("shift_types").select("*").eq("id", shift_id).execute()
+async def get_shift_type(shift_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    result = await sb.table("shift_types").select("*").eq("id", shift_id).execute()
     if not result.data:
         raise HTTPException(status_code=404, detail="Shift type not found")
     return result.data[0]
 
 
 @router.post("", status_code=201)
-def create_shift_type(shift: ShiftTypeCreate):
-    sb = get_supabase()
+async def create_shift_type(shift: ShiftTypeCreate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
     data = shift.model_dump()
     if not data.get("short_label"):
         data["short_label"] = shift.name[0].upper() if shift.name else "X"
-    result = sb.table("shift_types").insert(data).execute()
+    result = await sb.table("shift_types").insert(data).execute()
     new_shift = result.data[0]
 
     # Auto-create coverage requirements for all 3 day types
     for day_type in ("weekday", "saturday", "sunday"):
         try:
-            sb.table("coverage_requirements").insert({
+            await sb.table("coverage_requirements").insert({
                 "shift_type_id": new_shift["id"],
                 "day_type": day_type,
                 "min_infirmier": 0,
@@ -62,23 +64,24 @@ def create_shift_type(shift: ShiftTypeCreate):
             }).execute()
         except Exception as e:
             logger.error(f"Failed to create coverage for {day_type}: {e}")
+    get_read_cache().invalidate("shift_types")
 
     return new_shift
 
 
 @router.put("/{shift_id}")
-def update_shift_type(shift_id: str, shift: ShiftTypeUpdate):
-    sb = get_supabase()
+async def update_shift_type(shift_id: str, shift: ShiftTypeUpdate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
     data = {k: v for k, v in shift.model_dump().items() if v is not None}
     if not data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    result = sb.table("shift_types").update(data).eq("id", shift_id).execute()
+    result = await sb.table("shift_types").update(data).eq("id", shift_id).execute()
+    get_read_cache().invalidate("shift_types")
     if not result.data:
         raise HTTPException(status_code=404, detail="Shift type not found")
     return result.data[0]
 
 
 @router.delete("/{shift_id}", status_code=204)
-def delete_shift_type(shift_id: str):
-    sb = get_supabase()
-    sb.table("shift_types").delete().eq("id", shift_id).execute()
+async def delete_shift_type(shift_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    await sb.table("shift_types").delete().eq("id", shift_id).execute()
+    get_read_cache().invalidate("shift_types")
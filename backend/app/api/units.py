@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from typing import Optional
+from postgrest import AsyncPostgrestClient
+from app.api.http_cache import get_read_cache
+from app.db.supabase_client import get_async_supabase
+
+router = APIRouter()
+
+
+class UnitCreate(BaseModel):
+    name: str
+
+
+class UnitUpdate(BaseModel):
+    name: Optional[str] = None
+
+
+@router.get("")
+async def list_units(sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    result = await sb.table("units").select("*").order("name").execute()
+    return result.data
+
+
+@router.get("/{unit_id}")
+async def get_unit(unit_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    result = await sb.table("units").select("*").eq("id", unit_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Unit not found")
+    return result.data[0]
+
+
+@router.post("", status_code=201)
+async def create_unit(unit: UnitCreate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    result = await sb.table("units").insert(unit.model_dump()).execute()
+    return result.data[0]
+
+
+@router.put("/{unit_id}")
+async def update_unit(unit_id: str, unit: UnitUpdate, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    data = {k: v for k, v in unit.model_dump().items() if v is not None}
+    if not data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    result = await sb.table("units").update(data).eq("id", unit_id).execute()
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Unit not found")
+    return result.data[0]
+
+
+@router.delete("/{unit_id}", status_code=204)
+async def delete_unit(unit_id: str, sb: AsyncPostgrestClient = Depends(get_async_supabase)):
+    await sb.table("units").delete().eq("id", unit_id).execute()
+    # Cascades to the unit's coverage and schedules and unassigns its staff
+    get_read_cache().invalidate("employees", "coverage_requirements", "schedules")
@@ -6,8 +6,53 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_key: str = ""
     supabase_service_key: str = ""
+    # Shared client connection pool
+    supabase_max_connections: int = 20
+    supabase_keepalive_seconds: float = 30
+    # Rows per page for reads that can exceed PostgREST's max-rows (1000)
+    supabase_page_size: int = 1000
+
     backend_cors_origins: str = "http://localhost:3000,http://localhost:3001,http://localhost:3002"
 
+    # Background solve jobs
+    solver_max_concurrent_jobs: int = 2
+    solver_max_pending_jobs: int = 20
+    job_retention_seconds: int = 3600
+
+    # Solver process pool: fair_share, priority or max_concurrent
+    solver_executor_policy: str = "fair_share"
+    solver_total_workers: int = 0  # 0 = all cores
+    solver_max_concurrent_solves: int = 2
+    # Time presolve from the CP-SAT search log (adds a Python log callback)
+    solver_profile_search_log: bool = False
+
+    # Solve-result cache keyed by input hash (0 entries = disabled)
+    solve_cache_max_entries: int = 64
+    solve_cache_ttl_seconds: int = 3600
+    solve_cache_dir: str = ""  # empty = memory only
+
+    # Saving schedules: assignments beyond the first batch are written in
+    # batches, max_parallel at a time, each retried on failure
+    schedule_save_batch_size: int = 1000
+    schedule_save_max_parallel: int = 4
+    schedule_save_retries: int = 2
+
+    # Schedule responses at least this large are gzip-compressed for
+    # clients that accept it
+    response_gzip_min_bytes: int = 1024
+
+    # Read-through cache of reference data and published schedules; the
+    # TTL bounds staleness after a write handled by another worker
+    read_cache_max_entries: int = 256
+    read_cache_ttl_seconds: float = 60
+
+    # Warm-started re-solves from an existing schedule
+    resolve_time_limit_seconds: int = 5
+
+    # Neighbourhood repair after an absence
+    repair_time_limit_seconds: int = 2
+    repair_horizon_days: int = 1
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,97 @@
+"""Chunked bulk inserts for large writes (schedule assignments).
+
+Rows are consumed lazily from an iterable and sent in batches of
+batch_size, at most max_parallel batches in flight, so memory holds a few
+batches whatever the total. A failed batch is retried on its own; inserts
+are idempotent on the row id, so a batch that did reach the database
+before its response was lost is not duplicated.
+
+Against PostgREST, batches are sent as CSV, its COPY-like bulk format,
+which is about half the size of the JSON body; other clients get JSON.
+"""
+
+import csv
+import io
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable
+
+from postgrest.types import ReturnMethod
+
+
+class BulkWriteError(RuntimeError):
+    """A batch still failed after its retries."""
+
+
+def _to_csv(rows: list[dict]) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]), lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def insert_batch(sb, table: str, rows: list[dict]) -> None:
+    """Insert rows, skipping ids already present, without returning them."""
+    postgrest = getattr(sb, "postgrest", None)
+    if postgrest is not None:
+        response = postgrest.session.post(
+            f"/{table}",
+            params={"on_conflict": "id"},
+            content=_to_csv(rows),
+            headers={"Content-Type": "text/csv", "Prefer": "return=minimal,resolution=ignore-duplicates"},
+        )
+        response.raise_for_status()
+    else:
+        sb.table(table).upsert(
+            rows, on_conflict="id", ignore_duplicates=True, returning=ReturnMethod.minimal,
+        ).execute()
+
+
+def _with_retries(write: Callable[[list], None], batch: list, retries: int, backoff_seconds: float) -> None:
+    for attempt in range(retries + 1):
+        try:
+            write(batch)
+            return
+        except Exception as e:
+            if attempt == retries:
+                raise BulkWriteError(f"Batch of {len(batch)} rows failed after {retries + 1} attempts: {e}") from e
+            time.sleep(backoff_seconds * 2 ** attempt)
+
+
+def write_in_batches(
+    write: Callable[[list], None],
+    rows: Iterable[dict],
+    batch_size: int = 1000,
+    max_parallel: int = 4,
+    retries: int = 2,
+    backoff_seconds: float = 0.5,
+) -> int:
+    """Call write(batch) for consecutive batches of rows; returns the number of rows written.
+
+    Raises BulkWriteError once a batch exhausts its retries; batches already
+    written stay written.
+    """
+    rows = iter(rows)
+    written = 0
+    with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="bulk") as pool:
+        in_flight = {}
+        while True:
+            while len(in_flight) < max_parallel:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                in_flight[pool.submit(_with_retries, write, batch, retries, backoff_seconds)] = len(batch)
+            if not in_flight:
+                return written
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                size = in_flight.pop(future)
+                try:
+                    future.result()
+                except BulkWriteError:
+                    for pending in in_flight:
+                        pending.cancel()
+                    raise
+                written += size
@@ -0,0 +1,36 @@
+"""Loading of the solver inputs for a period.
+
+The five tables are read concurrently, each with only the columns the
+solver, the unit decomposition and the saved schedule's response use.
+Absences are restricted to those overlapping the period, so the payload
+does not grow with the history.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+EMPLOYEE_COLUMNS = "id, first_name, last_name, role, activity_rate, working_days, unit_id, is_floating"
+SHIFT_TYPE_COLUMNS = "id, name, start_time, end_time, duration_hours, short_label"
+COVERAGE_COLUMNS = "shift_type_id, day_type, min_infirmier, min_assc, min_aide_soignant, unit_id"
+ABSENCE_COLUMNS = "employee_id, date_start, date_end, type"
+CONSTRAINT_RULE_COLUMNS = "name, type, parameter"
+
+
+def load_solver_inputs(sb, period_start: str, period_end: str) -> dict:
+    """{employees, shift_types, coverage_requirements, absences, constraint_rules}."""
+    queries = {
+        "employees": lambda: sb.table("employees").select(EMPLOYEE_COLUMNS),
+        "shift_types": lambda: sb.table("shift_types").select(SHIFT_TYPE_COLUMNS),
+        "coverage_requirements": lambda: sb.table("coverage_requirements").select(COVERAGE_COLUMNS),
+        "absences": lambda: (
+            sb.table("absences")
+            .select(ABSENCE_COLUMNS)
+            .lte("date_start", period_end)
+            .gte("date_end", period_start)
+        ),
+        "constraint_rules": lambda: (
+            sb.table("constraint_rules").select(CONSTRAINT_RULE_COLUMNS).eq("is_active", True)
+        ),
+    }
+    with ThreadPoolExecutor(max_workers=len(queries), thread_name_prefix="load") as pool:
+        futures = {name: pool.submit(lambda q=query: q().execute().data) for name, query in queries.items()}
+        return {name: future.result() for name, future in futures.items()}
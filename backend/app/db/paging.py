@@ -0,0 +1,21 @@
+"""Reading every row of a query, page by page.
+
+PostgREST caps each response at its max-rows setting (1000 on Supabase)
+and silently drops the rest, so reads that can exceed it are fetched in
+pages of supabase_page_size rows, which must not exceed that cap.
+"""
+
+from typing import Callable
+
+from app.config import get_settings
+
+
+def fetch_all(query: Callable, page_size: int = None) -> list:
+    """All rows of query(), a factory of select builders with a total order."""
+    page_size = page_size or get_settings().supabase_page_size
+    rows = []
+    while True:
+        page = query().range(len(rows), len(rows) + page_size - 1).execute().data
+        rows += page
+        if len(page) < page_size:
+            return rows
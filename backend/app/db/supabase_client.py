@@ -1,7 +1,102 @@
-from supabase import create_client, Client
+"""Application-scoped Supabase clients.
+
+One client is created for the process and shared by every caller, so calls
+reuse its keep-alive HTTP connections instead of building a client and
+opening a connection each time. Each connection pool is bounded by
+supabase_max_connections: beyond that, requests wait for a free connection.
+
+API handlers are async and use the async PostgREST client
+(Depends(get_async_supabase)), so a worker keeps serving requests while
+queries are in flight. Background jobs run in threads and use the sync
+client (get_supabase).
+"""
+
+import threading
+
+import httpx
+from postgrest import AsyncPostgrestClient
+from postgrest.utils import AsyncClient, SyncClient
+from supabase import Client, create_client
+
 from app.config import get_settings
 
+_client: Client | None = None
+_async_client: AsyncPostgrestClient | None = None
+_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.supabase_max_connections,
+        max_keepalive_connections=settings.supabase_max_connections,
+        keepalive_expiry=settings.supabase_keepalive_seconds,
+    )
+
+
+class _PooledAsyncPostgrestClient(AsyncPostgrestClient):
+    def create_session(self, base_url, headers, timeout) -> AsyncClient:
+        return AsyncClient(base_url=base_url, headers=headers, timeout=timeout, limits=_limits())
+
+
+def _create_supabase() -> Client:
+    settings = get_settings()
+    client = create_client(settings.supabase_url, settings.supabase_service_key or settings.supabase_key)
+    # Replace the PostgREST session with a pooled keep-alive one
+    session = client.postgrest.session
+    client.postgrest.session = SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        limits=_limits(),
+    )
+    session.close()
+    return client
+
 
 def get_supabase() -> Client:
+    """The shared client, created on first use."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _create_supabase()
+    return _client
+
+
+def close_supabase() -> None:
+    """Close the shared client's connections; the next get_supabase creates a new one."""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.postgrest.session.close()
+
+
+def _create_async_supabase() -> AsyncPostgrestClient:
     settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_service_key or settings.supabase_key)
+    key = settings.supabase_service_key or settings.supabase_key
+    return _PooledAsyncPostgrestClient(
+        f"{settings.supabase_url}/rest/v1",
+        headers={
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        },
+    )
+
+
+async def get_async_supabase() -> AsyncPostgrestClient:
+    """The shared async client, created on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = _create_async_supabase()
+    return _async_client
+
+
+async def close_async_supabase() -> None:
+    global _async_client
+    client, _async_client = _async_client, None
+    if client is not None:
+        await client.aclose()
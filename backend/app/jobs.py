@@ -0,0 +1,242 @@
+"""In-process job queue for long-running solver work.
+
+Jobs run on a bounded thread pool so that API handlers return immediately
+with a job id. Each job keeps an append-only list of progress events that
+clients can poll or stream. A job can be cancelled (its result is dropped)
+or stopped (the solver ends its search early and the best solution found
+so far is kept).
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable
+
+from app.config import get_settings
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting or running."""
+
+
+class JobError(Exception):
+    """Raised by a job function to fail the job with a user-facing message."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: dict = field(default_factory=dict)
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: dict | None = None
+    error: str | None = None
+    events: list = field(default_factory=list)
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    # Set on cancel and on stop: tells the solver to end its search
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    # (loop, asyncio.Event) of streams awaiting the next event
+    _async_waiters: list = field(default_factory=list, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def emit(self, event_type: str, **data) -> None:
+        """Append a progress event and wake up any waiting stream."""
+        with self._cond:
+            self.events.append({
+                "id": len(self.events),
+                "type": event_type,
+                "time": time.time(),
+                **data,
+            })
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+    def wait_events(self, after: int, timeout: float) -> list[dict]:
+        """Return events with index >= after, blocking up to timeout if none yet."""
+        with self._cond:
+            if len(self.events) <= after and not self.is_finished:
+                self._cond.wait(timeout)
+            return self.events[after:]
+
+    async def wait_events_async(self, after: int, timeout: float) -> list[dict]:
+        """wait_events for async callers: awaits without holding a thread."""
+        waiter = asyncio.Event()
+        with self._cond:
+            if len(self.events) > after or self.is_finished:
+                return self.events[after:]
+            self._async_waiters.append((asyncio.get_running_loop(), waiter))
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._cond:
+            self._async_waiters = [w for w in self._async_waiters if w[1] is not waiter]
+            return self.events[after:]
+
+    def _set_status(self, status: str, **data) -> None:
+        self.status = status
+        if status == RUNNING:
+            self.started_at = time.time()
+        elif status in FINISHED_STATUSES:
+            self.finished_at = time.time()
+        self.emit("status", status=status, **data)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+            "num_events": len(self.events),
+        }
+
+
+class JobManager:
+    """Bounded worker pool running jobs and tracking their state."""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 20, retention_seconds: int = 3600):
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: dict[str, Job] = {}
+        self._futures: dict = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable, params: dict | None = None) -> Job:
+        """Queue fn(job) for execution and return the new job.
+
+        fn returns the job result dict; raising JobError fails the job with
+        its message. Raises JobQueueFull when max_pending jobs are unfinished.
+        """
+        with self._lock:
+            self._prune()
+            pending = sum(1 for j in self._jobs.values() if not j.is_finished)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} jobs already pending")
+            job = Job(id=str(uuid.uuid4()), kind=kind, params=params or {})
+            self._jobs[job.id] = job
+            job.emit("status", status=QUEUED)
+            self._futures[job.id] = self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancel a queued job, or ask a running one to stop."""
+        job = self._jobs.get(job_id)
+        if job is None or job.is_finished:
+            return job
+        job.cancel_event.set()
+        job.stop_event.set()
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            job._set_status(CANCELLED)
+        else:
+            job.emit("cancel_requested")
+        return job
+
+    def stop(self, job_id: str) -> Job | None:
+        """Ask a running job to finish early with its best result so far.
+
+        A job that has not started yet has nothing to keep and is cancelled.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.is_finished:
+            return job
+        if job.status == QUEUED:
+            return self.cancel(job_id)
+        job.stop_event.set()
+        job.emit("stop_requested")
+        return job
+
+    def shutdown(self) -> None:
+        for job in list(self._jobs.values()):
+            if not job.is_finished:
+                job.cancel_event.set()
+                job.stop_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, fn: Callable) -> None:
+        try:
+            self._execute(job, fn)
+        finally:
+            # submit stores the future under the same lock, so this cannot
+            # run before it is stored
+            with self._lock:
+                self._futures.pop(job.id, None)
+
+    def _execute(self, job: Job, fn: Callable) -> None:
+        if job.cancel_event.is_set():
+            job._set_status(CANCELLED)
+            return
+        job._set_status(RUNNING)
+        try:
+            result = fn(job)
+        except JobError as e:
+            job.error = str(e)
+            job._set_status(FAILED, error=job.error)
+            return
+        except Exception as e:
+            job.error = f"Unexpected error: {e}"
+            job._set_status(FAILED, error=job.error)
+            return
+
+        if job.cancel_event.is_set():
+            job._set_status(CANCELLED)
+        else:
+            job.result = result
+            job._set_status(SUCCEEDED, result=result)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            # Jobs cancelled before they started never reach _run
+            self._futures.pop(job_id, None)
+
+
+@lru_cache()
+def get_job_manager() -> JobManager:
+    settings = get_settings()
+    return JobManager(
+        max_workers=settings.solver_max_concurrent_jobs,
+        max_pending=settings.solver_max_pending_jobs,
+        retention_seconds=settings.job_retention_seconds,
+    )
@@ -1,12 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-from app.api import employees, shifts, coverage, schedules, absences, constraints
+from app.db.supabase_client import close_async_supabase, close_supabase, get_supabase
+from app.api import employees, shifts, coverage, schedules, absences, constraints, units
+from app.jobs import get_job_manager
+from app.solver.executor import get_solver_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if get_settings().supabase_url:
+        get_supabase()
+    yield
+    get_job_manager().shutdown()
+    get_solver_executor().shutdown()
+    close_supabase()
+    await close_async_supabase()
+
 
 app = FastAPI(
     title="Calculator Health API",
     description="API de planification des horaires du personnel soignant — CHUV",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 settings = get_settings()
@@ -17,8 +34,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+app.include_router(units.router, prefix="/api/units", tags=["Units"])
 app.include_router(employees.router, prefix="/api/employees", tags=["Employees"])
 app.include_router(shifts.router, prefix="/api/shifts", tags=["Shift Types"])
 app.include_router(coverage.router, prefix="/api/coverage", tags=["Coverage"])
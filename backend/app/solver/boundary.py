@@ -0,0 +1,89 @@
+"""Boundary state carried over from the schedule before the period.
+
+Rest between shifts, weekly hours and weekend rest span period boundaries:
+a night on the eve of the period limits its first morning. Rather than
+loading the whole previous schedule into the model, each employee gets a
+compact state computed from its last two weeks:
+
+- last_shift_type_id: shift worked on the eve of the period, if any,
+- week_hours: hours already worked in the period's first calendar week,
+- last_free_weekend: Saturday of the last fully free weekend (None if
+  neither weekend of the history was free).
+"""
+
+from datetime import date, timedelta
+
+from app.solver.index import ProblemIndex
+from app.solver.models import BoundaryState
+
+# History needed to know the last free weekend before the period
+HISTORY_DAYS = 14
+
+
+def boundary_state(previous_assignments: list, shift_types: list, period_start: str) -> list[dict]:
+    """Per-employee boundary state from assignments of the days before period_start.
+
+    previous_assignments must cover the HISTORY_DAYS before the period;
+    employees without any assignment there get no state (nothing carried over).
+    """
+    start = date.fromisoformat(period_start)
+    history_start = start - timedelta(days=HISTORY_DAYS)
+    eve = (start - timedelta(days=1)).isoformat()
+    week_start = (start - timedelta(days=start.weekday())).isoformat()
+    durations = {s["id"]: float(s["duration_hours"]) for s in shift_types}
+    saturdays = [
+        history_start + timedelta(days=i) for i in range(HISTORY_DAYS - 1)
+        if (history_start + timedelta(days=i)).weekday() == 5
+    ]
+
+    by_employee: dict[str, dict[str, str]] = {}
+    for a in previous_assignments:
+        if history_start.isoformat() <= a["date"] < period_start:
+            by_employee.setdefault(a["employee_id"], {})[a["date"]] = a["shift_type_id"]
+
+    states = []
+    for employee_id, worked in sorted(by_employee.items()):
+        free = [
+            sat for sat in saturdays
+            if sat.isoformat() not in worked and (sat + timedelta(days=1)).isoformat() not in worked
+        ]
+        states.append({
+            "employee_id": employee_id,
+            "last_shift_type_id": worked.get(eve),
+            "week_hours": sum(durations.get(s, 0) for d, s in worked.items() if d >= week_start),
+            "last_free_weekend": free[-1].isoformat() if free else None,
+        })
+    return states
+
+
+def boundary_constraints(
+    index: ProblemIndex, boundary: list[BoundaryState],
+) -> tuple[dict[int, int], dict[int, int], set[int]]:
+    """Boundary state in model indices, for the constraint builders.
+
+    Returns ({e_idx: s_idx worked on the eve}, {e_idx: tenths already worked
+    in the first calendar week}, {e_idx who worked the weekend just before the
+    period}).
+    """
+    first_day = index.days[0]
+    # Weekend just before the period, only when it lies entirely before it
+    previous_saturday = first_day - timedelta(days=(first_day.weekday() - 5) % 7 or 7)
+    if previous_saturday + timedelta(days=1) >= first_day:
+        previous_saturday = None
+
+    eve_shifts, carried_tenths, worked_weekend = {}, {}, set()
+    for state in boundary:
+        e_idx = index.employee_idx.get(state.employee_id)
+        if e_idx is None:
+            continue
+        s_idx = index.shift_idx.get(state.last_shift_type_id)
+        if s_idx is not None:
+            eve_shifts[e_idx] = s_idx
+        if state.week_hours and first_day.weekday() != 0:
+            carried_tenths[e_idx] = round(state.week_hours * 10)
+        if previous_saturday is not None and (
+            state.last_free_weekend is None
+            or date.fromisoformat(state.last_free_weekend) < previous_saturday
+        ):
+            worked_weekend.add(e_idx)
+    return eve_shifts, carried_tenths, worked_weekend
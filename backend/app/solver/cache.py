@@ -0,0 +1,162 @@
+"""Content-addressed cache of solve results.
+
+The key is a hash of the parsed solver input, so identical generate
+requests (same employees, shift types, coverage, absences, active rules,
+period and time limit) return the stored result instead of searching again.
+Entries are bounded by count and age, and optionally written to disk so
+they survive a restart.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from functools import lru_cache
+
+from app.config import get_settings
+from app.solver.engine import (
+    _parse_employees, _parse_shift_types, _parse_coverage, _parse_absences,
+    _parse_locked, _parse_previous,
+)
+
+# solve_schedule arguments that do not change the result
+_IGNORED_ARGS = {"cancel_event", "num_workers", "on_solution", "report_assignments", "profile_search_log"}
+
+
+def _canonical(items: list) -> list:
+    """Dataclasses as dicts, sorted so that input order does not matter."""
+    return sorted((asdict(i) for i in items), key=lambda d: json.dumps(d, sort_keys=True))
+
+
+def solve_key(**kwargs) -> str:
+    """Canonical SHA-256 of the solve_schedule arguments."""
+    payload = {
+        "employees": _canonical(_parse_employees(kwargs.get("employees") or [])),
+        "shift_types": _canonical(_parse_shift_types(kwargs.get("shift_types") or [])),
+        "coverage": _canonical(_parse_coverage(kwargs.get("coverage_requirements") or [])),
+        "absences": _canonical(_parse_absences(kwargs.get("absences") or [])),
+        "locked": _canonical(_parse_locked(kwargs.get("locked_assignments") or [])),
+        "previous": _canonical(_parse_previous(kwargs.get("previous_assignments") or [])),
+        "rule_params": {
+            r["name"]: r.get("parameter") or {}
+            for r in kwargs.get("constraint_rules") or []
+        },
+    }
+    handled = set(payload) | {
+        "coverage_requirements", "locked_assignments", "previous_assignments", "constraint_rules",
+    }
+    for name, value in kwargs.items():
+        if name not in handled and name not in _IGNORED_ARGS:
+            payload[name] = value
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class SolveCache:
+    """LRU of solve results bounded by entry count and TTL, with optional disk copy."""
+
+    def __init__(self, max_entries: int = 64, ttl_seconds: int = 3600, directory: str = "", clock=time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._prune_disk()
+
+    def get(self, key: str) -> dict | None:
+        """A copy of the cached result, or None on a miss."""
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._read_disk(key)
+                if entry is not None:
+                    self._store(key, entry)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if self._clock() - stored_at > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self._remove_disk(key)
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(result)
+
+    def put(self, key: str, result: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        entry = (self._clock(), copy.deepcopy(result))
+        with self._lock:
+            self._store(key, entry)
+            if self.directory:
+                self._write_disk(key, entry)
+                self._prune_disk()
+
+    def _store(self, key: str, entry: tuple[float, dict]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key: str) -> tuple[float, dict] | None:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data["stored_at"], data["result"]
+
+    def _write_disk(self, key: str, entry: tuple[float, dict]) -> None:
+        stored_at, result = entry
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"stored_at": stored_at, "result": result}, f)
+        os.replace(tmp, self._path(key))
+        # _prune_disk ages files by mtime, so keep it on the cache's clock
+        os.utime(self._path(key), (stored_at, stored_at))
+
+    def _remove_disk(self, key: str) -> None:
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _prune_disk(self) -> None:
+        """Keep at most max_entries unexpired files, newest first."""
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                files.append((os.path.getmtime(path), path))
+        files.sort(reverse=True)
+        cutoff = self._clock() - self.ttl_seconds
+        for i, (mtime, path) in enumerate(files):
+            if i >= self.max_entries or mtime < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+@lru_cache()
+def get_solve_cache() -> SolveCache:
+    settings = get_settings()
+    return SolveCache(
+        max_entries=settings.solve_cache_max_entries,
+        ttl_seconds=settings.solve_cache_ttl_seconds,
+        directory=settings.solve_cache_dir,
+    )
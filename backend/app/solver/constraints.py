@@ -1,156 +1,192 @@
-"""Hard constraints for the nurse scheduling solver."""
+"""Hard constraints for the nurse scheduling solver.
 
-from datetime import date, timedelta
-from app.solver.models import Employee, ShiftType, CoverageRequirement, Absence
+Working days and absences are not constraints: build_shift_vars never
+creates variables for those cells (see app.solver.variables).
+"""
 
+from app.solver.index import ProblemIndex
+from app.solver.models import LockedAssignment
+from app.solver.variables import ShiftVars
 
-def add_one_shift_per_day(model, shifts_var, employees, shift_types, days):
+
+def add_one_shift_per_day(model, shifts_var: ShiftVars, index: ProblemIndex):
     """Each employee works at most one shift per day."""
-    for e_idx, emp in enumerate(employees):
-        for d_idx in range(len(days)):
-            model.AddAtMostOne(
-                shifts_var[(e_idx, d_idx, s_idx)]
-                for s_idx in range(len(shift_types))
-            )
+    for _, cell in shifts_var.cells():
+        if len(cell) > 1:
+            model.AddAtMostOne(var for _, var in cell)
 
 
-def add_coverage_constraints(model, shifts_var, employees, shift_types, days, coverage_reqs):
-    """Each shift on each day must meet minimum staffing requirements."""
-    for d_idx, day in enumerate(days):
-        day_type = _get_day_type(day)
-        for s_idx, shift in enumerate(shift_types):
-            # Find matching coverage requirement
-            matching = [c for c in coverage_reqs
-                        if c.shift_type_id == shift.id and c.day_type == day_type]
-            if not matching:
+def add_coverage_constraints(model, shifts_var: ShiftVars, index: ProblemIndex, fixed_counts=None):
+    """Each shift on each day must meet minimum staffing requirements.
+
+    fixed_counts maps (d_idx, s_idx) to {role: count} of shifts already
+    covered by employees left out of the model (repair solves).
+    """
+    fixed_counts = fixed_counts or {}
+    for d_idx in range(len(index.days)):
+        for s_idx in range(len(index.shift_types)):
+            cov = index.coverage_for(s_idx, d_idx)
+            if cov is None:
                 continue
-            cov = matching[0]
+            slot = shifts_var.slot(d_idx, s_idx)
+            fixed = fixed_counts.get((d_idx, s_idx), {})
 
             # Minimum total employees
-            model.Add(
-                sum(shifts_var[(e_idx, d_idx, s_idx)] for e_idx in range(len(employees)))
-                >= cov.min_employees
-            )
+            model.Add(sum(var for _, var in slot) + sum(fixed.values()) >= cov.min_employees)
 
             # Per-role minimums
             for role_name, min_count in cov.role_minimums.items():
-                eligible = [e_idx for e_idx, emp in enumerate(employees)
-                            if emp.role == role_name]
-                if eligible:
+                if role_name in index.employees_by_role:
                     model.Add(
-                        sum(shifts_var[(e_idx, d_idx, s_idx)] for e_idx in eligible)
+                        sum(var for e_idx, var in slot
+                            if index.employees[e_idx].role == role_name)
+                        + fixed.get(role_name, 0)
                         >= min_count
                     )
 
 
-def add_rest_between_shifts(model, shifts_var, employees, shift_types, days, min_rest_hours=11):
-    """Minimum rest hours between consecutive shifts.
+def rest_conflicts(shift_types: list, min_rest_hours=11) -> dict[int, frozenset[int]]:
+    """Forbidden transitions: s1_idx -> s2_idx that cannot be worked the next day.
 
-    For non-night shifts ending on day d, rest = (24 - end_hour) + start_hour_next.
-    For night shifts ending on morning of day d+1, rest = start_hour_next - end_hour.
+    For non-night shifts ending on day d, rest = (24h - end) + start_next.
+    For night shifts ending on morning of day d+1, rest = start_next - end.
     """
-    for e_idx in range(len(employees)):
-        for d_idx in range(len(days) - 1):
-            for s1_idx, s1 in enumerate(shift_types):
-                for s2_idx, s2 in enumerate(shift_types):
-                    end_hour = s1.end_hour()
-                    start_hour = s2.start_hour()
-
-                    if s1.is_night:
-                        # Night shift ends next morning (day d+1), s2 also starts day d+1
-                        gap = start_hour - end_hour
-                        if gap < 0:
-                            gap += 24
-                    else:
-                        # Normal shift ends on day d, s2 starts on day d+1
-                        gap = (24 - end_hour) + start_hour
-
-                    if gap < min_rest_hours:
-                        model.AddBoolOr([
-                            shifts_var[(e_idx, d_idx, s1_idx)].Not(),
-                            shifts_var[(e_idx, d_idx + 1, s2_idx)].Not(),
-                        ])
-
-
-def add_max_weekly_hours(model, shifts_var, employees, shift_types, days):
-    """Enforce maximum weekly hours based on activity rate."""
-    num_days = len(days)
-    # Process week by week
-    for week_start in range(0, num_days, 7):
-        week_end = min(week_start + 7, num_days)
-        for e_idx, emp in enumerate(employees):
-            # Sum of hours this week * 10 to work with integers
-            weekly_hours_x10 = sum(
-                shifts_var[(e_idx, d_idx, s_idx)] * int(shift_types[s_idx].duration_hours * 10)
-                for d_idx in range(week_start, week_end)
-                for s_idx in range(len(shift_types))
-            )
-            max_hours_x10 = int(emp.max_weekly_hours * 10)
-            model.Add(weekly_hours_x10 <= max_hours_x10)
-
-
-def add_absence_constraints(model, shifts_var, employees, shift_types, days, absences):
-    """No assignments on absence days."""
-    for absence in absences:
-        e_idx = next(
-            (i for i, emp in enumerate(employees) if emp.id == absence.employee_id),
-            None,
-        )
-        if e_idx is None:
-            continue
-
-        abs_start = date.fromisoformat(absence.date_start)
-        abs_end = date.fromisoformat(absence.date_end)
-
-        for d_idx, day in enumerate(days):
-            if abs_start <= day <= abs_end:
-                for s_idx in range(len(shift_types)):
-                    model.Add(shifts_var[(e_idx, d_idx, s_idx)] == 0)
-
+    min_rest = min_rest_hours * 60
+    conflicts = {}
+    for s1_idx, s1 in enumerate(shift_types):
+        forbidden = set()
+        for s2_idx, s2 in enumerate(shift_types):
+            if s1.is_night:
+                # Night shift ends next morning (day d+1), s2 also starts day d+1
+                gap = (s2.start_minutes - s1.end_minutes) % (24 * 60)
+            else:
+                # Normal shift ends on day d, s2 starts on day d+1
+                gap = (24 * 60 - s1.end_minutes) + s2.start_minutes
+            if gap < min_rest:
+                forbidden.add(s2_idx)
+        if forbidden:
+            conflicts[s1_idx] = frozenset(forbidden)
+    return conflicts
+
+
+def add_rest_between_shifts(
+    model, shifts_var: ShiftVars, index: ProblemIndex, min_rest_hours=11, eve_shifts=None,
+):
+    """Minimum rest hours between consecutive shifts.
 
-WEEKDAY_TO_FRENCH = {
-    0: "lundi", 1: "mardi", 2: "mercredi", 3: "jeudi",
-    4: "vendredi", 5: "samedi", 6: "dimanche",
-}
+    Shift types with the same forbidden successors are grouped, and each
+    group gives one AtMostOne per employee and day over its shifts on day d
+    and the forbidden shifts on day d+1. Since at most one shift is worked
+    per day, this is exactly "no forbidden transition".
 
+    eve_shifts maps e_idx to the shift worked the day before the period
+    (boundary state); its forbidden successors are excluded on day 0.
+    """
+    conflicts = rest_conflicts(index.shift_types, min_rest_hours)
+    for e_idx, s1_idx in (eve_shifts or {}).items():
+        forbidden = conflicts.get(s1_idx, frozenset())
+        for s_idx, var in shifts_var.cell(e_idx, 0):
+            if s_idx in forbidden:
+                model.Add(var == 0)
+
+    groups: dict[frozenset[int], set[int]] = {}
+    for s1_idx, forbidden in conflicts.items():
+        groups.setdefault(forbidden, set()).add(s1_idx)
+    if not groups:
+        return
+
+    for (e_idx, d_idx), cell in shifts_var.cells():
+        next_cell = shifts_var.cell(e_idx, d_idx + 1)
+        if not next_cell:
+            continue
+        for forbidden, sources in groups.items():
+            today = [var for s_idx, var in cell if s_idx in sources]
+            tomorrow = [var for s_idx, var in next_cell if s_idx in forbidden]
+            if today and tomorrow:
+                model.AddAtMostOne(today + tomorrow)
 
-def add_working_days_constraint(model, shifts_var, employees, shift_types, days):
-    """Employees can only work on their declared working days."""
-    for e_idx, emp in enumerate(employees):
-        for d_idx, day in enumerate(days):
-            if WEEKDAY_TO_FRENCH[day.weekday()] not in emp.working_days:
-                for s_idx in range(len(shift_types)):
-                    model.Add(shifts_var[(e_idx, d_idx, s_idx)] == 0)
 
+def add_max_weekly_hours(model, shifts_var: ShiftVars, index: ProblemIndex, carried_tenths=None):
+    """Enforce maximum weekly hours based on activity rate.
 
-def add_weekend_rest(model, shifts_var, employees, shift_types, days, min_free_weekends=1):
-    """At least 1 free weekend per 2-week period."""
+    carried_tenths maps e_idx to the tenths of hours already worked earlier
+    in the period's first calendar week (boundary state); they count with
+    the period's days up to the first Sunday.
+    """
+    num_days = len(index.days)
+    shift_types = index.shift_types
+    # Process week by week, in tenths of hours to work with integers
+    for week_start in range(0, num_days, 7):
+        week_end = min(week_start + 7, num_days)
+        for e_idx, emp in enumerate(index.employees):
+            terms = [
+                var * shift_types[s_idx].duration_tenths
+                for d_idx in range(week_start, week_end)
+                for s_idx, var in shifts_var.cell(e_idx, d_idx)
+            ]
+            if terms:
+                model.Add(sum(terms) <= emp.max_weekly_tenths)
+
+    first_sunday = min(6 - index.days[0].weekday(), num_days - 1)
+    for e_idx, tenths in (carried_tenths or {}).items():
+        terms = [
+            var * shift_types[s_idx].duration_tenths
+            for d_idx in range(first_sunday + 1)
+            for s_idx, var in shifts_var.cell(e_idx, d_idx)
+        ]
+        if terms:
+            model.Add(sum(terms) <= max(index.employees[e_idx].max_weekly_tenths - tenths, 0))
+
+
+def add_weekend_rest(
+    model, shifts_var: ShiftVars, index: ProblemIndex, min_free_weekends=1, anchor=None,
+    worked_weekend=None,
+):
+    """At least 1 free weekend per 2-week period.
+
+    Weekends are paired from the first one in the period, or from the
+    Saturday `anchor` (a date) when the model is a window of a longer period.
+    Employees in worked_weekend (e_idx who worked the weekend just before the
+    period, from the boundary state) also get their first weekend free.
+    """
+    days = index.days
     num_days = len(days)
-    for e_idx in range(len(employees)):
-        # Find all weekends (Saturday + Sunday pairs)
-        weekends = []
-        for d_idx, day in enumerate(days):
-            if day.weekday() == 5:  # Saturday
-                sun_idx = d_idx + 1
-                if sun_idx < num_days and days[sun_idx].weekday() == 6:
-                    weekends.append((d_idx, sun_idx))
 
+    # Find all weekends (Saturday + Sunday pairs)
+    weekends = []
+    for d_idx, day in enumerate(days):
+        if day.weekday() == 5:  # Saturday
+            sun_idx = d_idx + 1
+            if sun_idx < num_days and days[sun_idx].weekday() == 6:
+                weekends.append((d_idx, sun_idx))
+
+    if weekends and min_free_weekends > 0:
+        for e_idx in worked_weekend or ():
+            for d_idx in weekends[0]:
+                for _, var in shifts_var.cell(e_idx, d_idx):
+                    model.Add(var == 0)
+
+    first_pair = 0
+    if anchor is not None and weekends:
+        first_pair = ((days[weekends[0][0]] - anchor).days // 7) % 2
+
+    for e_idx in range(len(index.employees)):
         # For each 2-consecutive-weekend window
-        for w in range(0, len(weekends) - 1, 2):
+        for w in range(first_pair, len(weekends) - 1, 2):
             weekend_pair = weekends[w:w + 2]
             if len(weekend_pair) < 2:
                 break
 
-            # For each weekend, create a bool var: is this weekend free?
+            # For each weekend, is it free? (constant 1 if no shift is possible)
             free_weekend_vars = []
             for sat_idx, sun_idx in weekend_pair:
-                is_free = model.NewBoolVar(f"free_we_{e_idx}_{sat_idx}")
-                # is_free = 1 iff no shifts on Saturday and Sunday
-                all_shifts = []
-                for s_idx in range(len(shift_types)):
-                    all_shifts.append(shifts_var[(e_idx, sat_idx, s_idx)])
-                    all_shifts.append(shifts_var[(e_idx, sun_idx, s_idx)])
+                all_shifts = [var for _, var in shifts_var.cell(e_idx, sat_idx)]
+                all_shifts += [var for _, var in shifts_var.cell(e_idx, sun_idx)]
+                if not all_shifts:
+                    free_weekend_vars.append(1)
+                    continue
 
+                is_free = model.NewBoolVar(f"free_we_{e_idx}_{sat_idx}")
                 # is_free => all shifts are 0
                 for sv in all_shifts:
                     model.Add(sv == 0).OnlyEnforceIf(is_free)
@@ -162,30 +198,17 @@ def add_weekend_rest(model, shifts_var, employees, shift_types, days, min_free_w
             model.Add(sum(free_weekend_vars) >= min_free_weekends)
 
 
-def add_locked_assignments(model, shifts_var, employees, shift_types, days, locked):
+def add_locked_assignments(model, shifts_var: ShiftVars, index: ProblemIndex, locked: list[LockedAssignment]):
     """Force locked (manually set) assignments."""
     for lock in locked:
-        e_idx = next(
-            (i for i, emp in enumerate(employees) if emp.id == lock.employee_id),
-            None,
-        )
-        s_idx = next(
-            (i for i, s in enumerate(shift_types) if s.id == lock.shift_type_id),
-            None,
-        )
-        d_idx = next(
-            (i for i, d in enumerate(days) if d.isoformat() == lock.date),
-            None,
-        )
-        if e_idx is not None and s_idx is not None and d_idx is not None:
-            model.Add(shifts_var[(e_idx, d_idx, s_idx)] == 1)
-
-
-def _get_day_type(day: date) -> str:
-    weekday = day.weekday()
-    if weekday < 5:
-        return "weekday"
-    elif weekday == 5:
-        return "saturday"
-    else:
-        return "sunday"
+        e_idx = index.employee_idx.get(lock.employee_id)
+        s_idx = index.shift_idx.get(lock.shift_type_id)
+        d_idx = index.day_idx.get(lock.date)
+        if e_idx is None or s_idx is None or d_idx is None:
+            continue
+        var = shifts_var.get(e_idx, d_idx, s_idx)
+        if var is None:
+            # Locked onto a non-working or absence day: infeasible
+            model.AddBoolOr([])
+        else:
+            model.Add(var == 1)
@@ -1,25 +1,35 @@
 """OR-Tools CP-SAT solver for the Nurse Scheduling Problem."""
 
+import threading
 import time
+from dataclasses import asdict
 from datetime import date, timedelta
 from ortools.sat.python import cp_model
 
 from app.solver.models import (
-    Employee, ShiftType, CoverageRequirement, Absence, LockedAssignment,
+    Employee, ShiftType, CoverageRequirement, Absence, LockedAssignment, PreviousAssignment,
+    RepairScope, BoundaryState,
 )
+from app.solver.index import build_index
+from app.solver.variables import build_shift_vars, unavailable_cells
+from app.solver.symmetry import interchangeable_classes, add_symmetry_breaking
+from app.solver.warm_start import previous_keys, add_solution_hints
+from app.solver.profiling import ModelProfiler, attach_log_timer, search_stats
+from app.solver.stop_policy import parse_stop_policy
+from app.solver.boundary import boundary_constraints
+from app.solver.repair import split_scope, fixed_coverage_counts, freeze_outside_scope
 from app.solver.constraints import (
     add_one_shift_per_day,
     add_coverage_constraints,
     add_rest_between_shifts,
     add_max_weekly_hours,
-    add_absence_constraints,
-    add_working_days_constraint,
     add_weekend_rest,
     add_locked_assignments,
 )
 from app.solver.objectives import (
     add_shift_regularity_objective,
     add_night_weekend_equity_objective,
+    add_stability_objective,
 )
 
 
@@ -86,6 +96,37 @@ def _parse_locked(raw: list) -> list[LockedAssignment]:
     ]
 
 
+def _parse_previous(raw: list) -> list[PreviousAssignment]:
+    return [
+        PreviousAssignment(
+            employee_id=a["employee_id"],
+            shift_type_id=a["shift_type_id"],
+            date=a["date"],
+        )
+        for a in raw
+    ]
+
+
+def _parse_boundary(raw: list) -> list[BoundaryState]:
+    return [
+        BoundaryState(
+            employee_id=b["employee_id"],
+            last_shift_type_id=b.get("last_shift_type_id"),
+            week_hours=float(b.get("week_hours") or 0),
+            last_free_weekend=b.get("last_free_weekend"),
+        )
+        for b in raw
+    ]
+
+
+def _parse_repair_scope(raw: dict) -> RepairScope:
+    return RepairScope(
+        employee_ids=list(raw["employee_ids"]),
+        date_start=raw["date_start"],
+        date_end=raw["date_end"],
+    )
+
+
 def _generate_days(start: str, end: str) -> list[date]:
     d_start = date.fromisoformat(start)
     d_end = date.fromisoformat(end)
@@ -97,6 +138,99 @@ def _generate_days(start: str, end: str) -> list[date]:
     return days
 
 
+def _watch_search(solver, done: threading.Event, cancel_event, reporter, no_improvement_seconds, stopped: dict) -> None:
+    """Stop the running search once cancel_event is set, or once no improving
+    solution has been found for no_improvement_seconds. The reason is stored
+    in stopped["reason"].
+
+    StopSearch is a no-op until Solve has started, so keep retrying until
+    the solve is done.
+    """
+    while not done.wait(0.2):
+        reason = None
+        if cancel_event is not None and cancel_event.is_set():
+            reason = "cancelled"
+        elif (
+            no_improvement_seconds
+            and reporter.last_solution_at is not None
+            and time.time() - reporter.last_solution_at > no_improvement_seconds
+        ):
+            reason = "no_improvement"
+        if reason:
+            stopped.setdefault("reason", reason)
+            solver.StopSearch()
+
+
+def _extract_assignments(value, shifts_var, index, fixed_assignments: list, locked_set: set):
+    """Assignments of a solution (value: solver.Value or callback.Value) and its var keys."""
+    assignments = []
+    solution_keys = set()
+    for key, var in shifts_var.items():
+        if value(var) == 1:
+            solution_keys.add(key)
+            e_idx, d_idx, s_idx = key
+            emp_id = index.employees[e_idx].id
+            day = index.days[d_idx].isoformat()
+            assignments.append({
+                "employee_id": emp_id,
+                "shift_type_id": index.shift_types[s_idx].id,
+                "date": day,
+                "is_locked": (emp_id, day) in locked_set,
+            })
+    for a in fixed_assignments:
+        if a.date in index.day_idx:
+            assignments.append({
+                "employee_id": a.employee_id,
+                "shift_type_id": a.shift_type_id,
+                "date": a.date,
+                "is_locked": (a.employee_id, a.date) in locked_set,
+            })
+    return assignments, solution_keys
+
+
+class _SolutionReporter(cp_model.CpSolverSolutionCallback):
+    """Tracks improving solutions and passes each one to on_solution, if given."""
+
+    def __init__(self, on_solution, has_objective: bool, extract=None):
+        super().__init__()
+        self._on_solution = on_solution
+        self._has_objective = has_objective
+        self._extract = extract
+        self._start = time.time()
+        self.num_solutions = 0
+        self.last_solution_at = None
+
+    def on_solution_callback(self) -> None:
+        self.num_solutions += 1
+        self.last_solution_at = time.time()
+        if self._on_solution is None:
+            return
+        event = {
+            "num_solutions": self.num_solutions,
+            "elapsed_ms": int((time.time() - self._start) * 1000),
+        }
+        if self._has_objective:
+            objective = self.ObjectiveValue()
+            bound = self.BestObjectiveBound()
+            event["objective"] = objective
+            event["bound"] = bound
+            event["gap"] = round(abs(bound - objective) / max(1.0, abs(objective)), 6)
+        if self._extract is not None:
+            event["assignments"] = self._extract(self.Value)
+        self._on_solution(event)
+
+
+def _stop_reason(status, stopped: dict, solver, has_objective: bool) -> str:
+    if "reason" in stopped:
+        return stopped["reason"]
+    if status != cp_model.OPTIMAL:
+        return "time_limit"
+    # CP-SAT reports OPTIMAL once a gap limit is reached
+    if has_objective and solver.BestObjectiveBound() != solver.ObjectiveValue():
+        return "gap"
+    return "optimal"
+
+
 def solve_schedule(
     employees: list,
     shift_types: list,
@@ -106,9 +240,52 @@ def solve_schedule(
     period_start: str,
     period_end: str,
     locked_assignments: list = None,
-    time_limit_seconds: int = 30,
+    time_limit_seconds: int = None,
+    cancel_event: threading.Event = None,
+    num_workers: int = 4,
+    previous_assignments: list = None,
+    minimize_changes: bool = False,
+    repair_scope: dict = None,
+    on_solution=None,
+    report_assignments: bool = False,
+    stop_policy: dict = None,
+    weekend_anchor: str = None,
+    boundary: list = None,
+    profile_search_log: bool = False,
 ) -> dict | None:
-    """Solve the nurse scheduling problem and return assignments + stats."""
+    """Solve the nurse scheduling problem and return assignments + stats.
+
+    If cancel_event is given, setting it stops the search early; the best
+    solution found so far (if any) is still returned. num_workers is the
+    number of CP-SAT search threads; SolverExecutor sets it per solve.
+
+    previous_assignments ([{employee_id, shift_type_id, date}]) warm-starts
+    the search from an earlier schedule; with minimize_changes, differences
+    from it are also penalized.
+
+    repair_scope ({employee_ids, date_start, date_end}) restricts the search
+    to that neighbourhood: every other cell keeps its value from
+    previous_assignments.
+
+    on_solution, if given, is called with {num_solutions, elapsed_ms,
+    objective, bound, gap} for each improving solution during the search,
+    plus the draft "assignments" when report_assignments is set.
+
+    The search stops per the "solver_stop_policy" rule, with stop_policy
+    ({relative_gap, absolute_gap, no_improvement_seconds,
+    seconds_per_1000_vars, ...}) overriding its fields. An explicit
+    time_limit_seconds caps the policy's time limit (30 s when neither is set).
+
+    weekend_anchor (YYYY-MM-DD) is where 2-week weekend-rest pairs start
+    counting, when this solve is a window of a longer period.
+
+    boundary ([{employee_id, last_shift_type_id, week_hours,
+    last_free_weekend}], see app.solver.boundary) carries rest, weekly hours
+    and weekend rest over from the schedule before period_start.
+
+    profile_search_log turns on the CP-SAT search log to time presolve
+    (stats["search"]["presolve_ms"]); it is off by default.
+    """
 
     start_time = time.time()
 
@@ -118,12 +295,21 @@ def solve_schedule(
     coverage = _parse_coverage(coverage_requirements)
     abs_list = _parse_absences(absences)
     locked = _parse_locked(locked_assignments or [])
+    previous = _parse_previous(previous_assignments or [])
+    scope = _parse_repair_scope(repair_scope) if repair_scope else None
+    boundary_states = _parse_boundary(boundary or [])
     days = _generate_days(period_start, period_end)
-
     num_employees = len(emps)
-    num_shifts = len(shifts)
     num_days = len(days)
 
+    # Repair: employees outside the scope keep their previous schedule
+    fixed_emps, fixed_assignments = [], []
+    if scope is not None:
+        emps, fixed_emps, fixed_assignments = split_scope(emps, scope, previous)
+
+    index = build_index(emps, shifts, days, coverage)
+    parse_ms = round((time.time() - start_time) * 1000, 2)
+
     # Build constraint rule lookup
     rule_params = {}
     for r in constraint_rules:
@@ -131,86 +317,176 @@ def solve_schedule(
 
     # Create model
     model = cp_model.CpModel()
+    profiler = ModelProfiler(model)
 
-    # Decision variables: shifts_var[(e, d, s)] = 1 if employee e works shift s on day d
-    shifts_var = {}
-    for e_idx in range(num_employees):
-        for d_idx in range(num_days):
-            for s_idx in range(num_shifts):
-                shifts_var[(e_idx, d_idx, s_idx)] = model.NewBoolVar(
-                    f"shift_e{e_idx}_d{d_idx}_s{s_idx}"
-                )
+    # Decision variables: shifts_var[(e, d, s)] = 1 if employee e works shift s on day d.
+    # No variable exists on non-working or absence days, nor outside a repair scope.
+    frozen, frozen_locks = {}, []
+    if scope is not None:
+        frozen, frozen_locks = profiler.call(freeze_outside_scope, index, scope, previous)
+    shifts_var = profiler.call(build_shift_vars, model, index, abs_list, frozen)
 
     # === Hard constraints ===
-    add_one_shift_per_day(model, shifts_var, emps, shifts, days)
-    add_coverage_constraints(model, shifts_var, emps, shifts, days, coverage)
+    profiler.call(add_one_shift_per_day, model, shifts_var, index)
+    profiler.call(
+        add_coverage_constraints, model, shifts_var, index,
+        fixed_coverage_counts(index, fixed_emps, fixed_assignments),
+    )
+
+    eve_shifts, carried_tenths, worked_weekend = profiler.call(
+        boundary_constraints, index, boundary_states,
+    )
 
     min_rest = rule_params.get("min_rest_hours", {}).get("hours", 11)
-    add_rest_between_shifts(model, shifts_var, emps, shifts, days, min_rest)
+    profiler.call(add_rest_between_shifts, model, shifts_var, index, min_rest, eve_shifts)
 
-    add_max_weekly_hours(model, shifts_var, emps, shifts, days)
-    add_absence_constraints(model, shifts_var, emps, shifts, days, abs_list)
-    add_working_days_constraint(model, shifts_var, emps, shifts, days)
+    profiler.call(add_max_weekly_hours, model, shifts_var, index, carried_tenths)
 
     min_free_we = rule_params.get("weekend_rest", {}).get("min_free_weekends_per_2weeks", 1)
-    add_weekend_rest(model, shifts_var, emps, shifts, days, min_free_we)
-
-    if locked:
-        add_locked_assignments(model, shifts_var, emps, shifts, days, locked)
+    anchor = None
+    if weekend_anchor:
+        # Pairs count from the first Saturday on or after weekend_anchor
+        anchor_day = date.fromisoformat(weekend_anchor)
+        anchor = anchor_day + timedelta(days=(5 - anchor_day.weekday()) % 7)
+    profiler.call(add_weekend_rest, model, shifts_var, index, min_free_we, anchor, worked_weekend)
+
+    if locked or frozen_locks:
+        profiler.call(add_locked_assignments, model, shifts_var, index, locked + frozen_locks)
+
+    # Symmetry breaking (opt-in): previous assignments tell employees apart
+    symmetry_classes = []
+    if "symmetry_breaking" in rule_params and scope is None and not previous:
+        symmetry_classes = interchangeable_classes(
+            index, unavailable_cells(index, abs_list), locked, (eve_shifts, carried_tenths, worked_weekend),
+        )
+        profiler.call(
+            add_symmetry_breaking, model, shifts_var, index, symmetry_classes,
+            rule_params["symmetry_breaking"].get("prefix_days", 1),
+        )
 
     # === Soft objectives ===
     objective_terms = []
 
     reg_weight = rule_params.get("shift_regularity", {}).get("weight", 10)
-    reg_vars, reg_w = add_shift_regularity_objective(
-        model, shifts_var, emps, shifts, days, reg_weight
+    reg_vars, reg_w = profiler.call(
+        add_shift_regularity_objective, model, shifts_var, index, reg_weight
     )
     for v in reg_vars:
         objective_terms.append(v * reg_w)
 
-    eq_vars, eq_w = add_night_weekend_equity_objective(
-        model, shifts_var, emps, shifts, days,
+    eq_vars, eq_w = profiler.call(
+        add_night_weekend_equity_objective, model, shifts_var, index,
         rule_params.get("night_weekend_equity", {}).get("weight", 8),
     )
     for v in eq_vars:
         objective_terms.append(v * eq_w)
 
+    previous_set = previous_keys(index, previous)
+    if previous_set:
+        profiler.call(add_solution_hints, model, shifts_var, previous_set)
+    if minimize_changes:
+        stab_vars, stab_w = profiler.call(
+            add_stability_objective, model, shifts_var, previous_set,
+            rule_params.get("schedule_stability", {}).get("weight", 20),
+        )
+        for v in stab_vars:
+            objective_terms.append(v * stab_w)
+
     if objective_terms:
-        model.Maximize(sum(objective_terms))
+        with profiler.section("objective"):
+            model.Maximize(sum(objective_terms))
 
     # Solve
     solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = time_limit_seconds
-    solver.parameters.num_workers = 4
+    policy = parse_stop_policy(rule_params.get("solver_stop_policy"), stop_policy)
+    time_limit = policy.time_limit(len(shifts_var), time_limit_seconds)
+    solver.parameters.max_time_in_seconds = time_limit
+    if policy.relative_gap is not None:
+        solver.parameters.relative_gap_limit = policy.relative_gap
+    if policy.absolute_gap is not None:
+        solver.parameters.absolute_gap_limit = policy.absolute_gap
+    solver.parameters.num_workers = num_workers
+    log_timer = attach_log_timer(solver) if profile_search_log else None
 
-    status = solver.Solve(model)
+    locked_set = {(l.employee_id, l.date) for l in locked}
+    reporter = None
+    if on_solution is not None or policy.no_improvement_seconds:
+        extract = None
+        if on_solution is not None and report_assignments:
+            def extract(value):
+                return _extract_assignments(value, shifts_var, index, fixed_assignments, locked_set)[0]
+        reporter = _SolutionReporter(on_solution, bool(objective_terms), extract)
+
+    search_start = time.time()
+    stopped = {}
+    if cancel_event is None and not policy.no_improvement_seconds:
+        status = solver.Solve(model, reporter)
+    else:
+        done = threading.Event()
+        watcher = threading.Thread(
+            target=_watch_search,
+            args=(solver, done, cancel_event, reporter, policy.no_improvement_seconds, stopped),
+            daemon=True,
+        )
+        watcher.start()
+        try:
+            status = solver.Solve(model, reporter)
+        finally:
+            done.set()
+    search_ms = round((time.time() - search_start) * 1000, 2)
     solve_time_ms = int((time.time() - start_time) * 1000)
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         return None
 
-    # Extract assignments
-    assignments = []
-    locked_set = {(l.employee_id, l.date) for l in locked}
-    for e_idx, emp in enumerate(emps):
-        for d_idx, day in enumerate(days):
-            for s_idx, shift in enumerate(shifts):
-                if solver.Value(shifts_var[(e_idx, d_idx, s_idx)]) == 1:
-                    assignments.append({
-                        "employee_id": emp.id,
-                        "shift_type_id": shift.id,
-                        "date": day.isoformat(),
-                        "is_locked": (emp.id, day.isoformat()) in locked_set,
-                    })
-
-    return {
-        "assignments": assignments,
-        "stats": {
-            "solve_time_ms": solve_time_ms,
-            "status": "optimal" if status == cp_model.OPTIMAL else "feasible",
-            "objective_value": solver.ObjectiveValue() if objective_terms else 0,
-            "num_employees": num_employees,
-            "num_days": num_days,
-            "num_assignments": len(assignments),
+    assignments, solution_keys = _extract_assignments(
+        solver.Value, shifts_var, index, fixed_assignments, locked_set,
+    )
+
+    stats = {
+        "solve_time_ms": solve_time_ms,
+        "status": "optimal" if status == cp_model.OPTIMAL else "feasible",
+        "objective_value": solver.ObjectiveValue() if objective_terms else 0,
+        "num_employees": num_employees,
+        "num_days": num_days,
+        "num_assignments": len(assignments),
+        "num_shift_vars": len(shifts_var),
+        "num_workers": num_workers,
+        "profile": {
+            "parse_ms": parse_ms,
+            **profiler.to_dict(),
+            "search_ms": search_ms,
+        },
+        "search": search_stats(solver, bool(objective_terms), log_timer),
+        "stop_policy": {
+            **asdict(policy),
+            "time_limit_seconds": time_limit,
+            "stop_reason": _stop_reason(status, stopped, solver, bool(objective_terms)),
         },
     }
+    if symmetry_classes:
+        stats["symmetry"] = {
+            "num_classes": len(symmetry_classes),
+            "num_employees": sum(len(c) for c in symmetry_classes),
+        }
+    if previous_set:
+        stats["warm_start"] = {
+            "num_hints": len(previous_set),
+            "num_changes": len(solution_keys ^ previous_set),
+            "minimize_changes": minimize_changes,
+        }
+    if boundary_states:
+        stats["boundary"] = {
+            "num_employees": len(boundary_states),
+            "num_eve_shifts": len(eve_shifts),
+            "num_carried_hours": len(carried_tenths),
+            "num_worked_weekends": len(worked_weekend),
+        }
+    if scope is not None:
+        stats["repair"] = {
+            "num_free_employees": len(scope.employee_ids),
+            "date_start": scope.date_start,
+            "date_end": scope.date_end,
+        }
+
+    return {"assignments": assignments, "stats": stats}
@@ -0,0 +1,206 @@
+"""Process-pool executor for CP-SAT solves with per-solve CPU budgeting.
+
+Each solve runs in its own worker process. When a solve starts, the
+executor decides how many CP-SAT search workers it may use, based on the
+solves already running and the configured policy:
+
+- ``fair_share``: the cores are split evenly between the running solves.
+- ``priority``: the cores are split in proportion to ``priority + 1``.
+- ``max_concurrent``: every solve gets a fixed slice of
+  ``total_workers // max_concurrent`` cores.
+
+A solve keeps its budget until it ends, so no budget exceeds that slice:
+with at most max_concurrent solves running, their budgets never add up to
+more than total_workers. The cost is that a solve running alone only uses
+every core when max_concurrent is 1, and the policies differ only below the
+slice: under priority, a low-priority solve yields cores to the others.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from app.config import get_settings
+from app.solver.cache import SolveCache, get_solve_cache, solve_key
+from app.solver.engine import solve_schedule
+from app.solver.rolling import solve_rolling
+
+POLICIES = ("fair_share", "priority", "max_concurrent")
+
+
+def compute_worker_budget(
+    policy: str,
+    total_workers: int,
+    max_concurrent: int,
+    running_priorities: list[int],
+    priority: int = 0,
+) -> int:
+    """Number of CP-SAT workers for a solve starting now.
+
+    running_priorities are the priorities of the solves already running
+    (not including the new one). Negative priorities count as 0. The budget
+    is capped at total_workers // max_concurrent.
+    """
+    ceiling = total_workers // max_concurrent
+    if policy == "max_concurrent":
+        share = ceiling
+    elif policy == "priority":
+        weights = [max(p, 0) + 1 for p in running_priorities]
+        weight = max(priority, 0) + 1
+        share = total_workers * weight // (sum(weights) + weight)
+    elif policy == "fair_share":
+        share = total_workers // (len(running_priorities) + 1)
+    else:
+        raise ValueError(f"Unknown solver executor policy: {policy}")
+    return max(1, min(share, ceiling))
+
+
+def _solve(rolling_window_weeks: int = None, rolling_overlap_weeks: int = 1, **kwargs) -> dict | None:
+    """solve_schedule, or solve_rolling when a rolling window is requested."""
+    if rolling_window_weeks:
+        return solve_rolling(window_weeks=rolling_window_weeks, overlap_weeks=rolling_overlap_weeks, **kwargs)
+    return solve_schedule(**kwargs)
+
+
+def _forward_solutions(remote_solutions, on_solution, timeout: float) -> None:
+    """Pass queued solution events to on_solution, waiting up to timeout for the first."""
+    try:
+        event = remote_solutions.get(timeout=timeout) if timeout else remote_solutions.get_nowait()
+        while True:
+            on_solution(event)
+            event = remote_solutions.get_nowait()
+    except queue.Empty:
+        pass
+
+
+class SolverExecutor:
+    """Runs solve_schedule in worker processes, at most max_concurrent at a time."""
+
+    def __init__(
+        self,
+        policy: str = "fair_share",
+        total_workers: int = 0,
+        max_concurrent: int = 2,
+        cache: SolveCache | None = None,
+        profile_search_log: bool = False,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown solver executor policy: {policy}")
+        self.policy = policy
+        self.total_workers = total_workers or os.cpu_count() or 1
+        self.max_concurrent = max(1, max_concurrent)
+        self.cache = cache
+        self.profile_search_log = profile_search_log
+        # spawn: forking a multi-threaded API process is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._pool = None
+        self._manager = None
+        self._running: dict[int, int] = {}
+        self._next_token = 0
+        self._cond = threading.Condition()
+
+    def solve(
+        self,
+        priority: int = 0,
+        cancel_event: threading.Event = None,
+        on_solution=None,
+        **kwargs,
+    ) -> dict | None:
+        """Run solve_schedule(**kwargs) in a worker process and return its result.
+
+        Blocks while max_concurrent solves are already running. Setting
+        cancel_event stops the remote search. on_solution is called in this
+        process with each intermediate solution event. Results of completed
+        solves are cached by input; a cache hit has stats["cache_hit"] = True.
+        """
+        key = None
+        if self.cache is not None:
+            key = solve_key(**kwargs)
+            cached = self.cache.get(key)
+            if cached is not None:
+                cached["stats"]["cache_hit"] = True
+                return cached
+
+        result = self._solve_in_pool(priority, cancel_event, on_solution, **kwargs)
+        # Cancelled or timed-out-without-solution solves are not reusable
+        if key is not None and result is not None and not (cancel_event and cancel_event.is_set()):
+            self.cache.put(key, result)
+        return result
+
+    def _solve_in_pool(
+        self, priority: int, cancel_event: threading.Event | None, on_solution, **kwargs,
+    ) -> dict | None:
+        with self._cond:
+            while len(self._running) >= self.max_concurrent:
+                self._cond.wait()
+            num_workers = compute_worker_budget(
+                self.policy, self.total_workers, self.max_concurrent,
+                list(self._running.values()), priority,
+            )
+            token = self._next_token
+            self._next_token += 1
+            self._running[token] = priority
+            pool = self._get_pool()
+
+        try:
+            remote_cancel = self._get_manager().Event() if cancel_event is not None else None
+            remote_solutions = self._get_manager().Queue() if on_solution is not None else None
+            future = pool.submit(
+                _solve,
+                num_workers=num_workers,
+                profile_search_log=self.profile_search_log,
+                cancel_event=remote_cancel,
+                on_solution=remote_solutions.put if remote_solutions is not None else None,
+                **kwargs,
+            )
+            cancelled = False
+            while not future.done() and (remote_solutions is not None or not cancelled):
+                if remote_cancel is not None and not cancelled and cancel_event.is_set():
+                    remote_cancel.set()
+                    cancelled = True
+                if remote_solutions is not None:
+                    _forward_solutions(remote_solutions, on_solution, timeout=0.2)
+                elif remote_cancel is not None:
+                    cancel_event.wait(0.2)
+                else:
+                    break
+            result = future.result()
+            if remote_solutions is not None:
+                _forward_solutions(remote_solutions, on_solution, timeout=0)
+            return result
+        finally:
+            with self._cond:
+                del self._running[token]
+                self._cond.notify()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_concurrent, mp_context=self._context)
+        return self._pool
+
+    def _get_manager(self):
+        with self._cond:
+            if self._manager is None:
+                self._manager = self._context.Manager()
+            return self._manager
+
+
+@lru_cache()
+def get_solver_executor() -> SolverExecutor:
+    settings = get_settings()
+    return SolverExecutor(
+        policy=settings.solver_executor_policy,
+        total_workers=settings.solver_total_workers,
+        max_concurrent=settings.solver_max_concurrent_solves,
+        cache=get_solve_cache(),
+        profile_search_log=settings.solver_profile_search_log,
+    )
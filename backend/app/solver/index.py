@@ -0,0 +1,68 @@
+"""Lookup tables built once per solve and shared by all model builders."""
+
+from dataclasses import dataclass
+from datetime import date
+
+from app.solver.models import Employee, ShiftType, CoverageRequirement
+
+
+@dataclass
+class ProblemIndex:
+    employees: list[Employee]
+    shift_types: list[ShiftType]
+    days: list[date]
+    employee_idx: dict[str, int]  # employee id -> e_idx
+    shift_idx: dict[str, int]  # shift type id -> s_idx
+    day_idx: dict[str, int]  # YYYY-MM-DD -> d_idx
+    day_types: list[str]  # d_idx -> weekday / saturday / sunday
+    employees_by_role: dict[str, list[int]]  # role -> [e_idx]
+    coverage: dict[tuple[str, str], CoverageRequirement]  # (shift type id, day type) -> requirement
+
+    def coverage_for(self, s_idx: int, d_idx: int) -> CoverageRequirement | None:
+        return self.coverage.get((self.shift_types[s_idx].id, self.day_types[d_idx]))
+
+    def day_range(self, date_start: str, date_end: str) -> range:
+        """Day indices covered by [date_start, date_end], clipped to the period."""
+        if not self.days:
+            return range(0)
+        first = (date.fromisoformat(date_start) - self.days[0]).days
+        last = (date.fromisoformat(date_end) - self.days[0]).days
+        return range(max(first, 0), min(last, len(self.days) - 1) + 1)
+
+
+def get_day_type(day: date) -> str:
+    weekday = day.weekday()
+    if weekday < 5:
+        return "weekday"
+    elif weekday == 5:
+        return "saturday"
+    else:
+        return "sunday"
+
+
+def build_index(
+    employees: list[Employee],
+    shift_types: list[ShiftType],
+    days: list[date],
+    coverage_reqs: list[CoverageRequirement],
+) -> ProblemIndex:
+    employees_by_role: dict[str, list[int]] = {}
+    for e_idx, emp in enumerate(employees):
+        employees_by_role.setdefault(emp.role, []).append(e_idx)
+
+    # First requirement wins when several match the same (shift, day type)
+    coverage: dict[tuple[str, str], CoverageRequirement] = {}
+    for c in coverage_reqs:
+        coverage.setdefault((c.shift_type_id, c.day_type), c)
+
+    return ProblemIndex(
+        employees=employees,
+        shift_types=shift_types,
+        days=days,
+        employee_idx={emp.id: i for i, emp in enumerate(employees)},
+        shift_idx={s.id: i for i, s in enumerate(shift_types)},
+        day_idx={d.isoformat(): i for i, d in enumerate(days)},
+        day_types=[get_day_type(d) for d in days],
+        employees_by_role=employees_by_role,
+        coverage=coverage,
+    )
@@ -2,69 +2,85 @@ from dataclasses import dataclass, field
 from datetime import date, time
 
 
-@dataclass
+def _minutes(hhmm: str) -> int:
+    """Minutes since midnight of an "HH:MM" time."""
+    hours, minutes = hhmm.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+# Solver dataclasses are frozen and slotted; derived numeric fields are
+# computed once in __post_init__ instead of on every access in model builders.
+
+
+@dataclass(frozen=True, slots=True)
 class Employee:
     id: str
     first_name: str
     last_name: str
     role: str
     activity_rate: int
-    working_days: list = field(default_factory=lambda: ["lundi", "mardi", "mercredi", "jeudi", "vendredi"])
+    working_days: tuple = ("lundi", "mardi", "mercredi", "jeudi", "vendredi")
+    max_weekly_hours: float = field(init=False)
+    max_weekly_tenths: int = field(init=False)  # max_weekly_hours * 10, rounded down
 
-    @property
-    def max_weekly_hours(self) -> float:
-        return 42.0 * self.activity_rate / 100.0
+    def __post_init__(self):
+        object.__setattr__(self, "working_days", tuple(self.working_days))
+        max_hours = 42.0 * self.activity_rate / 100.0
+        object.__setattr__(self, "max_weekly_hours", max_hours)
+        object.__setattr__(self, "max_weekly_tenths", int(max_hours * 10))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ShiftType:
     id: str
     name: str
     start_time: str  # HH:MM
     end_time: str
     duration_hours: float
-
-    @property
-    def is_night(self) -> bool:
-        """Detect night shift by schedule: starts >= 20h or crosses midnight."""
-        start = self.start_hour()
-        end = self.end_hour()
-        return start >= 20 or end < start
+    start_minutes: int = field(init=False)  # since midnight
+    end_minutes: int = field(init=False)
+    duration_tenths: int = field(init=False)  # duration_hours * 10
+    # Night shift: starts >= 20h or crosses midnight
+    is_night: bool = field(init=False)
+
+    def __post_init__(self):
+        start = _minutes(self.start_time)
+        end = _minutes(self.end_time)
+        object.__setattr__(self, "start_minutes", start)
+        object.__setattr__(self, "end_minutes", end)
+        object.__setattr__(self, "duration_tenths", round(self.duration_hours * 10))
+        object.__setattr__(self, "is_night", start >= 20 * 60 or end < start)
 
     def start_hour(self) -> float:
-        parts = self.start_time.split(":")
-        return int(parts[0]) + int(parts[1]) / 60.0
+        return self.start_minutes / 60.0
 
     def end_hour(self) -> float:
-        parts = self.end_time.split(":")
-        return int(parts[0]) + int(parts[1]) / 60.0
+        return self.end_minutes / 60.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CoverageRequirement:
     shift_type_id: str
     day_type: str  # weekday, saturday, sunday
     min_infirmier: int = 0
     min_assc: int = 0
     min_aide_soignant: int = 0
+    # Total minimum = sum of all role minimums
+    min_employees: int = field(init=False)
+    # Role -> minimum count (only non-zero)
+    role_minimums: dict = field(init=False, hash=False)
 
-    @property
-    def min_employees(self) -> int:
-        """Total minimum = sum of all role minimums."""
-        return self.min_infirmier + self.min_assc + self.min_aide_soignant
-
-    @property
-    def role_minimums(self) -> dict[str, int]:
-        """Dict of role -> minimum count (only non-zero)."""
+    def __post_init__(self):
         mins = {
             "infirmier": self.min_infirmier,
             "assc": self.min_assc,
             "aide-soignant": self.min_aide_soignant,
         }
-        return {k: v for k, v in mins.items() if v > 0}
+        object.__setattr__(self, "min_employees", sum(mins.values()))
+        object.__setattr__(self, "role_minimums", {k: v for k, v in mins.items() if v > 0})
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Absence:
     employee_id: str
     date_start: str  # YYYY-MM-DD
@@ -72,14 +88,39 @@ class Absence:
     type: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LockedAssignment:
     employee_id: str
     shift_type_id: str
     date: str  # YYYY-MM-DD
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class PreviousAssignment:
+    """An assignment from an earlier schedule, used to warm-start a re-solve."""
+    employee_id: str
+    shift_type_id: str
+    date: str  # YYYY-MM-DD
+
+
+@dataclass(frozen=True, slots=True)
+class BoundaryState:
+    """What an employee carries over from the schedule before the period."""
+    employee_id: str
+    last_shift_type_id: str | None = None  # worked on the eve of the period
+    week_hours: float = 0  # worked earlier in the period's first calendar week
+    last_free_weekend: str | None = None  # YYYY-MM-DD (Saturday)
+
+
+@dataclass(frozen=True, slots=True)
+class RepairScope:
+    """Neighbourhood re-optimized by a repair solve; everything else stays fixed."""
+    employee_ids: list
+    date_start: str  # YYYY-MM-DD
+    date_end: str
+
+
+@dataclass(frozen=True, slots=True)
 class SolverResult:
     assignments: list  # [{employee_id, shift_type_id, date, is_locked}]
     stats: dict  # {solve_time_ms, status, objective_value}
@@ -1,42 +1,48 @@
 """Soft objectives for the nurse scheduling solver."""
 
+from app.solver.index import ProblemIndex
+from app.solver.variables import ShiftVars
 
-def add_shift_regularity_objective(model, shifts_var, employees, shift_types, days, weight=10):
+
+def add_shift_regularity_objective(model, shifts_var: ShiftVars, index: ProblemIndex, weight=10):
     """Maximize regularity: same shift pattern each week.
 
     For each employee, reward having the same shift on the same weekday across weeks.
+    One `same` BoolVar per (employee, day) pair 7 days apart, with clauses
+    same => works a shift on day d, and same and shift s on day d => shift s
+    on day d+7. Since at most one shift is worked per day, this is exactly
+    "same shift both weeks" once maximized; a penalty (weight < 0) also
+    needs the converse clauses.
     """
+    if weight == 0:
+        return [], 0
     bonus_vars = []
-    num_days = len(days)
-
-    for e_idx in range(len(employees)):
-        for s_idx in range(len(shift_types)):
-            # Compare same weekday across consecutive weeks
-            for d_idx in range(num_days):
-                next_week = d_idx + 7
-                if next_week < num_days:
-                    # both = 1 iff employee works same shift same weekday both weeks
-                    both = model.NewBoolVar(f"reg_{e_idx}_{s_idx}_{d_idx}")
-                    model.AddBoolAnd([
-                        shifts_var[(e_idx, d_idx, s_idx)],
-                        shifts_var[(e_idx, next_week, s_idx)],
-                    ]).OnlyEnforceIf(both)
-                    model.AddBoolOr([
-                        shifts_var[(e_idx, d_idx, s_idx)].Not(),
-                        shifts_var[(e_idx, next_week, s_idx)].Not(),
-                    ]).OnlyEnforceIf(both.Not())
-                    bonus_vars.append(both)
+
+    # Compare same weekday across consecutive weeks
+    for (e_idx, d_idx), cell in shifts_var.cells():
+        next_vars = dict(shifts_var.cell(e_idx, d_idx + 7))
+        common = [(var, next_vars[s_idx]) for s_idx, var in cell if s_idx in next_vars]
+        if not common:
+            continue
+        same = model.NewBoolVar(f"reg_{e_idx}_{d_idx}")
+        model.AddBoolOr([same.Not()] + [var for var, _ in common])
+        for var, next_var in common:
+            model.AddBoolOr([same.Not(), var.Not(), next_var])
+            if weight < 0:
+                model.AddBoolOr([var.Not(), next_var.Not(), same])
+        bonus_vars.append(same)
 
     return bonus_vars, weight
 
 
-def add_night_weekend_equity_objective(model, shifts_var, employees, shift_types, days, weight=8):
+def add_night_weekend_equity_objective(model, shifts_var: ShiftVars, index: ProblemIndex, weight=8):
     """Distribute night and weekend shifts equitably.
 
     Minimize the max-min difference in undesirable shift counts across employees.
     """
-    night_indices = [i for i, s in enumerate(shift_types) if s.is_night]
-    weekend_day_indices = [i for i, d in enumerate(days) if d.weekday() >= 5]
+    employees, shift_types, days = index.employees, index.shift_types, index.days
+    night_indices = {i for i, s in enumerate(shift_types) if s.is_night}
+    weekend_day_indices = {i for i, d in enumerate(days) if d.weekday() >= 5}
 
     if not night_indices and not weekend_day_indices:
         return [], 0
@@ -50,14 +56,16 @@ def add_night_weekend_equity_objective(model, shifts_var, employees, shift_types
         return [], 0
 
     for e_idx in eligible:
+        # A night shift on a weekend day counts twice
         count = sum(
-            shifts_var[(e_idx, d_idx, s_idx)]
+            var
             for d_idx in weekend_day_indices
-            for s_idx in range(len(shift_types))
+            for _, var in shifts_var.cell(e_idx, d_idx)
         ) + sum(
-            shifts_var[(e_idx, d_idx, s_idx)]
+            var
             for d_idx in range(len(days))
-            for s_idx in night_indices
+            for s_idx, var in shifts_var.cell(e_idx, d_idx)
+            if s_idx in night_indices
         )
         counts.append(count)
 
@@ -74,3 +82,24 @@ def add_night_weekend_equity_objective(model, shifts_var, employees, shift_types
 
     # Return as penalty (negative weight)
     return [spread], -weight
+
+
+def add_stability_objective(model, shifts_var: ShiftVars, previous: set, weight=20):
+    """Stay close to a previous schedule.
+
+    Penalize every cell whose assignment differs from `previous`, a set of
+    (e_idx, d_idx, s_idx) keys: dropped previous assignments and new ones.
+    """
+    if not previous:
+        return [], 0
+
+    dropped = [1 - var for key, var in shifts_var.items() if key in previous]
+    added = [var for key, var in shifts_var.items() if key not in previous]
+    # Previous assignments with no live variable (e.g. new absence) are always dropped
+    forced = len(previous) - len(dropped)
+
+    changes = model.NewIntVar(0, len(shifts_var) + forced, "schedule_changes")
+    model.Add(changes == sum(dropped) + sum(added) + forced)
+
+    # Return as penalty (negative weight)
+    return [changes], -weight
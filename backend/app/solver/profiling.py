@@ -0,0 +1,106 @@
+"""Instrumentation of model building and CP-SAT search for solver_stats."""
+
+import time
+from contextlib import contextmanager
+
+from ortools.sat.python import cp_model
+
+
+class ModelProfiler:
+    """Records wall time and model growth (variables, constraints) per build step."""
+
+    def __init__(self, model: cp_model.CpModel):
+        self.model = model
+        self.steps: list[dict] = []
+
+    @contextmanager
+    def section(self, name: str):
+        proto = self.model.Proto()
+        num_vars, num_constraints = len(proto.variables), len(proto.constraints)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append({
+                "name": name,
+                "ms": round((time.perf_counter() - start) * 1000, 2),
+                "variables": len(proto.variables) - num_vars,
+                "constraints": len(proto.constraints) - num_constraints,
+            })
+
+    def call(self, builder, *args, **kwargs):
+        """Run a model builder inside a section named after it."""
+        with self.section(builder.__name__):
+            return builder(*args, **kwargs)
+
+    def to_dict(self) -> dict:
+        proto = self.model.Proto()
+        return {
+            "build_ms": round(sum(s["ms"] for s in self.steps), 2),
+            "num_variables": len(proto.variables),
+            "num_constraints": len(proto.constraints),
+            "steps": self.steps,
+        }
+
+
+class SearchLogTimer:
+    """CP-SAT log callback timing the presolve phase.
+
+    Relies on the "Starting presolve" and "Preloading model." log lines.
+    """
+
+    def __init__(self):
+        self.presolve_start = None
+        self.presolve_end = None
+
+    def __call__(self, line: str) -> None:
+        if self.presolve_start is None and line.startswith("Starting presolve"):
+            self.presolve_start = time.perf_counter()
+        elif self.presolve_end is None and line.startswith("Preloading model"):
+            self.presolve_end = time.perf_counter()
+
+    @property
+    def presolve_ms(self) -> float | None:
+        if self.presolve_start is None or self.presolve_end is None:
+            return None
+        return round((self.presolve_end - self.presolve_start) * 1000, 2)
+
+
+def attach_log_timer(solver: cp_model.CpSolver) -> SearchLogTimer:
+    """Turn on the search log and route it to a SearchLogTimer.
+
+    The log callback runs Python for every log line, so this is opt-in
+    (solver_profile_search_log) rather than done on every solve.
+    """
+    timer = SearchLogTimer()
+    solver.parameters.log_search_progress = True
+    solver.parameters.log_to_stdout = False
+    solver.log_callback = timer
+    return timer
+
+
+def search_stats(
+    solver: cp_model.CpSolver, has_objective: bool, timer: SearchLogTimer | None = None,
+) -> dict:
+    """CP-SAT response statistics after Solve.
+
+    presolve_ms is only reported with a timer; otherwise the wall/user time
+    split is all there is.
+    """
+    response = solver.ResponseProto()
+    stats = {
+        "wall_time_ms": round(solver.WallTime() * 1000, 2),
+        "user_time_ms": round(solver.UserTime() * 1000, 2),
+        "deterministic_time": response.deterministic_time,
+        "num_branches": solver.NumBranches(),
+        "num_conflicts": solver.NumConflicts(),
+        "num_booleans": solver.NumBooleans(),
+    }
+    if timer is not None:
+        stats["presolve_ms"] = timer.presolve_ms
+    if has_objective and response.status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        objective = solver.ObjectiveValue()
+        bound = solver.BestObjectiveBound()
+        stats["best_bound"] = bound
+        stats["gap"] = round(abs(bound - objective) / max(1.0, abs(objective)), 6)
+    return stats
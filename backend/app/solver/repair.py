@@ -0,0 +1,120 @@
+"""Incremental repair: re-optimize a small neighbourhood of an existing schedule.
+
+Employees outside the scope keep their whole schedule and are left out of
+the model; their shifts only count towards coverage. Scope employees are
+modelled over the whole period, so rest, weekly-hours and weekend rules see
+their fixed assignments around the repaired days: cells outside the days
+get at most one variable, pinned by add_locked_assignments. Soft
+objectives (e.g. night/weekend equity) only compare scope employees.
+"""
+
+from datetime import date, timedelta
+
+from app.solver.index import ProblemIndex
+from app.solver.models import Employee, LockedAssignment, PreviousAssignment, RepairScope
+
+
+def build_repair_scope(
+    employees: list,
+    period_start: str,
+    period_end: str,
+    employee_ids: list[str],
+    date_start: str,
+    date_end: str,
+    horizon_days: int = 1,
+) -> dict:
+    """Neighbourhood around a change affecting employee_ids on [date_start, date_end].
+
+    Days: the affected range widened by horizon_days (rest between shifts)
+    and then to whole weekends, clipped to the period. Staff: the affected
+    employees plus everyone sharing a role with them, who can swap in.
+    Raises ValueError if the affected range does not overlap the period.
+    """
+    if date_end < date_start or date_end < period_start or date_start > period_end:
+        raise ValueError("The affected days are outside the period")
+    first = max(date.fromisoformat(date_start) - timedelta(days=horizon_days),
+                date.fromisoformat(period_start))
+    last = min(date.fromisoformat(date_end) + timedelta(days=horizon_days),
+               date.fromisoformat(period_end))
+    if first.weekday() == 6:  # Sunday: include its Saturday
+        first = max(first - timedelta(days=1), date.fromisoformat(period_start))
+    if last.weekday() == 5:  # Saturday: include its Sunday
+        last = min(last + timedelta(days=1), date.fromisoformat(period_end))
+
+    affected = set(employee_ids)
+    roles = {e["role"] for e in employees if e["id"] in affected}
+    staff = [e["id"] for e in employees if e["id"] in affected or e["role"] in roles]
+
+    return {
+        "employee_ids": staff,
+        "date_start": first.isoformat(),
+        "date_end": last.isoformat(),
+    }
+
+
+def split_scope(
+    employees: list[Employee],
+    scope: RepairScope,
+    previous: list[PreviousAssignment],
+) -> tuple[list[Employee], list[Employee], list[PreviousAssignment]]:
+    """(scope employees, fixed employees, previous assignments of the fixed ones)."""
+    scope_ids = set(scope.employee_ids)
+    free = [e for e in employees if e.id in scope_ids]
+    fixed = [e for e in employees if e.id not in scope_ids]
+    fixed_ids = {e.id for e in fixed}
+    return free, fixed, [a for a in previous if a.employee_id in fixed_ids]
+
+
+def fixed_coverage_counts(
+    index: ProblemIndex,
+    fixed_employees: list[Employee],
+    fixed_assignments: list[PreviousAssignment],
+) -> dict[tuple[int, int], dict[str, int]]:
+    """(d_idx, s_idx) -> {role: count} of shifts worked by employees left out of the model."""
+    roles = {e.id: e.role for e in fixed_employees}
+    counts: dict[tuple[int, int], dict[str, int]] = {}
+    for a in fixed_assignments:
+        d_idx = index.day_idx.get(a.date)
+        s_idx = index.shift_idx.get(a.shift_type_id)
+        if d_idx is None or s_idx is None:
+            continue
+        slot = counts.setdefault((d_idx, s_idx), {})
+        slot[roles[a.employee_id]] = slot.get(roles[a.employee_id], 0) + 1
+    return counts
+
+
+def freeze_outside_scope(
+    index: ProblemIndex,
+    scope: RepairScope,
+    previous: list[PreviousAssignment],
+) -> tuple[dict[tuple[int, int], int | None], list[LockedAssignment]]:
+    """Fix every cell of index.employees outside the scope days to its previous value.
+
+    index only holds scope employees (see split_scope). Returns the frozen
+    cells for build_shift_vars and the locks that pin frozen assignments.
+    """
+    free_days = set(index.day_range(scope.date_start, scope.date_end))
+
+    previous_by_cell = {}
+    for a in previous:
+        e_idx = index.employee_idx.get(a.employee_id)
+        d_idx = index.day_idx.get(a.date)
+        s_idx = index.shift_idx.get(a.shift_type_id)
+        if e_idx is not None and d_idx is not None and s_idx is not None:
+            previous_by_cell[(e_idx, d_idx)] = s_idx
+
+    frozen = {}
+    locks = []
+    for e_idx, emp in enumerate(index.employees):
+        for d_idx, day in enumerate(index.days):
+            if d_idx in free_days:
+                continue
+            s_idx = previous_by_cell.get((e_idx, d_idx))
+            frozen[(e_idx, d_idx)] = s_idx
+            if s_idx is not None:
+                locks.append(LockedAssignment(
+                    employee_id=emp.id,
+                    shift_type_id=index.shift_types[s_idx].id,
+                    date=day.isoformat(),
+                ))
+    return frozen, locks
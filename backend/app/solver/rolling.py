@@ -0,0 +1,146 @@
+"""Rolling-horizon solving for long planning periods.
+
+The period is cut into windows of window_weeks, each starting
+window_weeks - overlap_weeks after the previous one, and solved in order.
+A window's last overlap_weeks are only a lookahead: they are solved again,
+and kept, by the next window. Each window model also holds the two weeks
+before it, frozen to what earlier windows decided (pinned by
+add_locked_assignments through the repair scope machinery), so rest between
+shifts, weekly hours and the weekend pair straddling the boundary see the
+committed schedule. Model size, and so time and memory, stay bounded per
+window and grow linearly with the number of windows.
+
+Once cancel_event is set (stop: keep the best so far), no further window is
+started: the result covers the period up to the end of the window being
+solved, reported as stats["rolling"]["solved_until"].
+"""
+
+from datetime import date, timedelta
+
+from app.solver.engine import solve_schedule
+
+# Frozen days before each window: covers the previous weekend pair
+CONTEXT_DAYS = 14
+
+
+def rolling_windows(
+    period_start: str, period_end: str, window_weeks: int, overlap_weeks: int,
+) -> list[tuple[date, date, date]]:
+    """(model start, first solved day, last day) of each window."""
+    if window_weeks < 1 or overlap_weeks < 0:
+        raise ValueError("A rolling window needs at least 1 week and a non-negative overlap")
+    if window_weeks - overlap_weeks < 2:
+        raise ValueError("A rolling window must advance by at least 2 weeks")
+    start, end = date.fromisoformat(period_start), date.fromisoformat(period_end)
+    length = timedelta(days=7 * window_weeks)
+    step = timedelta(days=7 * (window_weeks - overlap_weeks))
+
+    windows = []
+    first = start
+    while True:
+        last = min(first + length - timedelta(days=1), end)
+        windows.append((max(start, first - timedelta(days=CONTEXT_DAYS)), first, last))
+        if last >= end:
+            return windows
+        first += step
+
+
+def solve_rolling(
+    employees: list,
+    period_start: str,
+    period_end: str,
+    window_weeks: int = 4,
+    overlap_weeks: int = 1,
+    previous_assignments: list = None,
+    on_solution=None,
+    boundary: list = None,
+    **kwargs,
+) -> dict | None:
+    """Solve the period window by window; same arguments and result as solve_schedule.
+
+    The boundary state only applies to the first window; later ones see the
+    committed days before them. Returns None as soon as a window has no
+    solution, unless a stop was requested after earlier windows committed days:
+    the result then ends on the day before that window.
+    """
+    cancel_event = kwargs.get("cancel_event")
+    windows = rolling_windows(period_start, period_end, window_weeks, overlap_weeks)
+    employee_ids = [e["id"] for e in employees]
+    previous_assignments = previous_assignments or []
+
+    committed = []
+    window_stats = []
+    solved_until = date.fromisoformat(period_end)
+    for k, (model_start, first, last) in enumerate(windows):
+        commit_end = windows[k + 1][1] if k + 1 < len(windows) else last + timedelta(days=1)
+        context = [a for a in committed if model_start.isoformat() <= a["date"] < first.isoformat()]
+        previous = context + [
+            a for a in previous_assignments if first.isoformat() <= a["date"] <= last.isoformat()
+        ]
+        scope = None
+        if model_start < first:
+            scope = {"employee_ids": employee_ids, "date_start": first.isoformat(), "date_end": last.isoformat()}
+
+        window_on_solution = None
+        if on_solution is not None:
+            def window_on_solution(event, k=k):
+                on_solution({**event, "window": k})
+
+        result = solve_schedule(
+            employees=employees,
+            period_start=model_start.isoformat(),
+            period_end=last.isoformat(),
+            previous_assignments=previous,
+            repair_scope=scope,
+            weekend_anchor=period_start,
+            on_solution=window_on_solution,
+            boundary=boundary if k == 0 else None,
+            **kwargs,
+        )
+        stopped = cancel_event is not None and cancel_event.is_set()
+        if result is None:
+            if stopped and committed:
+                solved_until = first - timedelta(days=1)
+                break
+            return None
+        if stopped:
+            # Keep this window's lookahead too: no later window will redo it
+            commit_end = last + timedelta(days=1)
+
+        committed += [
+            a for a in result["assignments"]
+            if first.isoformat() <= a["date"] < commit_end.isoformat()
+        ]
+        stats = result["stats"]
+        window_stats.append({
+            "period_start": first.isoformat(),
+            "period_end": last.isoformat(),
+            "status": stats["status"],
+            "solve_time_ms": stats["solve_time_ms"],
+            "objective_value": stats["objective_value"],
+            "num_shift_vars": stats["num_shift_vars"],
+        })
+        if stopped:
+            solved_until = last
+            break
+
+    return {
+        "assignments": committed,
+        "stats": {
+            "solve_time_ms": sum(w["solve_time_ms"] for w in window_stats),
+            "status": "optimal" if all(w["status"] == "optimal" for w in window_stats) else "feasible",
+            "objective_value": sum(w["objective_value"] for w in window_stats),
+            "num_employees": len(employees),
+            "num_days": (solved_until - date.fromisoformat(period_start)).days + 1,
+            "num_assignments": len(committed),
+            "num_shift_vars": max(w["num_shift_vars"] for w in window_stats),
+            "num_workers": stats["num_workers"],
+            "rolling": {
+                "window_weeks": window_weeks,
+                "overlap_weeks": overlap_weeks,
+                "windows": window_stats,
+                "stopped": solved_until < date.fromisoformat(period_end),
+                "solved_until": solved_until.isoformat(),
+            },
+        },
+    }
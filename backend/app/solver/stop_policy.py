@@ -0,0 +1,43 @@
+"""When to end the CP-SAT search.
+
+A stop policy comes from the "solver_stop_policy" constraint rule, with
+per-request overrides. It combines:
+
+- a relative and/or absolute optimality gap target (CP-SAT gap limits),
+- a stop once no improving solution was found for no_improvement_seconds,
+- a time limit scaling with model size: seconds_per_1000_vars per thousand
+  shift variables, clamped to [min_time_limit_seconds, max_time_limit_seconds].
+"""
+
+from dataclasses import dataclass
+
+DEFAULT_TIME_LIMIT_SECONDS = 30
+
+
+@dataclass
+class StopPolicy:
+    relative_gap: float | None = None
+    absolute_gap: float | None = None
+    no_improvement_seconds: float | None = None
+    seconds_per_1000_vars: float | None = None
+    min_time_limit_seconds: float = 5
+    max_time_limit_seconds: float = 120
+
+    def time_limit(self, num_vars: int, requested: float | None = None) -> float:
+        """Search time limit for a model with num_vars shift variables.
+
+        requested (a caller's explicit limit) caps the scaled limit, and is
+        used as is when the policy does not scale.
+        """
+        if self.seconds_per_1000_vars is None:
+            return requested if requested is not None else DEFAULT_TIME_LIMIT_SECONDS
+        scaled = self.seconds_per_1000_vars * num_vars / 1000
+        scaled = min(max(scaled, self.min_time_limit_seconds), self.max_time_limit_seconds)
+        return min(scaled, requested) if requested is not None else scaled
+
+
+def parse_stop_policy(rule_parameter: dict | None, overrides: dict | None = None) -> StopPolicy:
+    """Policy from the rule parameter, with non-null overrides applied on top."""
+    fields = StopPolicy.__dataclass_fields__
+    values = {**(rule_parameter or {}), **(overrides or {})}
+    return StopPolicy(**{k: v for k, v in values.items() if k in fields and v is not None})
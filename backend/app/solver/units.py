@@ -0,0 +1,110 @@
+"""Decomposition of a multi-unit generate into independent per-unit solves.
+
+Each unit (ward) has its own employees and coverage requirements and is
+solved on its own, so units can run in parallel and a generate takes as
+long as the largest unit. Floating staff (employees with is_floating and
+no unit) are first dispatched to units by a greedy master step: each
+floater goes, for the whole period, to the unit with the largest remaining
+shortfall for their role.
+"""
+
+from datetime import date, timedelta
+
+from app.solver.index import get_day_type
+from app.solver.variables import WEEKDAY_TO_FRENCH
+
+ROLE_MINIMUM_FIELDS = {
+    "infirmier": "min_infirmier",
+    "assc": "min_assc",
+    "aide-soignant": "min_aide_soignant",
+}
+
+
+def _period_days(period_start: str, period_end: str) -> list[date]:
+    first, last = date.fromisoformat(period_start), date.fromisoformat(period_end)
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def unit_coverage(coverage_requirements: list, unit_id: str) -> list:
+    """Coverage rows of a unit, or the hospital-wide rows (no unit) if it has none."""
+    own = [c for c in coverage_requirements if c.get("unit_id") == unit_id]
+    return own or [c for c in coverage_requirements if c.get("unit_id") is None]
+
+
+def role_demand(coverage: list, days: list[date]) -> dict[str, int]:
+    """Shifts required per role over the period."""
+    demand = {role: 0 for role in ROLE_MINIMUM_FIELDS}
+    for day in days:
+        day_type = get_day_type(day)
+        for c in coverage:
+            if c["day_type"] == day_type:
+                for role, column in ROLE_MINIMUM_FIELDS.items():
+                    demand[role] += c.get(column) or 0
+    return demand
+
+
+def employee_capacity(employee: dict, absent_days: set[date], days: list[date]) -> float:
+    """Shifts an employee can work over the period: working, non-absent days scaled by rate."""
+    working_days = employee.get("working_days") or ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+    available = sum(
+        1 for day in days
+        if WEEKDAY_TO_FRENCH[day.weekday()] in working_days and day not in absent_days
+    )
+    return available * employee["activity_rate"] / 100
+
+
+def _absent_days(absences: list, days: list[date]) -> dict[str, set[date]]:
+    by_employee: dict[str, set[date]] = {}
+    for a in absences:
+        start, end = date.fromisoformat(a["date_start"]), date.fromisoformat(a["date_end"])
+        by_employee.setdefault(a["employee_id"], set()).update(d for d in days if start <= d <= end)
+    return by_employee
+
+
+def allocate_floating_staff(inputs: dict, unit_ids: list[str], period_start: str, period_end: str) -> dict[str, str]:
+    """Greedy master step: {floating employee id: unit id} for the period."""
+    days = _period_days(period_start, period_end)
+    absent = _absent_days(inputs["absences"], days)
+    employees = inputs["employees"]
+
+    shortfall = {}
+    for unit_id in unit_ids:
+        demand = role_demand(unit_coverage(inputs["coverage_requirements"], unit_id), days)
+        for e in employees:
+            if e.get("unit_id") == unit_id and e["role"] in demand:
+                demand[e["role"]] -= employee_capacity(e, absent.get(e["id"], set()), days)
+        shortfall[unit_id] = demand
+
+    floaters = [e for e in employees if e.get("is_floating") and not e.get("unit_id")]
+    # Largest capacity first, so the biggest gaps get the most available staff
+    floaters.sort(key=lambda e: (-employee_capacity(e, absent.get(e["id"], set()), days), e["id"]))
+
+    allocation = {}
+    for e in floaters:
+        if e["role"] not in ROLE_MINIMUM_FIELDS or not unit_ids:
+            continue
+        unit_id = max(unit_ids, key=lambda u: (shortfall[u][e["role"]], -unit_ids.index(u)))
+        allocation[e["id"]] = unit_id
+        shortfall[unit_id][e["role"]] -= employee_capacity(e, absent.get(e["id"], set()), days)
+    return allocation
+
+
+def split_by_unit(inputs: dict, unit_ids: list[str], floating: dict[str, str], locked: list) -> dict[str, dict]:
+    """Solver inputs per unit: its employees (and dispatched floaters), their
+    absences and locks, the unit's coverage; shift types and rules are shared."""
+    per_unit = {}
+    for unit_id in unit_ids:
+        employees = [
+            e for e in inputs["employees"]
+            if e.get("unit_id") == unit_id or floating.get(e["id"]) == unit_id
+        ]
+        ids = {e["id"] for e in employees}
+        per_unit[unit_id] = {
+            "employees": employees,
+            "shift_types": inputs["shift_types"],
+            "coverage_requirements": unit_coverage(inputs["coverage_requirements"], unit_id),
+            "absences": [a for a in inputs["absences"] if a["employee_id"] in ids],
+            "constraint_rules": inputs["constraint_rules"],
+            "locked_assignments": [l for l in locked if l["employee_id"] in ids],
+        }
+    return per_unit
@@ -0,0 +1,104 @@
+"""Sparse store for the shift decision variables.
+
+A BoolVar is only created for (employee, day, shift) triples that can
+actually be assigned: days outside an employee's working_days and absence
+days get no variable at all, instead of a variable pinned to 0.
+"""
+
+from app.solver.index import ProblemIndex
+from app.solver.models import Absence
+
+WEEKDAY_TO_FRENCH = {
+    0: "lundi", 1: "mardi", 2: "mercredi", 3: "jeudi",
+    4: "vendredi", 5: "samedi", 6: "dimanche",
+}
+
+
+class ShiftVars:
+    """Decision variables keyed by (e_idx, d_idx, s_idx), with per-cell and per-slot views."""
+
+    def __init__(self):
+        self._vars = {}
+        self._by_cell: dict[tuple[int, int], list] = {}  # (e_idx, d_idx) -> [(s_idx, var)]
+        self._by_slot: dict[tuple[int, int], list] = {}  # (d_idx, s_idx) -> [(e_idx, var)]
+
+    def add(self, e_idx: int, d_idx: int, s_idx: int, var) -> None:
+        self._vars[(e_idx, d_idx, s_idx)] = var
+        self._by_cell.setdefault((e_idx, d_idx), []).append((s_idx, var))
+        self._by_slot.setdefault((d_idx, s_idx), []).append((e_idx, var))
+
+    def get(self, e_idx: int, d_idx: int, s_idx: int):
+        """The variable, or None if the assignment is impossible."""
+        return self._vars.get((e_idx, d_idx, s_idx))
+
+    def cell(self, e_idx: int, d_idx: int) -> list:
+        """[(s_idx, var)] for one employee on one day."""
+        return self._by_cell.get((e_idx, d_idx), [])
+
+    def slot(self, d_idx: int, s_idx: int) -> list:
+        """[(e_idx, var)] for one shift on one day."""
+        return self._by_slot.get((d_idx, s_idx), [])
+
+    def cells(self):
+        """((e_idx, d_idx), [(s_idx, var)]) for every cell with at least one variable."""
+        return self._by_cell.items()
+
+    def items(self):
+        return self._vars.items()
+
+    def __len__(self) -> int:
+        return len(self._vars)
+
+
+def unavailable_cells(index: ProblemIndex, absences: list[Absence]) -> set[tuple[int, int]]:
+    """(e_idx, d_idx) pairs where the employee cannot work.
+
+    Covers days outside the employee's working_days and absence days.
+    """
+    day_names = [WEEKDAY_TO_FRENCH[day.weekday()] for day in index.days]
+    blocked = set()
+    for e_idx, emp in enumerate(index.employees):
+        for d_idx, day_name in enumerate(day_names):
+            if day_name not in emp.working_days:
+                blocked.add((e_idx, d_idx))
+
+    for absence in absences:
+        e_idx = index.employee_idx.get(absence.employee_id)
+        if e_idx is None:
+            continue
+        for d_idx in index.day_range(absence.date_start, absence.date_end):
+            blocked.add((e_idx, d_idx))
+    return blocked
+
+
+def build_shift_vars(
+    model,
+    index: ProblemIndex,
+    absences: list[Absence],
+    frozen: dict[tuple[int, int], int | None] = None,
+) -> ShiftVars:
+    """Create one BoolVar per assignable (employee, day, shift) triple.
+
+    frozen maps (e_idx, d_idx) cells whose value is already decided to the
+    fixed s_idx (or None for a day off): only that one variable is created,
+    and the caller pins it with add_locked_assignments.
+    """
+    blocked = unavailable_cells(index, absences)
+    frozen = frozen or {}
+    all_shifts = range(len(index.shift_types))
+    shifts_var = ShiftVars()
+    for e_idx in range(len(index.employees)):
+        for d_idx in range(len(index.days)):
+            if (e_idx, d_idx) in blocked:
+                continue
+            if (e_idx, d_idx) in frozen:
+                fixed = frozen[(e_idx, d_idx)]
+                candidates = () if fixed is None else (fixed,)
+            else:
+                candidates = all_shifts
+            for s_idx in candidates:
+                shifts_var.add(
+                    e_idx, d_idx, s_idx,
+                    model.NewBoolVar(f"shift_e{e_idx}_d{d_idx}_s{s_idx}"),
+                )
+    return shifts_var
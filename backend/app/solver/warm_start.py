@@ -0,0 +1,23 @@
+"""Warm-start support: reuse a previous schedule as CP-SAT solution hints."""
+
+from app.solver.index import ProblemIndex
+from app.solver.models import PreviousAssignment
+from app.solver.variables import ShiftVars
+
+
+def previous_keys(index: ProblemIndex, previous: list[PreviousAssignment]) -> set[tuple[int, int, int]]:
+    """(e_idx, d_idx, s_idx) of previous assignments that fall inside this problem."""
+    keys = set()
+    for a in previous:
+        e_idx = index.employee_idx.get(a.employee_id)
+        s_idx = index.shift_idx.get(a.shift_type_id)
+        d_idx = index.day_idx.get(a.date)
+        if e_idx is not None and s_idx is not None and d_idx is not None:
+            keys.add((e_idx, d_idx, s_idx))
+    return keys
+
+
+def add_solution_hints(model, shifts_var: ShiftVars, previous: set[tuple[int, int, int]]) -> None:
+    """Hint every live variable with its value in the previous schedule."""
+    for key, var in shifts_var.items():
+        model.AddHint(var, 1 if key in previous else 0)
@@ -0,0 +1,272 @@
+"""In-memory stand-in for the Supabase/PostgREST clients used by the API.
+
+Supports the subset of the query builder the app uses: select (with
+projection and one-level embeds such as "employees(first_name)"), eq, neq,
+gt/gte/lt/lte, in_, is_, or_ (with nested and(...)), order, limit, range, insert, upsert, update, delete and rpc.
+FakeSupabase(tables) has a sync execute(); its .async_view() shares the same
+tables with an awaitable execute(), for the async API handlers.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+
+def _split_columns(columns: str) -> list[str]:
+    """Top-level comma-separated items, keeping embeds' parentheses together."""
+    items, depth, current = [], 0, ""
+    for char in columns:
+        if char == "," and depth == 0:
+            items.append(current.strip())
+            current = ""
+            continue
+        depth += (char == "(") - (char == ")")
+        current += char
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+_OPERATORS = {
+    "eq": lambda v, x: v is not None and str(v) == x,
+    "neq": lambda v, x: str(v) != x,
+    "gt": lambda v, x: v is not None and str(v) > x,
+    "gte": lambda v, x: v is not None and str(v) >= x,
+    "lt": lambda v, x: v is not None and str(v) < x,
+    "lte": lambda v, x: v is not None and str(v) <= x,
+}
+
+
+def _logic_filter(items: str, combine):
+    """Row test for a PostgREST logic tree such as 'a.gt.1,and(a.eq.1,b.gt.2)'."""
+    tests = []
+    for item in _split_columns(items):
+        if item.startswith(("and(", "or(")):
+            operator, inner = item[:-1].split("(", 1)
+            tests.append(_logic_filter(inner, all if operator == "and" else any))
+            continue
+        column, operator, value = item.split(".", 2)
+        value = json.loads(value) if value.startswith('"') else value
+        tests.append(lambda row, c=column, o=_OPERATORS[operator], x=value: o(row.get(c), x))
+    return lambda row: combine(test(row) for test in tests)
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.action = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.ordering = []
+        self.max_rows = None
+        self.offset = 0
+        self.count = None
+
+    # Actions
+
+    def select(self, columns: str = "*", count: str = None):
+        self.columns = columns
+        self.count = count
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "", ignore_duplicates: bool = False, returning=None):
+        self.action, self.payload = "upsert", (rows, on_conflict or "id", ignore_duplicates)
+        return self
+
+    def update(self, data: dict):
+        self.action, self.payload = "update", data
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    # Filters and modifiers
+
+    def _filter(self, column, test):
+        self.filters.append((column, test))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, lambda v: v is not None and str(v) == str(value))
+
+    def neq(self, column, value):
+        return self._filter(column, lambda v: str(v) != str(value))
+
+    def gt(self, column, value):
+        return self._filter(column, lambda v: v is not None and v > value)
+
+    def gte(self, column, value):
+        return self._filter(column, lambda v: v is not None and v >= value)
+
+    def lt(self, column, value):
+        return self._filter(column, lambda v: v is not None and v < value)
+
+    def lte(self, column, value):
+        return self._filter(column, lambda v: v is not None and v <= value)
+
+    def in_(self, column, values):
+        allowed = {str(v) for v in values}
+        return self._filter(column, lambda v: str(v) in allowed)
+
+    def is_(self, column, value):
+        return self._filter(column, lambda v: v is None if value in (None, "null") else v == value)
+
+    def or_(self, filters: str):
+        test = _logic_filter(filters, any)
+        self.filters.append((None, test))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        for name in column.split(","):
+            name = name.strip()
+            self.ordering.append((name.removesuffix(".desc"), desc or name.endswith(".desc")))
+        return self
+
+    def limit(self, count: int):
+        self.max_rows = count
+        return self
+
+    def range(self, start: int, end: int):
+        self.offset, self.max_rows = start, end - start + 1
+        return self
+
+    # Execution
+
+    def _matches(self, row: dict) -> bool:
+        return all(test(row) if column is None else test(row.get(column)) for column, test in self.filters)
+
+    def _project(self, row: dict) -> dict:
+        if self.columns.strip() == "*":
+            return dict(row)
+        projected = {}
+        for item in _split_columns(self.columns):
+            if item == "*":
+                projected.update(row)
+            elif "(" in item:
+                embedded, columns = item[:-1].split("(", 1)
+                foreign_key = embedded.rstrip("s") + "_id"
+                target = next(
+                    (r for r in self.db.tables.get(embedded, []) if r["id"] == row.get(foreign_key)),
+                    None,
+                )
+                projected[embedded] = (
+                    {c.strip(): target.get(c.strip()) for c in columns.split(",")} if target else None
+                )
+            else:
+                projected[item] = row.get(item)
+        return projected
+
+    def _run(self):
+        rows = self.db.tables.setdefault(self.table, [])
+        if self.action == "insert":
+            new_rows = self.payload if isinstance(self.payload, list) else [self.payload]
+            inserted = [self.db.new_row(row) for row in new_rows]
+            rows.extend(inserted)
+            return SimpleNamespace(data=[dict(r) for r in inserted], count=None)
+
+        if self.action == "upsert":
+            new_rows, key, ignore_duplicates = self.payload
+            existing = {r.get(key): r for r in rows}
+            written = []
+            for row in new_rows if isinstance(new_rows, list) else [new_rows]:
+                if row.get(key) in existing:
+                    if not ignore_duplicates:
+                        existing[row.get(key)].update(row)
+                        written.append(existing[row.get(key)])
+                    continue
+                rows.append(dict(row))
+                written.append(row)
+            return SimpleNamespace(data=[dict(r) for r in written], count=None)
+
+        matched = [r for r in rows if self._matches(r)]
+        if self.action == "update":
+            for row in matched:
+                row.update(self.payload)
+            return SimpleNamespace(data=[dict(r) for r in matched], count=None)
+        if self.action == "delete":
+            self.db.tables[self.table] = [r for r in rows if not self._matches(r)]
+            return SimpleNamespace(data=[dict(r) for r in matched], count=None)
+
+        for column, desc in reversed(self.ordering):
+            matched.sort(key=lambda r: (r.get(column) is None, r.get(column) or ""), reverse=desc)
+        total = len(matched)
+        matched = matched[self.offset:]
+        # Like PostgREST's max-rows, the database cap silently truncates
+        for cap in (self.max_rows, self.db.max_rows):
+            if cap is not None:
+                matched = matched[:cap]
+        return SimpleNamespace(data=[self._project(r) for r in matched], count=total if self.count else None)
+
+    def execute(self):
+        self.db.queries.append((self.table, self.action))
+        if self.db.asynchronous:
+            async def run():
+                return self._run()
+            return run()
+        return self._run()
+
+
+class FakeRpc:
+    def __init__(self, db: "FakeSupabase", fn: str, params: dict):
+        self.db, self.fn, self.params = db, fn, params
+
+    def execute(self):
+        self.db.queries.append((self.fn, "rpc"))
+        result = SimpleNamespace(data=self.db.functions[self.fn](self.db, **self.params), count=None)
+        if self.db.asynchronous:
+            async def run():
+                return result
+            return run()
+        return result
+
+
+def save_schedule(db: "FakeSupabase", p_schedule: dict, p_assignments: list) -> dict:
+    """The save_schedule SQL function (migration 010)."""
+    schedule = db.new_row({**p_schedule, "status": p_schedule.get("status") or "draft"})
+    db.tables.setdefault("schedules", []).append(schedule)
+    db.tables.setdefault("schedule_assignments", []).extend(
+        {"id": str(uuid.uuid4()), **a, "schedule_id": schedule["id"], "is_locked": bool(a.get("is_locked"))}
+        for a in p_assignments
+    )
+    return dict(schedule)
+
+
+class FakeSupabase:
+    def __init__(
+        self, tables: dict = None, asynchronous: bool = False, functions: dict = None, queries=None,
+        max_rows: int = None,
+    ):
+        self.tables = tables if tables is not None else {}
+        self.max_rows = max_rows
+        self.asynchronous = asynchronous
+        self.functions = functions if functions is not None else {"save_schedule": save_schedule}
+        self.queries = queries if queries is not None else []
+
+    def async_view(self) -> "FakeSupabase":
+        return FakeSupabase(
+            self.tables, asynchronous=True, functions=self.functions, queries=self.queries, max_rows=self.max_rows,
+        )
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: dict) -> FakeRpc:
+        return FakeRpc(self, fn, params)
+
+    @staticmethod
+    def new_row(row: dict) -> dict:
+        return {
+            "id": str(uuid.uuid4()),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **row,
+        }
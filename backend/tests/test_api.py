@@ -1,5 +1,7 @@
 """Tests for the FastAPI endpoints (requires Supabase connection)."""
 
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -59,4 +61,305 @@ class TestScheduleEndpoints:
             "period_start": "2026-03-02",
             "period_end": "2026-03-08",
         })
-        assert response.status_code in (201, 422)  # 422 if no feasible solution
+        assert response.status_code == 202
+        assert response.json()["status"] in ("queued", "running")
+
+    def test_unknown_job_returns_404(self, client):
+        response = client.get("/api/schedules/jobs/does-not-exist")
+        assert response.status_code == 404
+
+    def test_invalid_rolling_window_is_rejected(self, client):
+        for window, overlap in ((4, -1), (0, 0)):
+            response = client.post("/api/schedules/generate", json={
+                "period_start": "2026-01-05",
+                "period_end": "2026-04-30",
+                "rolling_window_weeks": window,
+                "rolling_overlap_weeks": overlap,
+            })
+            assert response.status_code == 422
+
+    def test_negative_priority_is_rejected(self, client):
+        response = client.post("/api/schedules/generate", json={
+            "period_start": "2026-03-02",
+            "period_end": "2026-03-08",
+            "priority": -1,
+        })
+        assert response.status_code == 422
+
+
+class TestSupabaseClient:
+    """One client per process, closed on shutdown."""
+
+    def test_client_is_shared_until_closed(self, monkeypatch):
+        from types import SimpleNamespace
+        from app.db import supabase_client
+
+        closed = []
+
+        def create():
+            session = SimpleNamespace(close=lambda: closed.append(session))
+            return SimpleNamespace(postgrest=SimpleNamespace(session=session))
+
+        monkeypatch.setattr(supabase_client, "_client", None)
+        monkeypatch.setattr(supabase_client, "_create_supabase", create)
+        first = supabase_client.get_supabase()
+        assert supabase_client.get_supabase() is first
+
+        supabase_client.close_supabase()
+        assert closed == [first.postgrest.session]
+        assert supabase_client.get_supabase() is not first
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """API wired to an in-memory database: async handlers and background jobs share it."""
+    from app.main import app
+    from app.api import schedules
+    from app.api.http_cache import get_read_cache
+    from app.db.supabase_client import get_async_supabase
+    from tests.fake_supabase import FakeSupabase
+    from tests.test_solver import _make_employees, _make_shift_types, _make_coverage, _make_constraint_rules
+
+    db = FakeSupabase({
+        "employees": _make_employees(10),
+        "shift_types": _make_shift_types(),
+        "coverage_requirements": _make_coverage(),
+        "absences": [],
+        "constraint_rules": _make_constraint_rules(),
+        "schedules": [],
+        "schedule_assignments": [],
+    })
+    app.dependency_overrides[get_async_supabase] = db.async_view
+    monkeypatch.setattr(schedules, "get_supabase", lambda: db)
+    get_read_cache().clear()
+    yield db
+    app.dependency_overrides.clear()
+
+
+class TestWithFakeDatabase:
+    """Endpoints against the in-memory stand-in."""
+
+    def test_employee_crud(self, client, fake_db):
+        response = client.post("/api/employees", json={
+            "first_name": "Test",
+            "last_name": "Aaa",
+            "role": "infirmier",
+            "activity_rate": 40,
+            "working_days": ["lundi", "mardi"],
+        })
+        assert response.status_code == 201
+        employee_id = response.json()["id"]
+
+        listed = client.get("/api/employees").json()
+        assert listed[0]["last_name"] == "Aaa"
+        assert len(listed) == 11
+
+        response = client.put(f"/api/employees/{employee_id}", json={})
+        assert response.status_code == 400
+        response = client.put(f"/api/employees/{employee_id}", json={"last_name": "Zzz"})
+        assert response.json()["last_name"] == "Zzz"
+
+        assert client.delete(f"/api/employees/{employee_id}").status_code == 204
+        assert client.get(f"/api/employees/{employee_id}").status_code == 404
+
+    def _generate(self, client) -> dict:
+        response = client.post("/api/schedules/generate", json={
+            "period_start": "2026-03-02",
+            "period_end": "2026-03-08",
+        })
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        deadline = time.time() + 60
+        job = client.get(f"/api/schedules/jobs/{job_id}").json()
+        while job["status"] in ("queued", "running") and time.time() < deadline:
+            time.sleep(0.2)
+            job = client.get(f"/api/schedules/jobs/{job_id}").json()
+        assert job["status"] == "succeeded", job.get("error")
+        return job
+
+    def test_generate_then_read_schedule(self, client, fake_db):
+        job = self._generate(client)
+        # Schedule and assignments are written by one save_schedule call
+        assert ("save_schedule", "rpc") in fake_db.queries
+        assert ("schedules", "insert") not in fake_db.queries
+        assert ("schedule_assignments", "insert") not in fake_db.queries
+
+        schedule = client.get(f"/api/schedules/{job['result']['schedule_id']}").json()
+        assert schedule["period_start"] == "2026-03-02"
+        assert schedule["assignments"]
+        assert schedule["assignments"][0]["employees"]["role"] in ("infirmier", "assc", "aide-soignant")
+
+        stats = client.get(f"/api/schedules/{schedule['id']}/stats").json()
+        assert stats["status"] in ("optimal", "feasible")
+
+    def test_repair_returns_saved_schedule_without_reading_back(self, client, fake_db):
+        job = self._generate(client)
+        base_id = job["result"]["schedule_id"]
+
+        response = client.post(f"/api/schedules/{base_id}/repair", json={
+            "employee_ids": ["emp-1"],
+            "date_start": "2026-03-04",
+            "date_end": "2026-03-04",
+        })
+        assert response.status_code == 201
+        # The response is built from the saved rows: saving is the last query
+        assert fake_db.queries[-1] == ("save_schedule", "rpc")
+        repaired = response.json()
+        assert repaired["solver_stats"]["repair"]["base_schedule_id"] == base_id
+        assert repaired == client.get(f"/api/schedules/{repaired['id']}").json()
+
+    def test_repair_rejects_invalid_ranges(self, client, fake_db):
+        base_id = self._generate(client)["result"]["schedule_id"]
+        saved = len(fake_db.tables["schedules"])
+        for start, end, status in (
+            ("2026-03-xx", "2026-03-04", 422),
+            ("2026-03-05", "2026-03-04", 422),
+            ("2026-04-01", "2026-04-02", 400),
+        ):
+            response = client.post(f"/api/schedules/{base_id}/repair", json={
+                "employee_ids": ["emp-1"], "date_start": start, "date_end": end,
+            })
+            assert response.status_code == status, (start, end)
+        assert len(fake_db.tables["schedules"]) == saved
+
+    def test_list_schedules_pages_without_stats(self, client, fake_db):
+        fake_db.tables["schedules"] = [
+            {
+                "id": f"sched-{i}", "period_start": "2026-03-02", "period_end": "2026-03-08",
+                "status": "published" if i % 2 else "draft", "solver_stats": {"status": "optimal"},
+                "unit_id": None, "created_at": f"2026-01-{1 + i // 2:02d}T08:00:00+00:00",
+            }
+            for i in range(5)
+        ]
+        seen, cursor = [], None
+        while True:
+            response = client.get("/api/schedules", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+            assert response.status_code == 200
+            page = response.json()
+            assert all("solver_stats" not in s for s in page)
+            seen += [s["id"] for s in page]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        # Newest first; rows sharing a created_at are ordered by id
+        assert seen == ["sched-4", "sched-3", "sched-2", "sched-1", "sched-0"]
+
+        published = client.get("/api/schedules", params={"status": "published"}).json()
+        assert [s["id"] for s in published] == ["sched-3", "sched-1"]
+        assert client.get("/api/schedules", params={"cursor": "nope"}).status_code == 400
+
+    def test_get_schedule_filters_and_pages_assignments(self, client, fake_db):
+        schedule_id = self._generate(client)["result"]["schedule_id"]
+        everything = client.get(f"/api/schedules/{schedule_id}").json()["assignments"]
+
+        week = client.get(f"/api/schedules/{schedule_id}", params={
+            "date_from": "2026-03-04", "date_to": "2026-03-05", "employee_id": ["emp-1", "emp-2"],
+        }).json()["assignments"]
+        assert week == [
+            a for a in everything
+            if "2026-03-04" <= a["date"] <= "2026-03-05" and a["employee_id"] in ("emp-1", "emp-2")
+        ]
+
+        pages, cursor = [], None
+        while True:
+            params = {"limit": 7, "include_stats": False, **({"cursor": cursor} if cursor else {})}
+            response = client.get(f"/api/schedules/{schedule_id}", params=params)
+            body = response.json()
+            assert "solver_stats" not in body
+            pages += body["assignments"]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert pages == everything
+
+    def test_columnar_schedule_matches_json(self, client, fake_db):
+        schedule_id = self._generate(client)["result"]["schedule_id"]
+        response = client.get(f"/api/schedules/{schedule_id}")
+        assignments = response.json()["assignments"]
+
+        response = client.get(f"/api/schedules/{schedule_id}", params={"format": "columnar"})
+        assert response.headers["content-type"].startswith("application/vnd.calculator-health.columnar+json")
+        grid = response.json()
+        assert grid["days"][0] == "2026-03-02" and grid["days"][-1] == "2026-03-08"
+        rebuilt = sorted(
+            (grid["days"][d], grid["employees"][e]["id"], grid["shift_types"][s]["name"])
+            for e, row in enumerate(grid["grid"])
+            for d, s in enumerate(row)
+            if s is not None
+        )
+        assert rebuilt == sorted((a["date"], a["employee_id"], a["shift_types"]["name"]) for a in assignments)
+
+        accepted = client.get(f"/api/schedules/{schedule_id}", params={"date_from": "2026-03-07"}, headers={
+            "Accept": "application/vnd.calculator-health.columnar+json",
+        }).json()
+        assert accepted["days"] == ["2026-03-07", "2026-03-08"]
+        assert client.get(f"/api/schedules/{schedule_id}", params={"format": "columnar", "limit": 10}).status_code == 400
+        for bad in ({"date_from": "2026-13-01"}, {"date_to": "next week", "format": "columnar"}):
+            assert client.get(f"/api/schedules/{schedule_id}", params=bad).status_code == 422
+
+    def test_large_schedule_is_gzipped(self, client, fake_db):
+        schedule_id = self._generate(client)["result"]["schedule_id"]
+        response = client.get(f"/api/schedules/{schedule_id}", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["assignments"]
+        plain = client.get(f"/api/schedules/{schedule_id}", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == response.json()
+
+    def test_reference_data_is_cached_and_revalidated(self, client, fake_db):
+        first = client.get("/api/shifts")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+        reads = fake_db.queries.count(("shift_types", "select"))
+
+        again = client.get("/api/shifts", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.content == b""
+        since = client.get("/api/shifts", headers={"If-Modified-Since": first.headers["last-modified"]})
+        assert since.status_code == 304
+        assert fake_db.queries.count(("shift_types", "select")) == reads
+
+        shift_id = fake_db.tables["shift_types"][0]["id"]
+        client.put(f"/api/shifts/{shift_id}", json={"name": "Matin long"})
+        changed = client.get("/api/shifts", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["etag"] != etag
+        assert "Matin long" in [c["shift_types"]["name"] for c in client.get("/api/coverage").json()]
+
+    def test_only_published_schedules_are_cached(self, client, fake_db):
+        schedule_id = self._generate(client)["result"]["schedule_id"]
+        assert "etag" not in client.get(f"/api/schedules/{schedule_id}").headers
+
+        client.put(f"/api/schedules/{schedule_id}/status", json={"status": "published"})
+        etag = client.get(f"/api/schedules/{schedule_id}").headers["etag"]
+        reads = fake_db.queries.count(("schedule_assignments", "select"))
+        assert client.get(f"/api/schedules/{schedule_id}", headers={"If-None-Match": etag}).status_code == 304
+        assert fake_db.queries.count(("schedule_assignments", "select")) == reads
+
+        client.put(f"/api/schedules/{schedule_id}/status", json={"status": "draft"})
+        response = client.get(f"/api/schedules/{schedule_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.json()["status"] == "draft"
+
+    def test_schedule_being_saved_is_hidden(self, client, fake_db):
+        fake_db.tables["schedules"] = [{
+            "id": "sched-saving", "period_start": "2026-03-02", "period_end": "2026-03-08",
+            "status": "saving", "solver_stats": {}, "unit_id": None, "created_at": "2026-01-01T08:00:00+00:00",
+        }]
+        assert client.get("/api/schedules").json() == []
+        assert client.get("/api/schedules/sched-saving").status_code == 404
+        assert client.get("/api/schedules/sched-saving/stats").status_code == 404
+        response = client.put("/api/schedules/sched-saving/status", json={"status": "published"})
+        assert response.status_code == 404
+        response = client.put("/api/schedules/sched-saving/status", json={"status": "saving"})
+        assert response.status_code == 400
+
+    def test_employee_unit_can_be_cleared(self, client, fake_db):
+        employee_id = fake_db.tables["employees"][0]["id"]
+        response = client.put(f"/api/employees/{employee_id}", json={"unit_id": "unit-1"})
+        assert response.json()["unit_id"] == "unit-1"
+
+        # Other fields left out are kept; an explicit null clears the unit
+        response = client.put(f"/api/employees/{employee_id}", json={"unit_id": None, "is_floating": True})
+        assert response.status_code == 200
+        employee = response.json()
+        assert employee["unit_id"] is None and employee["is_floating"] is True
+        assert employee["last_name"] == fake_db.tables["employees"][0]["last_name"]
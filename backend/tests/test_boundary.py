@@ -0,0 +1,116 @@
+"""Tests for the boundary state carried over from the previous schedule."""
+
+from app.solver.boundary import boundary_state
+from app.solver.engine import solve_schedule
+from tests.test_solver import (
+    _make_employees, _make_shift_types, _make_coverage, _make_constraint_rules,
+)
+
+
+def _solve(period_start, period_end, boundary, locked=None):
+    return solve_schedule(
+        employees=_make_employees(12),
+        shift_types=_make_shift_types(),
+        coverage_requirements=_make_coverage(),
+        absences=[],
+        constraint_rules=_make_constraint_rules(),
+        period_start=period_start,
+        period_end=period_end,
+        locked_assignments=locked,
+        boundary=boundary,
+    )
+
+
+class TestBoundaryState:
+    """Compact per-employee state from the previous schedule's last two weeks."""
+
+    def test_state_from_previous_assignments(self):
+        previous = [
+            # Period starts Wednesday 2026-03-04; emp-1 worked Mon and Tue nights
+            {"employee_id": "emp-1", "shift_type_id": "shift-nuit", "date": "2026-03-02"},
+            {"employee_id": "emp-1", "shift_type_id": "shift-nuit", "date": "2026-03-03"},
+            # emp-2 worked the weekend of 02-28, not the one of 02-21
+            {"employee_id": "emp-2", "shift_type_id": "shift-matin", "date": "2026-02-28"},
+            # Before the two-week history: ignored
+            {"employee_id": "emp-3", "shift_type_id": "shift-matin", "date": "2026-02-17"},
+        ]
+        states = boundary_state(previous, _make_shift_types(), "2026-03-04")
+
+        assert states == [
+            {
+                "employee_id": "emp-1",
+                "last_shift_type_id": "shift-nuit",
+                "week_hours": 18.0,
+                "last_free_weekend": "2026-02-28",
+            },
+            {
+                "employee_id": "emp-2",
+                "last_shift_type_id": None,
+                "week_hours": 0,
+                "last_free_weekend": "2026-02-21",
+            },
+        ]
+
+    def test_eve_night_forbids_first_morning(self):
+        locked = [{"employee_id": "emp-1", "shift_type_id": "shift-matin", "date": "2026-03-02"}]
+        assert _solve("2026-03-02", "2026-03-08", [], locked) is not None
+
+        boundary = [{"employee_id": "emp-1", "last_shift_type_id": "shift-nuit", "last_free_weekend": "2026-02-28"}]
+        assert _solve("2026-03-02", "2026-03-08", boundary, locked) is None
+
+    def test_carried_hours_count_in_first_week(self):
+        # emp-1 already worked 40h of its 42h in the week of Wednesday 03-04
+        boundary = [{"employee_id": "emp-1", "week_hours": 40, "last_free_weekend": "2026-02-28"}]
+        result = _solve("2026-03-04", "2026-03-15", boundary)
+
+        assert result is not None
+        assert result["stats"]["boundary"]["num_carried_hours"] == 1
+        first_week = [
+            a for a in result["assignments"]
+            if a["employee_id"] == "emp-1" and a["date"] <= "2026-03-08"
+        ]
+        assert first_week == []
+
+    def test_worked_weekend_frees_first_weekend(self):
+        # No free weekend in the history: the one before 03-02 was worked
+        boundary = [
+            {"employee_id": f"emp-{i}", "last_free_weekend": None}
+            for i in (1, 2, 3)
+        ]
+        result = _solve("2026-03-02", "2026-03-15", boundary)
+
+        assert result is not None
+        assert result["stats"]["boundary"]["num_worked_weekends"] == 3
+        for a in result["assignments"]:
+            if a["employee_id"] in ("emp-1", "emp-2", "emp-3"):
+                assert a["date"] not in ("2026-03-07", "2026-03-08")
+
+    def test_symmetry_breaking_tells_boundary_states_apart(self):
+        # Two otherwise identical nurses; nurse-a already worked its 42h in the
+        # week of Tuesday 03-03, so nurse-b covers every morning of it
+        nurses = [
+            {**employee, "id": f"nurse-{name}", "role": "infirmier"}
+            for name, employee in zip("ab", _make_employees(2)[1:] * 2)
+        ]
+        rules = _make_constraint_rules() + [
+            {"name": "symmetry_breaking", "type": "hard", "parameter": {"prefix_days": 1}, "is_active": True},
+        ]
+        coverage = [
+            {**c, "min_infirmier": int(c["shift_type_id"] == "shift-matin" and c["day_type"] == "weekday"),
+             "min_assc": 0, "min_aide_soignant": 0}
+            for c in _make_coverage()
+        ]
+        boundary = [{"employee_id": "nurse-a", "week_hours": 42, "last_free_weekend": "2026-02-28"}]
+        result = solve_schedule(
+            employees=nurses,
+            shift_types=_make_shift_types(),
+            coverage_requirements=coverage,
+            absences=[],
+            constraint_rules=rules,
+            period_start="2026-03-03",
+            period_end="2026-03-08",
+            boundary=boundary,
+        )
+
+        assert result is not None
+        assert "symmetry" not in result["stats"]  # no interchangeable class left
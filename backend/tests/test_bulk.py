@@ -0,0 +1,140 @@
+"""Tests for the chunked bulk writer."""
+
+import threading
+
+import pytest
+
+from app.db.bulk import BulkWriteError, insert_batch, write_in_batches
+from tests.fake_supabase import FakeSupabase
+
+
+class TestWriteInBatches:
+    """Batching, bounded parallelism and per-batch retries."""
+
+    def test_batches_and_parallelism(self):
+        batches = []
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def write(batch):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            batches.append(batch)
+            with lock:
+                running[0] -= 1
+
+        written = write_in_batches(write, ({"id": i} for i in range(2500)), batch_size=1000, max_parallel=2)
+
+        assert written == 2500
+        assert sorted(len(b) for b in batches) == [500, 1000, 1000]
+        assert peak[0] <= 2
+
+    def test_only_failed_batch_is_retried(self):
+        attempts = {}
+
+        def write(batch):
+            first = batch[0]["id"]
+            attempts[first] = attempts.get(first, 0) + 1
+            if first == 10 and attempts[first] == 1:
+                raise ConnectionError("reset")
+
+        write_in_batches(write, ({"id": i} for i in range(30)), batch_size=10, backoff_seconds=0)
+        assert attempts == {0: 1, 10: 2, 20: 1}
+
+    def test_gives_up_after_retries(self):
+        def write(batch):
+            raise ConnectionError("down")
+
+        with pytest.raises(BulkWriteError):
+            write_in_batches(write, ({"id": i} for i in range(5)), batch_size=2, retries=1, backoff_seconds=0)
+
+    def test_insert_batch_is_idempotent(self):
+        db = FakeSupabase({"schedule_assignments": []})
+        rows = [{"id": "a"}, {"id": "b"}]
+        insert_batch(db, "schedule_assignments", rows)
+        insert_batch(db, "schedule_assignments", rows)
+        assert db.tables["schedule_assignments"] == rows
+
+    def test_insert_batch_sends_csv_to_postgrest(self):
+        from types import SimpleNamespace
+
+        requests = []
+
+        def post(path, **kwargs):
+            requests.append((path, kwargs))
+            return SimpleNamespace(raise_for_status=lambda: None)
+
+        client = SimpleNamespace(postgrest=SimpleNamespace(session=SimpleNamespace(post=post)))
+        insert_batch(client, "schedule_assignments", [{"id": "a", "is_locked": False}, {"id": "b", "is_locked": True}])
+
+        path, kwargs = requests[0]
+        assert path == "/schedule_assignments"
+        assert kwargs["content"] == "id,is_locked\na,False\nb,True\n"
+        assert kwargs["headers"]["Content-Type"] == "text/csv"
+        assert "resolution=ignore-duplicates" in kwargs["headers"]["Prefer"]
+
+
+class TestSaveSchedule:
+    """Schedules larger than one batch: RPC for the first, bulk writer for the rest."""
+
+    def _result(self, count):
+        return {
+            "assignments": [
+                {"employee_id": f"emp-{i}", "shift_type_id": "shift-matin", "date": "2026-03-02"}
+                for i in range(count)
+            ],
+            "stats": {"status": "optimal"},
+        }
+
+    def test_saved_in_batches(self, monkeypatch):
+        from app.api.schedules import _save_schedule
+        from app.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "schedule_save_batch_size", 10)
+        db = FakeSupabase()
+        schedule = _save_schedule(db, "2026-03-02", "2026-03-08", self._result(25))
+
+        assert db.queries.count(("save_schedule", "rpc")) == 1
+        assert db.queries.count(("schedule_assignments", "upsert")) == 2
+        rows = db.tables["schedule_assignments"]
+        assert len(rows) == 25 and len({r["id"] for r in rows}) == 25
+        assert {r["schedule_id"] for r in rows} == {schedule["id"]}
+
+    def test_schedule_stays_saving_until_complete(self, monkeypatch):
+        from app.api.schedules import _save_schedule
+        from app.config import get_settings
+        from tests.fake_supabase import FakeQuery
+
+        monkeypatch.setattr(get_settings(), "schedule_save_batch_size", 10)
+        db = FakeSupabase()
+        seen = []
+        upsert = FakeQuery.upsert
+
+        def record(self, *args, **kwargs):
+            seen.append(db.tables["schedules"][0]["status"])
+            return upsert(self, *args, **kwargs)
+
+        monkeypatch.setattr(FakeQuery, "upsert", record)
+        schedule = _save_schedule(db, "2026-03-02", "2026-03-08", self._result(25))
+
+        assert seen == ["saving", "saving"]
+        assert schedule["status"] == "draft"
+        assert db.tables["schedules"][0]["status"] == "draft"
+
+    def test_failed_batch_removes_schedule(self, monkeypatch):
+        from app.api.schedules import _save_schedule
+        from app.config import get_settings
+        from tests.fake_supabase import FakeQuery
+
+        monkeypatch.setattr(get_settings(), "schedule_save_batch_size", 10)
+        monkeypatch.setattr(get_settings(), "schedule_save_retries", 0)
+
+        def fail(self, *args, **kwargs):
+            raise ConnectionError("down")
+
+        monkeypatch.setattr(FakeQuery, "upsert", fail)
+        db = FakeSupabase()
+        with pytest.raises(BulkWriteError):
+            _save_schedule(db, "2026-03-02", "2026-03-08", self._result(25))
+        assert db.tables["schedules"] == []
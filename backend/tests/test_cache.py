@@ -0,0 +1,95 @@
+"""Tests for the solve-result cache."""
+
+from app.solver.cache import SolveCache, solve_key
+from tests.test_solver import (
+    _make_employees, _make_shift_types, _make_coverage, _make_constraint_rules,
+)
+
+
+def _solve_args(**overrides):
+    args = {
+        "employees": _make_employees(10),
+        "shift_types": _make_shift_types(),
+        "coverage_requirements": _make_coverage(),
+        "absences": [],
+        "constraint_rules": _make_constraint_rules(),
+        "period_start": "2026-03-02",
+        "period_end": "2026-03-08",
+        "time_limit_seconds": 30,
+    }
+    args.update(overrides)
+    return args
+
+
+class TestSolveKey:
+    """The key only depends on the solver input content."""
+
+    def test_input_order_does_not_matter(self):
+        employees = _make_employees(10)
+        assert solve_key(**_solve_args(employees=employees)) == \
+            solve_key(**_solve_args(employees=list(reversed(employees))))
+
+    def test_worker_count_does_not_matter(self):
+        assert solve_key(**_solve_args(num_workers=2)) == solve_key(**_solve_args(num_workers=8))
+
+    def test_time_limit_and_rules_matter(self):
+        base = solve_key(**_solve_args())
+        assert solve_key(**_solve_args(time_limit_seconds=10)) != base
+        rules = _make_constraint_rules()
+        rules[0]["parameter"] = {"hours": 12}
+        assert solve_key(**_solve_args(constraint_rules=rules)) != base
+
+    def test_absences_matter(self):
+        absence = {"employee_id": "emp-0", "date_start": "2026-03-02", "date_end": "2026-03-03", "type": "maladie"}
+        assert solve_key(**_solve_args(absences=[absence])) != solve_key(**_solve_args())
+
+
+class TestSolveCache:
+    """LRU, TTL and disk persistence."""
+
+    def test_get_returns_copy(self):
+        cache = SolveCache(max_entries=2)
+        cache.put("a", {"stats": {"status": "optimal"}, "assignments": []})
+        hit = cache.get("a")
+        hit["stats"]["cache_hit"] = True
+        assert "cache_hit" not in cache.get("a")["stats"]
+
+    def test_lru_eviction(self):
+        cache = SolveCache(max_entries=2)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        cache.get("a")
+        cache.put("c", {"n": 3})
+        assert cache.get("b") is None
+        assert cache.get("a") == {"n": 1}
+        assert cache.get("c") == {"n": 3}
+
+    def test_ttl_expiry(self):
+        now = [1000.0]
+        cache = SolveCache(max_entries=2, ttl_seconds=60, clock=lambda: now[0])
+        cache.put("a", {"n": 1})
+        now[0] += 61
+        assert cache.get("a") is None
+
+    def test_disabled_when_no_entries(self):
+        cache = SolveCache(max_entries=0)
+        cache.put("a", {"n": 1})
+        assert cache.get("a") is None
+
+    def test_disk_persistence(self, tmp_path):
+        SolveCache(max_entries=2, directory=str(tmp_path)).put("a", {"n": 1})
+        assert SolveCache(max_entries=2, directory=str(tmp_path)).get("a") == {"n": 1}
+
+    def test_disk_is_bounded(self, tmp_path):
+        cache = SolveCache(max_entries=2, directory=str(tmp_path))
+        for key in ("a", "b", "c"):
+            cache.put(key, {"key": key})
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    def test_disk_expiry_uses_clock(self, tmp_path):
+        now = [1000.0]
+        cache = SolveCache(max_entries=2, ttl_seconds=60, directory=str(tmp_path), clock=lambda: now[0])
+        cache.put("a", {"n": 1})
+        now[0] += 61
+        cache.put("b", {"n": 2})
+        assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["b"]
@@ -0,0 +1,119 @@
+"""Tests for the process-pool solver executor."""
+
+import threading
+
+import pytest
+from app.solver.cache import SolveCache
+from app.solver.executor import SolverExecutor, compute_worker_budget
+from tests.test_solver import (
+    _make_employees, _make_shift_types, _make_coverage, _make_constraint_rules,
+)
+
+
+class TestWorkerBudget:
+    """CPU budget per solve under each policy."""
+
+    def test_fair_share_splits_cores(self):
+        assert compute_worker_budget("fair_share", 12, 1, []) == 12
+        assert compute_worker_budget("fair_share", 12, 2, [0]) == 6
+        assert compute_worker_budget("fair_share", 12, 4, [0, 0, 0]) == 3
+
+    def test_running_budgets_never_exceed_total(self):
+        for policy in ("fair_share", "priority", "max_concurrent"):
+            for max_concurrent in (1, 2, 3, 4):
+                running = []
+                for priority in (3, 0, 1, 2)[:max_concurrent]:
+                    budget = compute_worker_budget(policy, 12, max_concurrent, [p for p, _ in running], priority)
+                    running.append((priority, budget))
+                assert sum(b for _, b in running) <= 12, (policy, max_concurrent)
+
+    def test_fair_share_never_below_one(self):
+        assert compute_worker_budget("fair_share", 2, 8, [0, 0, 0, 0]) == 1
+
+    def test_priority_weights_share(self):
+        # running solve has priority 0 (weight 1), new one priority 2 (weight 3)
+        assert compute_worker_budget("priority", 8, 1, [0], priority=2) == 6
+        assert compute_worker_budget("priority", 8, 2, [2], priority=0) == 2
+        # capped at 8 // 2 however high the priority
+        assert compute_worker_budget("priority", 8, 2, [0], priority=5) == 4
+
+    def test_negative_priority_counts_as_zero(self):
+        assert compute_worker_budget("priority", 8, 1, [], -1) == 8
+        assert compute_worker_budget("priority", 8, 2, [-2], 0) == 4
+
+    def test_max_concurrent_is_static(self):
+        assert compute_worker_budget("max_concurrent", 12, 3, []) == 4
+        assert compute_worker_budget("max_concurrent", 12, 3, [0, 0]) == 4
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            compute_worker_budget("round_robin", 4, 2, [])
+
+
+class TestSolverExecutor:
+    """Solves run in worker processes."""
+
+    def test_solve_in_process_pool(self):
+        executor = SolverExecutor(policy="fair_share", total_workers=2, max_concurrent=1)
+        try:
+            result = executor.solve(
+                employees=_make_employees(10),
+                shift_types=_make_shift_types(),
+                coverage_requirements=_make_coverage(),
+                absences=[],
+                constraint_rules=_make_constraint_rules(),
+                period_start="2026-03-02",
+                period_end="2026-03-08",
+                time_limit_seconds=5,
+                cancel_event=threading.Event(),
+            )
+        finally:
+            executor.shutdown()
+
+        assert result is not None
+        assert result["stats"]["num_workers"] == 2
+        assert len(result["assignments"]) > 0
+
+    def test_solution_events_are_forwarded(self):
+        executor = SolverExecutor(total_workers=2, max_concurrent=1)
+        events = []
+        try:
+            result = executor.solve(
+                employees=_make_employees(10),
+                shift_types=_make_shift_types(),
+                coverage_requirements=_make_coverage(),
+                absences=[],
+                constraint_rules=_make_constraint_rules(),
+                period_start="2026-03-02",
+                period_end="2026-03-08",
+                time_limit_seconds=5,
+                on_solution=events.append,
+            )
+        finally:
+            executor.shutdown()
+
+        assert result is not None
+        assert len(events) >= 1
+        assert events[-1]["objective"] == result["stats"]["objective_value"]
+
+    def test_repeated_solve_hits_cache(self):
+        executor = SolverExecutor(total_workers=2, max_concurrent=1, cache=SolveCache(max_entries=4))
+        args = dict(
+            employees=_make_employees(10),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-08",
+            time_limit_seconds=5,
+        )
+        try:
+            first = executor.solve(**args)
+            second = executor.solve(**args)
+        finally:
+            executor.shutdown()
+
+        assert "cache_hit" not in first["stats"]
+        assert second["stats"]["cache_hit"] is True
+        assert second["assignments"] == first["assignments"]
@@ -0,0 +1,57 @@
+"""Tests for the read-through response cache."""
+
+from app.api.http_cache import ReadCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestReadCache:
+    """Version-based invalidation, TTL and entry bound."""
+
+    def test_invalidating_a_table_drops_entries_read_from_it(self):
+        cache = ReadCache()
+        tables = ("coverage_requirements", "shift_types")
+        cache.put(("coverage",), cache.versions(tables), [{"id": "c1"}])
+        cache.put(("constraints",), cache.versions(("constraint_rules",)), [])
+
+        cache.invalidate("shift_types")
+
+        assert cache.get(("coverage",), tables) is None
+        assert cache.get(("constraints",), ("constraint_rules",)) is not None
+
+    def test_read_overlapping_a_write_is_not_served(self):
+        cache = ReadCache()
+        versions = cache.versions(("employees",))  # taken before the read
+        cache.invalidate("employees")  # write lands while the read is in flight
+        cache.put(("employees",), versions, [{"id": "old"}])
+
+        assert cache.get(("employees",), ("employees",)) is None
+
+    def test_ttl_and_last_modified(self):
+        clock = FakeClock()
+        cache = ReadCache(ttl_seconds=60, clock=clock)
+        first = cache.put(("shifts",), (0,), [{"id": "s1"}])
+
+        clock.now += 61
+        assert cache.get(("shifts",), ("shift_types",)) is None
+        # Same content reloaded: same validators
+        reloaded = cache.put(("shifts",), (0,), [{"id": "s1"}])
+        assert (reloaded.etag, reloaded.last_modified) == (first.etag, first.last_modified)
+        changed = cache.put(("shifts",), (0,), [{"id": "s2"}])
+        assert changed.etag != first.etag and changed.last_modified == clock.now
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ReadCache(max_entries=2)
+        for name in ("a", "b"):
+            cache.put((name,), (0,), [])
+        cache.get(("a",), ("t",))
+        cache.put(("c",), (0,), [])
+
+        assert cache.get(("b",), ("t",)) is None
+        assert cache.get(("a",), ("t",)) is not None
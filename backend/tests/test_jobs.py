@@ -0,0 +1,144 @@
+"""Tests for the background job queue."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from app.jobs import JobManager, JobError, JobQueueFull
+
+
+def _wait_finished(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while not job.is_finished and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.is_finished, f"Job still {job.status} after {timeout}s"
+
+
+class TestJobManager:
+    """Job lifecycle: success, failure, cancellation, bounds."""
+
+    def test_job_succeeds(self):
+        manager = JobManager(max_workers=1)
+        job = manager.submit("test", lambda job: {"value": 42})
+        _wait_finished(job)
+
+        assert job.status == "succeeded"
+        assert job.result == {"value": 42}
+        assert [e["status"] for e in job.events if e["type"] == "status"] == [
+            "queued", "running", "succeeded",
+        ]
+
+    def test_job_error_fails_with_message(self):
+        def fail(job):
+            raise JobError("No feasible schedule found")
+
+        manager = JobManager(max_workers=1)
+        job = manager.submit("test", fail)
+        _wait_finished(job)
+
+        assert job.status == "failed"
+        assert job.error == "No feasible schedule found"
+
+    def test_cancel_running_job(self):
+        started = threading.Event()
+
+        def wait_for_cancel(job):
+            started.set()
+            job.cancel_event.wait(5)
+            return {"partial": True}
+
+        manager = JobManager(max_workers=1)
+        job = manager.submit("test", wait_for_cancel)
+        started.wait(5)
+        manager.cancel(job.id)
+        _wait_finished(job)
+
+        assert job.status == "cancelled"
+        assert job.result is None
+
+    def test_stop_running_job_keeps_result(self):
+        started = threading.Event()
+
+        def wait_for_stop(job):
+            started.set()
+            job.stop_event.wait(5)
+            return {"partial": True}
+
+        manager = JobManager(max_workers=1)
+        job = manager.submit("test", wait_for_stop)
+        started.wait(5)
+        manager.stop(job.id)
+        _wait_finished(job)
+
+        assert job.status == "succeeded"
+        assert job.result == {"partial": True}
+        assert any(e["type"] == "stop_requested" for e in job.events)
+
+    def test_cancel_queued_job(self):
+        release = threading.Event()
+        manager = JobManager(max_workers=1)
+        blocker = manager.submit("test", lambda job: release.wait(5) and {})
+        queued = manager.submit("test", lambda job: {"ran": True})
+
+        manager.cancel(queued.id)
+        release.set()
+        _wait_finished(blocker)
+
+        assert queued.status == "cancelled"
+        assert queued.result is None
+
+    def test_futures_are_released(self):
+        release = threading.Event()
+        manager = JobManager(max_workers=1, retention_seconds=0)
+        blocker = manager.submit("test", lambda job: release.wait(5) and {})
+        queued = manager.submit("test", lambda job: {"ran": True})
+        manager.cancel(queued.id)
+        release.set()
+        _wait_finished(blocker)
+        time.sleep(0.05)
+
+        # The finished job's future is dropped by _run, the never-started
+        # one's when the job is pruned
+        assert list(manager._futures) == [queued.id]
+        manager.submit("test", lambda job: {})
+        assert queued.id not in manager._futures
+
+    def test_queue_is_bounded(self):
+        release = threading.Event()
+        manager = JobManager(max_workers=1, max_pending=2)
+        manager.submit("test", lambda job: release.wait(5) and {})
+        manager.submit("test", lambda job: {})
+
+        with pytest.raises(JobQueueFull):
+            manager.submit("test", lambda job: {})
+        release.set()
+
+    def test_wait_events_returns_new_events(self):
+        manager = JobManager(max_workers=1)
+        job = manager.submit("test", lambda job: job.emit("stage", stage="solving") or {})
+        _wait_finished(job)
+
+        events = job.wait_events(after=1, timeout=0)
+        assert events[0]["type"] == "status" and events[0]["status"] == "running"
+        assert any(e.get("stage") == "solving" for e in events)
+
+    def test_async_wait_is_woken_by_emit(self):
+        manager = JobManager(max_workers=1)
+        release = threading.Event()
+        job = manager.submit("test", lambda job: release.wait(5) and {})
+
+        async def wait_for_stage():
+            while job.status != "running":
+                await asyncio.sleep(0.01)
+            sent = len(job.events)
+            threading.Timer(0.1, lambda: job.emit("stage", stage="solving")).start()
+            start = time.time()
+            events = await job.wait_events_async(sent, timeout=5)
+            return events, time.time() - start
+
+        events, waited = asyncio.run(wait_for_stage())
+        release.set()
+        assert [e["type"] for e in events] == ["stage"]
+        assert waited < 2
+        assert job._async_waiters == []
@@ -0,0 +1,76 @@
+"""Tests for the solver input loader."""
+
+import threading
+
+from app.db.loader import load_solver_inputs
+
+
+class _RecordingQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.calls = []
+
+    def select(self, columns):
+        self.calls.append(("select", columns))
+        return self
+
+    def eq(self, column, value):
+        self.calls.append(("eq", column, value))
+        return self
+
+    def lte(self, column, value):
+        self.calls.append(("lte", column, value))
+        return self
+
+    def gte(self, column, value):
+        self.calls.append(("gte", column, value))
+        return self
+
+    def execute(self):
+        self.client.record(self)
+        return type("Response", (), {"data": [{"table": self.table}]})()
+
+
+class _RecordingClient:
+    """Records the queries; each execute waits until all five run at once."""
+
+    def __init__(self):
+        self.queries = {}
+        self.barrier = threading.Barrier(5, timeout=5)
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return _RecordingQuery(self, name)
+
+    def record(self, query):
+        with self.lock:
+            self.queries[query.table] = query.calls
+        self.barrier.wait()
+
+
+class TestLoadSolverInputs:
+    """Concurrent, projected reads of the solver inputs."""
+
+    def test_reads_all_tables_concurrently(self):
+        client = _RecordingClient()
+        inputs = load_solver_inputs(client, "2026-03-02", "2026-03-15")
+
+        assert {name: rows[0]["table"] for name, rows in inputs.items()} == {
+            "employees": "employees",
+            "shift_types": "shift_types",
+            "coverage_requirements": "coverage_requirements",
+            "absences": "absences",
+            "constraint_rules": "constraint_rules",
+        }
+
+    def test_projects_columns_and_filters_absences(self):
+        client = _RecordingClient()
+        load_solver_inputs(client, "2026-03-02", "2026-03-15")
+
+        assert all("*" not in calls[0][1] for calls in client.queries.values())
+        assert client.queries["absences"][1:] == [
+            ("lte", "date_start", "2026-03-15"),
+            ("gte", "date_end", "2026-03-02"),
+        ]
+        assert ("eq", "is_active", True) in client.queries["constraint_rules"]
@@ -0,0 +1,48 @@
+"""Tests for paged reads past PostgREST's max-rows cap."""
+
+from app.db.paging import fetch_all
+from tests.fake_supabase import FakeSupabase
+from tests.test_solver import _make_shift_types
+
+
+def _assignments(schedule_id: str, count: int) -> list:
+    # count employees over 5 days
+    return [
+        {
+            "id": f"{schedule_id}-{i}", "schedule_id": schedule_id, "employee_id": f"emp-{i // 5:03d}",
+            "shift_type_id": "shift-matin", "date": f"2026-02-{24 + i % 5:02d}", "is_locked": False,
+        }
+        for i in range(count)
+    ]
+
+
+class TestFetchAll:
+    """Every row is read although each response is capped."""
+
+    def test_pages_past_the_cap(self):
+        db = FakeSupabase({"schedule_assignments": _assignments("s1", 25)}, max_rows=10)
+        query = lambda: db.table("schedule_assignments").select("*").order("date,employee_id")
+
+        assert len(query().execute().data) == 10
+        rows = fetch_all(query, page_size=10)
+        assert len(rows) == 25 and len({r["id"] for r in rows}) == 25
+        assert db.queries.count(("schedule_assignments", "select")) == 1 + 3
+
+    def test_schedule_reads_are_not_truncated(self, monkeypatch):
+        from app.api.schedules import _load_base_assignments, _load_boundary
+        from app.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "supabase_page_size", 10)
+        db = FakeSupabase({
+            "schedules": [{
+                "id": "s1", "unit_id": None, "period_start": "2026-02-02", "period_end": "2026-02-28",
+                "status": "draft", "created_at": "2026-01-01T08:00:00+00:00",
+            }],
+            "schedule_assignments": _assignments("s1", 60),
+        }, max_rows=10)
+
+        assert len(_load_base_assignments(db, "s1")) == 60
+        boundary = _load_boundary(db, "2026-03-02", _make_shift_types())
+        # 12 employees, all working Tuesday 02-24 to Saturday 02-28
+        assert len(boundary) == 12
+        assert {state["last_free_weekend"] for state in boundary} == {"2026-02-21"}
@@ -0,0 +1,134 @@
+"""Tests for rolling-horizon solving."""
+
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from app.solver.constraints import rest_conflicts
+from app.solver.engine import _parse_shift_types
+from app.solver.rolling import rolling_windows, solve_rolling
+from tests.test_solver import (
+    _make_employees, _make_shift_types, _make_coverage, _make_constraint_rules,
+)
+
+
+class TestRollingWindows:
+    """Window boundaries."""
+
+    def test_windows_cover_period(self):
+        windows = rolling_windows("2026-03-02", "2026-04-12", window_weeks=4, overlap_weeks=1)
+        assert windows == [
+            (date(2026, 3, 2), date(2026, 3, 2), date(2026, 3, 29)),
+            (date(2026, 3, 9), date(2026, 3, 23), date(2026, 4, 12)),
+        ]
+
+    def test_single_window_for_short_period(self):
+        windows = rolling_windows("2026-03-02", "2026-03-15", window_weeks=4, overlap_weeks=1)
+        assert windows == [(date(2026, 3, 2), date(2026, 3, 2), date(2026, 3, 15))]
+
+    def test_window_must_advance_two_weeks(self):
+        with pytest.raises(ValueError):
+            rolling_windows("2026-03-02", "2026-04-12", window_weeks=2, overlap_weeks=1)
+
+    def test_negative_overlap_is_rejected(self):
+        # A step longer than the window would leave weeks unsolved
+        with pytest.raises(ValueError):
+            rolling_windows("2026-01-05", "2026-04-30", window_weeks=4, overlap_weeks=-1)
+
+
+class TestSolveRolling:
+    """A long period solved window by window stays valid across boundaries."""
+
+    def test_six_weeks_in_three_windows(self):
+        events = []
+        result = solve_rolling(
+            employees=_make_employees(12),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-04-12",
+            window_weeks=3,
+            overlap_weeks=1,
+            time_limit_seconds=10,
+            on_solution=events.append,
+        )
+
+        assert result is not None
+        stats = result["stats"]
+        assert stats["num_days"] == 42
+        assert [w["period_start"] for w in stats["rolling"]["windows"]] == [
+            "2026-03-02", "2026-03-16", "2026-03-30",
+        ]
+        assert {e["window"] for e in events} == {0, 1, 2}
+
+        cells = {(a["employee_id"], a["date"]): a["shift_type_id"] for a in result["assignments"]}
+        assert len(cells) == len(result["assignments"])
+        assert min(a["date"] for a in result["assignments"]) >= "2026-03-02"
+        assert max(a["date"] for a in result["assignments"]) <= "2026-04-12"
+
+        # Coverage holds on every day, including window boundaries
+        first = date(2026, 3, 2)
+        roles = {e["id"]: e["role"] for e in _make_employees(12)}
+        for i in range(42):
+            day = first + timedelta(days=i)
+            if day.weekday() >= 5:
+                continue
+            worked = {(roles[e], s) for (e, d), s in cells.items() if d == day.isoformat()}
+            assert ("infirmier", "shift-matin") in worked
+            assert ("assc", "shift-apm") in worked
+            assert ("aide-soignant", "shift-nuit") in worked
+
+        # Minimum rest across consecutive days, including window boundaries
+        shift_ids = [s["id"] for s in _make_shift_types()]
+        conflicts = rest_conflicts(_parse_shift_types(_make_shift_types()), 11)
+        forbidden = {
+            (shift_ids[s1], shift_ids[s2]) for s1, targets in conflicts.items() for s2 in targets
+        }
+        for (emp_id, day), shift_id in cells.items():
+            next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+            assert (shift_id, cells.get((emp_id, next_day))) not in forbidden
+
+        # One free weekend in each 2-week pair counted from the period start
+        for emp_id in roles:
+            for pair in range(3):
+                saturdays = [first + timedelta(days=5 + 7 * (2 * pair + w)) for w in range(2)]
+                free = [
+                    (emp_id, sat.isoformat()) not in cells
+                    and (emp_id, (sat + timedelta(days=1)).isoformat()) not in cells
+                    for sat in saturdays
+                ]
+                assert any(free), f"{emp_id} works both weekends of pair {pair}"
+
+    def test_stop_keeps_solved_windows(self):
+        stop = threading.Event()
+
+        def on_solution(event):
+            if event["window"] == 1:
+                stop.set()
+
+        result = solve_rolling(
+            employees=_make_employees(12),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-04-12",
+            window_weeks=3,
+            overlap_weeks=1,
+            time_limit_seconds=10,
+            cancel_event=stop,
+            on_solution=on_solution,
+        )
+
+        # Window 2 is never started; window 1 is kept through its lookahead
+        assert result is not None
+        rolling = result["stats"]["rolling"]
+        assert len(rolling["windows"]) == 2
+        assert rolling["stopped"] and rolling["solved_until"] == "2026-04-05"
+        assert result["stats"]["num_days"] == 35
+        assert max(a["date"] for a in result["assignments"]) <= "2026-04-05"
+        assert max(a["date"] for a in result["assignments"]) >= "2026-03-30"
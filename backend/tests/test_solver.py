@@ -1,7 +1,21 @@
 """Tests for the OR-Tools scheduling solver."""
 
+import threading
+import time
+from datetime import date, timedelta
+
 import pytest
-from app.solver.engine import solve_schedule
+from ortools.sat.python import cp_model
+from app.solver.engine import (
+    solve_schedule, _generate_days, _parse_coverage, _parse_employees, _parse_shift_types,
+)
+from app.solver.constraints import rest_conflicts
+from app.solver.index import build_index
+from app.solver.models import Absence, LockedAssignment
+from app.solver.repair import build_repair_scope
+from app.solver.symmetry import interchangeable_classes
+from app.solver.stop_policy import StopPolicy, parse_stop_policy
+from app.solver.variables import build_shift_vars, unavailable_cells
 from app.solver.models import ShiftType
 
 ALL_DAYS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche"]
@@ -204,6 +218,81 @@ class TestNightDetection:
         s = ShiftType(id="6", name="Custom Late", start_time="21:00", end_time="05:00", duration_hours=8)
         assert s.is_night is True
 
+    def test_time_fields_parsed_once(self):
+        """Times are stored as minutes since midnight, duration in tenths of hours."""
+        s = ShiftType(id="1", name="Nuit", start_time="21:30", end_time="06:30", duration_hours=9.5)
+        assert (s.start_minutes, s.end_minutes, s.duration_tenths) == (1290, 390, 95)
+        assert s.start_hour() == 21.5
+        with pytest.raises(AttributeError):
+            s.start_time = "22:00"
+
+
+class TestProblemIndex:
+    """Lookup tables shared by the model builders."""
+
+    def _index(self):
+        return build_index(
+            _parse_employees(_make_employees(6)),
+            _parse_shift_types(_make_shift_types()),
+            _generate_days("2026-03-02", "2026-03-08"),
+            _parse_coverage(_make_coverage()),
+        )
+
+    def test_id_maps(self):
+        index = self._index()
+        assert index.employee_idx["emp-4"] == 4
+        assert index.shift_idx["shift-nuit"] == 2
+        assert index.day_idx["2026-03-07"] == 5
+        assert index.day_types[5] == "saturday"
+        assert index.employees_by_role["assc"] == [1, 4]
+
+    def test_coverage_lookup(self):
+        index = self._index()
+        cov = index.coverage_for(index.shift_idx["shift-matin"], 0)
+        assert cov.day_type == "weekday" and cov.min_infirmier == 1
+
+    def test_day_range_clipped_to_period(self):
+        index = self._index()
+        assert list(index.day_range("2026-02-25", "2026-03-03")) == [0, 1]
+        assert list(index.day_range("2026-03-07", "2026-03-20")) == [5, 6]
+        assert list(index.day_range("2026-04-01", "2026-04-05")) == []
+
+
+class TestShiftVars:
+    """Variables are only created for assignable cells."""
+
+    def test_no_vars_on_non_working_or_absence_days(self):
+        employees = _make_employees(2)
+        employees[1]["activity_rate"] = 40
+        employees[1]["working_days"] = ["lundi", "mardi"]
+        index = build_index(
+            _parse_employees(employees),
+            _parse_shift_types(_make_shift_types()),
+            _generate_days("2026-03-02", "2026-03-08"),
+            [],
+        )
+        absences = [Absence("emp-0", "2026-03-03", "2026-03-04", "vacances")]
+        shifts_var = build_shift_vars(cp_model.CpModel(), index, absences)
+
+        # emp-0: 5 weekdays - 2 absence days; emp-1: 2 working days; 3 shifts each
+        assert len(shifts_var) == (3 + 2) * 3
+        assert shifts_var.get(0, 1, 0) is None
+        assert shifts_var.get(1, 2, 0) is None
+        assert len(shifts_var.slot(0, 0)) == 2
+
+    def test_lock_on_absence_day_is_infeasible(self):
+        result = solve_schedule(
+            employees=_make_employees(10),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[{"employee_id": "emp-1", "date_start": "2026-03-02", "date_end": "2026-03-03", "type": "maladie"}],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-08",
+            locked_assignments=[{"employee_id": "emp-1", "shift_type_id": "shift-matin", "date": "2026-03-02"}],
+        )
+        assert result is None
+
 
 class TestSolverConstraints:
     """Test specific constraints."""
@@ -256,6 +345,168 @@ class TestSolverConstraints:
                 found = True
         assert found, "Locked assignment not found in result"
 
+    def test_rest_conflict_table(self):
+        """Matin=0, Apres-midi=1, Nuit=2: late/night shifts forbid early ones next day."""
+        conflicts = rest_conflicts(_parse_shift_types(_make_shift_types()), min_rest_hours=11)
+        assert conflicts == {1: frozenset({0}), 2: frozenset({0, 1})}
+
+    def test_no_forbidden_transitions(self):
+        """No employee works a shift less than 11h after the previous one."""
+        result = solve_schedule(
+            employees=_make_employees(15),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-15",
+        )
+
+        assert result is not None
+        worked = {(a["employee_id"], a["date"]): a["shift_type_id"] for a in result["assignments"]}
+        forbidden = {("shift-apm", "shift-matin"), ("shift-nuit", "shift-matin"), ("shift-nuit", "shift-apm")}
+        days = [d.isoformat() for d in _generate_days("2026-03-02", "2026-03-15")]
+        for (emp_id, day), shift_id in worked.items():
+            if day == days[-1]:
+                continue
+            next_shift = worked.get((emp_id, days[days.index(day) + 1]))
+            assert (shift_id, next_shift) not in forbidden
+
+    def test_objective_matches_schedule(self):
+        """The objective is 10 x same-shift pairs a week apart - 8 x night/weekend spread."""
+        employees = _make_employees(10)
+        result = solve_schedule(
+            employees=employees,
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-15",
+        )
+
+        assert result is not None
+        assert result["stats"]["status"] == "optimal"
+        worked = {(a["employee_id"], a["date"]): a["shift_type_id"] for a in result["assignments"]}
+        days = _generate_days("2026-03-02", "2026-03-15")
+        pairs = sum(
+            1 for (emp_id, day), shift_id in worked.items()
+            if worked.get((emp_id, (date.fromisoformat(day) + timedelta(days=7)).isoformat())) == shift_id
+        )
+        counts = []
+        for emp in employees:
+            if "samedi" not in emp["working_days"] and "dimanche" not in emp["working_days"]:
+                continue
+            shifts = [(d, worked.get((emp["id"], d.isoformat()))) for d in days]
+            counts.append(
+                sum(1 for d, s in shifts if s and d.weekday() >= 5)
+                + sum(1 for _, s in shifts if s == "shift-nuit")
+            )
+        assert result["stats"]["objective_value"] == 10 * pairs - 8 * (max(counts) - min(counts))
+
+
+class TestWarmStart:
+    """Re-solving from a previous schedule."""
+
+    def test_resolve_stays_close_to_previous(self):
+        """A one-day absence only changes a few assignments."""
+        base = solve_schedule(
+            employees=_make_employees(15),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-15",
+            time_limit_seconds=10,
+        )
+        assert base is not None
+        first = base["assignments"][0]
+
+        result = solve_schedule(
+            employees=_make_employees(15),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[{"employee_id": first["employee_id"], "date_start": first["date"],
+                       "date_end": first["date"], "type": "maladie"}],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-15",
+            time_limit_seconds=10,
+            previous_assignments=base["assignments"],
+            minimize_changes=True,
+        )
+
+        assert result is not None
+        warm_start = result["stats"]["warm_start"]
+        assert warm_start["num_hints"] == len(base["assignments"])
+        assert 1 <= warm_start["num_changes"] <= 6
+        assert not any(
+            a["employee_id"] == first["employee_id"] and a["date"] == first["date"]
+            for a in result["assignments"]
+        )
+
+
+class TestRepair:
+    """Neighbourhood repair of an existing schedule."""
+
+    def test_build_repair_scope(self):
+        scope = build_repair_scope(
+            _make_employees(9), "2026-03-02", "2026-03-15",
+            ["emp-1"], "2026-03-06", "2026-03-06",
+        )
+        # Friday ± 1 day reaches Saturday, widened to the whole weekend
+        assert scope["date_start"] == "2026-03-05"
+        assert scope["date_end"] == "2026-03-08"
+        # emp-1 is an assc, as are emp-4 and emp-7
+        assert scope["employee_ids"] == ["emp-1", "emp-4", "emp-7"]
+
+    def test_repair_scope_outside_period(self):
+        with pytest.raises(ValueError):
+            build_repair_scope(_make_employees(9), "2026-03-02", "2026-03-15", ["emp-1"], "2026-04-01", "2026-04-02")
+
+    def test_repair_only_changes_neighbourhood(self):
+        base = solve_schedule(
+            employees=_make_employees(15),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-15",
+            time_limit_seconds=10,
+        )
+        assert base is not None
+        sick = next(a for a in base["assignments"] if a["date"] == "2026-03-10")
+        scope = build_repair_scope(
+            _make_employees(15), "2026-03-02", "2026-03-15",
+            [sick["employee_id"]], "2026-03-10", "2026-03-10",
+        )
+
+        result = solve_schedule(
+            employees=_make_employees(15),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[{"employee_id": sick["employee_id"], "date_start": "2026-03-10",
+                       "date_end": "2026-03-10", "type": "maladie"}],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-15",
+            previous_assignments=base["assignments"],
+            minimize_changes=True,
+            repair_scope=scope,
+            time_limit_seconds=5,
+        )
+
+        assert result is not None
+        before = {(a["employee_id"], a["date"], a["shift_type_id"]) for a in base["assignments"]}
+        after = {(a["employee_id"], a["date"], a["shift_type_id"]) for a in result["assignments"]}
+        for employee_id, day, _ in before ^ after:
+            assert employee_id in scope["employee_ids"]
+            assert scope["date_start"] <= day <= scope["date_end"]
+        assert (sick["employee_id"], "2026-03-10", sick["shift_type_id"]) not in after
+        assert not any(a["is_locked"] for a in result["assignments"])
+
 
 class TestSolverScale:
     """Test solver with larger inputs."""
@@ -282,3 +533,188 @@ class TestSolverScale:
         assert result["stats"]["num_days"] == 31
         # Should have a reasonable number of assignments
         assert result["stats"]["num_assignments"] > 100
+
+
+class TestSolverCancel:
+    """Cancellation stops the search early."""
+
+    def test_cancel_event_stops_search(self):
+        """A pre-set cancel event ends the solve well before the time limit."""
+        cancel = threading.Event()
+        cancel.set()
+        start = time.time()
+        solve_schedule(
+            employees=_make_employees(25),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-01",
+            period_end="2026-03-31",
+            time_limit_seconds=30,
+            cancel_event=cancel,
+        )
+        assert time.time() - start < 10
+
+
+class TestSolverProfile:
+    """solver_stats break the solve down into model build and search."""
+
+    def test_profile_and_search_stats(self):
+        result = solve_schedule(
+            employees=_make_employees(10),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-08",
+        )
+
+        assert result is not None
+        profile = result["stats"]["profile"]
+        steps = {s["name"]: s for s in profile["steps"]}
+        assert steps["build_shift_vars"]["variables"] == result["stats"]["num_shift_vars"]
+        assert steps["add_one_shift_per_day"]["constraints"] > 0
+        assert "add_shift_regularity_objective" in steps
+        assert profile["num_variables"] == sum(s["variables"] for s in profile["steps"])
+
+        search = result["stats"]["search"]
+        assert search["num_branches"] >= 0
+        assert search["gap"] >= 0
+        assert search["best_bound"] >= result["stats"]["objective_value"]
+        assert "presolve_ms" not in search
+
+    def test_search_log_presolve_timing(self):
+        result = solve_schedule(
+            employees=_make_employees(10),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-08",
+            profile_search_log=True,
+        )
+
+        assert result is not None
+        assert result["stats"]["search"]["presolve_ms"] >= 0
+
+
+class TestSolutionCallback:
+    """Improving solutions are reported while the search runs."""
+
+    def test_on_solution_reports_improving_solutions(self):
+        events = []
+        result = solve_schedule(
+            employees=_make_employees(10),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=_make_constraint_rules(),
+            period_start="2026-03-02",
+            period_end="2026-03-08",
+            on_solution=events.append,
+            report_assignments=True,
+        )
+
+        assert result is not None
+        assert [e["num_solutions"] for e in events] == list(range(1, len(events) + 1))
+        objectives = [e["objective"] for e in events]
+        assert objectives == sorted(objectives)
+        assert all(e["bound"] >= e["objective"] and e["gap"] >= 0 for e in events)
+        assert events[-1]["objective"] == result["stats"]["objective_value"]
+        assert len(events[-1]["assignments"]) == len(result["assignments"])
+
+
+class TestStopPolicy:
+    """Gap targets, no-improvement stop and size-scaled time limits."""
+
+    def test_time_limit_scales_with_model_size(self):
+        policy = StopPolicy(seconds_per_1000_vars=10, min_time_limit_seconds=5, max_time_limit_seconds=120)
+        assert policy.time_limit(100) == 5
+        assert policy.time_limit(2000) == 20
+        assert policy.time_limit(50000) == 120
+        assert policy.time_limit(2000, requested=8) == 8
+
+    def test_fixed_time_limit_without_scaling(self):
+        assert StopPolicy().time_limit(50000) == 30
+        assert StopPolicy().time_limit(50000, requested=5) == 5
+
+    def test_overrides_apply_over_rule(self):
+        policy = parse_stop_policy(
+            {"relative_gap": 0.01, "no_improvement_seconds": 5, "unknown": 1},
+            {"relative_gap": 0.05},
+        )
+        assert policy.relative_gap == 0.05
+        assert policy.no_improvement_seconds == 5
+
+    def test_policy_recorded_in_stats(self):
+        rules = _make_constraint_rules() + [{
+            "name": "solver_stop_policy", "type": "soft", "is_active": True,
+            "parameter": {"relative_gap": 0.5, "seconds_per_1000_vars": 10},
+        }]
+        result = solve_schedule(
+            employees=_make_employees(10),
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=rules,
+            period_start="2026-03-02",
+            period_end="2026-03-08",
+            stop_policy={"no_improvement_seconds": 1},
+        )
+
+        assert result is not None
+        stop = result["stats"]["stop_policy"]
+        assert stop["relative_gap"] == 0.5
+        assert stop["no_improvement_seconds"] == 1
+        assert stop["time_limit_seconds"] == 5
+        assert stop["stop_reason"] in ("optimal", "gap", "no_improvement")
+
+
+class TestSymmetryBreaking:
+    """Interchangeable employees are ordered when the rule is active."""
+
+    def _index(self, employees):
+        return build_index(
+            _parse_employees(employees), _parse_shift_types(_make_shift_types()),
+            _generate_days("2026-03-02", "2026-03-08"), _parse_coverage(_make_coverage()),
+        )
+
+    def test_classes_split_by_profile_absences_and_locks(self):
+        index = self._index(_make_employees(12))
+        absences = [Absence("emp-1", "2026-03-03", "2026-03-03", "vacances")]
+        locked = [LockedAssignment("emp-2", "shift-matin", "2026-03-02")]
+        classes = interchangeable_classes(index, unavailable_cells(index, absences), locked)
+
+        # role = i % 3, weekdays only when i % 4 == 0
+        assert sorted(classes) == [[3, 6, 9], [5, 11], [7, 10]]
+
+    def test_ordered_first_day(self):
+        rules = _make_constraint_rules() + [
+            {"name": "symmetry_breaking", "type": "hard", "parameter": {"prefix_days": 1}, "is_active": True},
+        ]
+        employees = _make_employees(10)
+        result = solve_schedule(
+            employees=employees,
+            shift_types=_make_shift_types(),
+            coverage_requirements=_make_coverage(),
+            absences=[],
+            constraint_rules=rules,
+            period_start="2026-03-02",
+            period_end="2026-03-08",
+        )
+
+        assert result is not None
+        index = self._index(employees)
+        classes = interchangeable_classes(index, set(), [])
+        assert result["stats"]["symmetry"]["num_classes"] == len(classes) > 0
+        # Digit of the first day: 0 = off, s_idx + 1 = shift worked
+        first_day = {
+            index.employee_idx[a["employee_id"]]: index.shift_idx[a["shift_type_id"]] + 1
+            for a in result["assignments"] if a["date"] == "2026-03-02"
+        }
+        for members in classes:
+            values = [first_day.get(e_idx, 0) for e_idx in members]
+            assert values == sorted(values, reverse=True)
@@ -0,0 +1,70 @@
+"""Tests for the per-unit decomposition and floating staff dispatch."""
+
+from app.solver.engine import solve_schedule
+from app.solver.units import allocate_floating_staff, split_by_unit, unit_coverage
+from tests.test_solver import (
+    _make_employees, _make_shift_types, _make_coverage, _make_constraint_rules,
+)
+
+
+def _hospital():
+    """Unit A: 10 staff, unit B: 6 staff (short-handed), 3 floating nurses."""
+    employees = []
+    for unit_id, count in (("unit-a", 10), ("unit-b", 6)):
+        for e in _make_employees(count):
+            employees.append({**e, "id": f"{unit_id}-{e['id']}", "unit_id": unit_id})
+    for i in range(3):
+        employees.append({
+            **_make_employees(1)[0], "id": f"float-{i}", "unit_id": None,
+            "is_floating": True, "working_days": ["lundi", "mardi", "mercredi", "jeudi", "vendredi"],
+        })
+    return {
+        "employees": employees,
+        "shift_types": _make_shift_types(),
+        "coverage_requirements": _make_coverage(),
+        "absences": [
+            {"employee_id": "unit-b-emp-0", "date_start": "2026-03-02", "date_end": "2026-03-08", "type": "maladie"},
+        ],
+        "constraint_rules": _make_constraint_rules(),
+    }
+
+
+class TestUnitDecomposition:
+    """Units are solved as independent problems."""
+
+    def test_unit_coverage_falls_back_to_hospital_rows(self):
+        coverage = [
+            {"shift_type_id": "s", "day_type": "weekday", "unit_id": None},
+            {"shift_type_id": "s", "day_type": "weekday", "unit_id": "unit-a"},
+        ]
+        assert unit_coverage(coverage, "unit-a") == [coverage[1]]
+        assert unit_coverage(coverage, "unit-b") == [coverage[0]]
+        assert unit_coverage(coverage, None) == [coverage[0]]
+
+    def test_floaters_go_to_short_handed_unit(self):
+        inputs = _hospital()
+        allocation = allocate_floating_staff(inputs, ["unit-a", "unit-b"], "2026-03-02", "2026-03-08")
+        assert set(allocation) == {"float-0", "float-1", "float-2"}
+        assert list(allocation.values()).count("unit-b") >= 2
+
+    def test_split_by_unit(self):
+        inputs = _hospital()
+        locked = [{"employee_id": "unit-a-emp-1", "shift_type_id": "shift-matin", "date": "2026-03-02"}]
+        per_unit = split_by_unit(inputs, ["unit-a", "unit-b"], {"float-0": "unit-b"}, locked)
+
+        assert len(per_unit["unit-a"]["employees"]) == 10
+        assert len(per_unit["unit-b"]["employees"]) == 7
+        assert per_unit["unit-a"]["absences"] == []
+        assert len(per_unit["unit-b"]["absences"]) == 1
+        assert per_unit["unit-a"]["locked_assignments"] == locked
+        assert per_unit["unit-b"]["locked_assignments"] == []
+
+    def test_each_unit_solves_on_its_own(self):
+        inputs = _hospital()
+        floating = allocate_floating_staff(inputs, ["unit-a", "unit-b"], "2026-03-02", "2026-03-08")
+        per_unit = split_by_unit(inputs, ["unit-a", "unit-b"], floating, [])
+        for unit_id, unit_inputs in per_unit.items():
+            result = solve_schedule(**unit_inputs, period_start="2026-03-02", period_end="2026-03-08")
+            assert result is not None
+            ids = {e["id"] for e in unit_inputs["employees"]}
+            assert all(a["employee_id"] in ids for a in result["assignments"])
@@ -33,6 +33,8 @@ export default function ConstraintsPage() {
     weekend_rest: "Repos week-end garanti",
     shift_regularity: "Régularité des horaires",
     night_weekend_equity: "Équité nuits / week-ends",
+    solver_stop_policy: "Arrêt anticipé du solveur",
+    symmetry_breaking: "Ordre des profils interchangeables",
   };
 
   if (loading) {
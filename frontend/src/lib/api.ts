@@ -13,6 +13,15 @@ async function request<T>(path: string, options?: RequestInit): Promise<T> {
   return res.json();
 }
 
+// Units
+export const getUnits = () => request<Unit[]>("/api/units");
+export const createUnit = (data: { name: string }) =>
+  request<Unit>("/api/units", { method: "POST", body: JSON.stringify(data) });
+export const updateUnit = (id: string, data: { name: string }) =>
+  request<Unit>(`/api/units/${id}`, { method: "PUT", body: JSON.stringify(data) });
+export const deleteUnit = (id: string) =>
+  request<void>(`/api/units/${id}`, { method: "DELETE" });
+
 // Employees
 export const getEmployees = () => request<Employee[]>("/api/employees");
 export const getEmployee = (id: string) => request<Employee>(`/api/employees/${id}`);
@@ -49,9 +58,53 @@ export const deleteAbsence = (id: string) =>
 
 // Schedules
 export const getSchedules = () => request<Schedule[]>("/api/schedules");
-export const getSchedule = (id: string) => request<ScheduleDetail>(`/api/schedules/${id}`);
-export const generateSchedule = (data: ScheduleGenerateRequest) =>
-  request<ScheduleDetail>("/api/schedules/generate", { method: "POST", body: JSON.stringify(data) });
+// Assignments of the given days only, e.g. the week the calendar shows
+export const getSchedule = (id: string, range?: { date_from?: string; date_to?: string }) => {
+  const params = new URLSearchParams();
+  if (range?.date_from) params.set("date_from", range.date_from);
+  if (range?.date_to) params.set("date_to", range.date_to);
+  const query = params.toString();
+  return request<ScheduleDetail>(`/api/schedules/${id}${query ? `?${query}` : ""}`);
+};
+// Compact form for large calendars: one employee × day grid of shift indexes
+export const getScheduleGrid = (id: string, range?: { date_from?: string; date_to?: string }) => {
+  const params = new URLSearchParams({ format: "columnar" });
+  if (range?.date_from) params.set("date_from", range.date_from);
+  if (range?.date_to) params.set("date_to", range.date_to);
+  return request<ScheduleGrid>(`/api/schedules/${id}?${params}`);
+};
+export const startScheduleGeneration = (data: ScheduleGenerateRequest) =>
+  request<SolveJob>("/api/schedules/generate", { method: "POST", body: JSON.stringify(data) });
+export const getSolveJob = (id: string) => request<SolveJob>(`/api/schedules/jobs/${id}`);
+export const cancelSolveJob = (id: string) =>
+  request<SolveJob>(`/api/schedules/jobs/${id}`, { method: "DELETE" });
+// End the search early and keep the best schedule found so far
+export const stopSolveJob = (id: string) =>
+  request<SolveJob>(`/api/schedules/jobs/${id}/stop`, { method: "POST" });
+
+// Subscribe to intermediate solutions of a job; returns a function closing the stream
+export function watchSolveJob(id: string, onSolution: (event: SolutionEvent) => void): () => void {
+  const source = new EventSource(`${API_URL}/api/schedules/jobs/${id}/events`);
+  source.addEventListener("solution", (e) => onSolution(JSON.parse((e as MessageEvent).data)));
+  source.addEventListener("status", (e) => {
+    const { status } = JSON.parse((e as MessageEvent).data);
+    if (status === "succeeded" || status === "failed" || status === "cancelled") source.close();
+  });
+  return () => source.close();
+}
+
+// Queue a generation job and poll it until the schedule is saved
+export async function generateSchedule(data: ScheduleGenerateRequest, pollMs = 1000): Promise<ScheduleDetail> {
+  let job = await startScheduleGeneration(data);
+  while (job.status === "queued" || job.status === "running") {
+    await new Promise((resolve) => setTimeout(resolve, pollMs));
+    job = await getSolveJob(job.id);
+  }
+  if (job.status !== "succeeded" || !job.result?.schedule_id) {
+    throw new Error(job.error || "Génération annulée");
+  }
+  return getSchedule(job.result.schedule_id);
+}
 export const deleteSchedule = (id: string) =>
   request<void>(`/api/schedules/${id}`, { method: "DELETE" });
 
@@ -68,6 +121,8 @@ export interface Employee {
   role: string;
   activity_rate: number;
   working_days: string[];
+  unit_id?: string | null;
+  is_floating?: boolean;
   created_at: string;
 }
 
@@ -77,6 +132,14 @@ export interface EmployeeCreate {
   role: string;
   activity_rate: number;
   working_days: string[];
+  unit_id?: string | null;
+  is_floating?: boolean;
+}
+
+export interface Unit {
+  id: string;
+  name: string;
+  created_at: string;
 }
 
 export interface ShiftType {
@@ -104,6 +167,7 @@ export interface CoverageRequirement {
   min_infirmier: number;
   min_assc: number;
   min_aide_soignant: number;
+  unit_id?: string | null;
   shift_types?: { name: string };
 }
 
@@ -113,6 +177,7 @@ export interface CoverageCreate {
   min_infirmier: number;
   min_assc: number;
   min_aide_soignant: number;
+  unit_id?: string | null;
 }
 
 export interface Absence {
@@ -136,7 +201,7 @@ export interface Schedule {
   period_start: string;
   period_end: string;
   status: string;
-  solver_stats: object;
+  unit_id?: string | null;
   created_at: string;
 }
 
@@ -152,13 +217,67 @@ export interface ScheduleAssignment {
 }
 
 export interface ScheduleDetail extends Schedule {
+  solver_stats?: object;
   assignments: ScheduleAssignment[];
 }
 
+export interface ScheduleGrid extends Schedule {
+  format: "columnar";
+  solver_stats?: object;
+  days: string[];
+  employees: { id: string; first_name: string; last_name: string; role: string }[];
+  shift_types: { id: string; name: string; start_time: string; end_time: string; short_label: string }[];
+  // grid[employee][day]: index in shift_types, null on a day off
+  grid: (number | null)[][];
+  locked: [number, number][];
+}
+
 export interface ScheduleGenerateRequest {
   period_start: string;
   period_end: string;
   locked_assignments?: { employee_id: string; shift_type_id: string; date: string }[];
+  stream_drafts?: boolean;
+  unit_ids?: string[];
+  assign_floating_staff?: boolean;
+  rolling_window_weeks?: number;
+  rolling_overlap_weeks?: number;
+  carry_boundary?: boolean;
+  stop_policy?: {
+    relative_gap?: number;
+    absolute_gap?: number;
+    no_improvement_seconds?: number;
+    seconds_per_1000_vars?: number;
+    min_time_limit_seconds?: number;
+    max_time_limit_seconds?: number;
+  };
+}
+
+export interface SolutionEvent {
+  num_solutions: number;
+  elapsed_ms: number;
+  objective?: number;
+  bound?: number;
+  gap?: number;
+  window?: number;
+  assignments?: { employee_id: string; shift_type_id: string; date: string; is_locked: boolean }[];
+}
+
+export interface SolveJob {
+  id: string;
+  kind: string;
+  status: "queued" | "running" | "succeeded" | "failed" | "cancelled";
+  created_at: number;
+  started_at: number | null;
+  finished_at: number | null;
+  // schedules + floating_staff when the job was started with unit_ids
+  result: {
+    schedule_id?: string;
+    stats?: object;
+    schedules?: { unit_id: string; schedule_id: string; stats: object }[];
+    floating_staff?: Record<string, string>;
+  } | null;
+  error: string | null;
+  num_events: number;
 }
 
 export interface ConstraintRule {
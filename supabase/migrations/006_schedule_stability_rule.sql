@@ -0,0 +1,5 @@
+-- Weight of the "minimize changes" objective used when re-solving
+-- from an existing schedule (base_schedule_id)
+INSERT INTO constraint_rules (name, type, parameter, is_active)
+VALUES ('schedule_stability', 'soft', '{"weight": 20}', true)
+ON CONFLICT (name) DO NOTHING;
@@ -0,0 +1,11 @@
+-- When to end the solver search: stop within 1% of the optimum, after
+-- 5 s without improvement, or after a time limit scaling with model size
+-- (10 s per 1000 shift variables, between 5 and 120 s)
+INSERT INTO constraint_rules (name, type, parameter, is_active)
+VALUES (
+    'solver_stop_policy',
+    'soft',
+    '{"relative_gap": 0.01, "no_improvement_seconds": 5, "seconds_per_1000_vars": 10, "min_time_limit_seconds": 5, "max_time_limit_seconds": 120}',
+    true
+)
+ON CONFLICT (name) DO NOTHING;
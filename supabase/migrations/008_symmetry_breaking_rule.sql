@@ -0,0 +1,6 @@
+-- Order interchangeable employees (same role, rate, working days and
+-- absences) by their first days of schedule. Off by default: CP-SAT's own
+-- symmetry detection did better on the wards measured so far.
+INSERT INTO constraint_rules (name, type, parameter, is_active)
+VALUES ('symmetry_breaking', 'hard', '{"prefix_days": 1}', false)
+ON CONFLICT (name) DO NOTHING;
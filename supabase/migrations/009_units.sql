@@ -0,0 +1,30 @@
+-- Units (wards): employees, coverage requirements and schedules belong to
+-- a unit; each unit is solved as its own problem. Floating staff have no
+-- unit and are dispatched to units at generate time.
+
+create table if not exists units (
+    id uuid primary key default uuid_generate_v4(),
+    name text not null unique,
+    created_at timestamptz not null default now()
+);
+
+alter table units enable row level security;
+create policy "Allow all for authenticated" on units for all using (true);
+
+alter table employees
+  add column if not exists unit_id uuid references units(id) on delete set null,
+  add column if not exists is_floating boolean not null default false;
+
+-- Coverage rows without a unit are the hospital-wide defaults
+alter table coverage_requirements
+  add column if not exists unit_id uuid references units(id) on delete cascade;
+alter table coverage_requirements
+  drop constraint if exists coverage_requirements_shift_type_id_day_type_key;
+create unique index if not exists idx_coverage_unit_shift_day
+  on coverage_requirements (unit_id, shift_type_id, day_type) nulls not distinct;
+
+alter table schedules
+  add column if not exists unit_id uuid references units(id) on delete cascade;
+
+create index if not exists idx_employees_unit on employees(unit_id);
+create index if not exists idx_schedules_unit on schedules(unit_id);
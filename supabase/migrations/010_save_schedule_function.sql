@@ -0,0 +1,31 @@
+-- Save a generated schedule and its assignments in one round trip. The
+-- function body is one transaction: a failed assignment insert leaves no
+-- schedule behind. Ids are chosen by the caller; returns the schedule row.
+
+create or replace function save_schedule(p_schedule jsonb, p_assignments jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+  saved schedules;
+begin
+  insert into schedules (id, period_start, period_end, status, solver_stats, unit_id)
+  values (
+    coalesce((p_schedule->>'id')::uuid, uuid_generate_v4()),
+    (p_schedule->>'period_start')::date,
+    (p_schedule->>'period_end')::date,
+    coalesce(p_schedule->>'status', 'draft'),
+    coalesce(p_schedule->'solver_stats', '{}'::jsonb),
+    (p_schedule->>'unit_id')::uuid
+  )
+  returning * into saved;
+
+  insert into schedule_assignments (id, schedule_id, employee_id, shift_type_id, date, is_locked)
+  select coalesce(a.id, uuid_generate_v4()), saved.id, a.employee_id, a.shift_type_id, a.date,
+         coalesce(a.is_locked, false)
+  from jsonb_to_recordset(p_assignments)
+    as a(id uuid, employee_id uuid, shift_type_id uuid, date date, is_locked boolean);
+
+  return to_jsonb(saved);
+end;
+$$;
@@ -0,0 +1,7 @@
+-- Indexes for paginated schedule reads: the schedule list is paged on
+-- (created_at, id), newest first, and a schedule's assignments on
+-- (date, employee_id), optionally restricted to a date range.
+
+create index if not exists idx_schedules_created on schedules(created_at desc, id desc);
+create index if not exists idx_assignments_schedule_date
+  on schedule_assignments(schedule_id, date, employee_id);
@@ -0,0 +1,8 @@
+-- A schedule too large for one save_schedule call is inserted as 'saving'
+-- and becomes 'draft' once all its assignments are written. The API skips
+-- 'saving' schedules, so an interrupted save is never read; leftovers of a
+-- crashed save can be deleted once they are older than any save in flight.
+
+alter table schedules drop constraint if exists schedules_status_check;
+alter table schedules
+  add constraint schedules_status_check check (status in ('saving', 'draft', 'published'));